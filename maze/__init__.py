@@ -1,4 +1,7 @@
 """Setting up module level imports."""
 from .maze import Maze
 from .walker import Walker
+from .swarm import WalkerSwarm
 from .displays.turtle_display import TurtleDisplay
+from .displays.canvas_display import CanvasDisplay
+from .displays.null_display import NullDisplay
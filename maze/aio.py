@@ -0,0 +1,114 @@
+"""Running walkers with asyncio, so several can animate at once.
+
+Each walker runs as a coroutine which hands control back to the event loop
+after every move, and the Tk window is kept responsive by handling its
+events from the same loop instead of from mainloop. A run can be stopped
+part way by cancelling its task. This module needs Python 3.5 or greater,
+so it is not imported by the package itself.
+
+run - Run a program on a Walker, a move at a time.
+replay - Replay a Trace on a display, an event at a time.
+pump - Handle a Tk window's events until it is closed.
+animate - Run coroutines with a window open, cancelling them if it closes.
+"""
+import asyncio
+import tkinter
+
+async def run(walker, instructions, limit=0, delay=0.0):
+    """Run instructions on a Walker as a coroutine.
+
+    See Walker.execute_iter. Cancelling the task stops the Walker after
+    the move it is on, with the display brought up to date.
+
+    Positional Arguments:
+        walker - The Walker, powered on.
+        instructions - An iterable of instructions, as for Walker.run.
+
+    Keyword Arguments:
+        limit - The most instructions allowed in each list, 0 for no limit.
+        delay - How many seconds to wait after each move.
+
+    Returns:
+        count - The number of instructions in the outermost list.
+
+    Exceptions:
+        As for Walker.run.
+
+    Side Effects:
+        May call functions which alter the Walker's coordinates and display.
+    """
+    steps = walker.execute_iter(instructions, limit)
+    try:
+        while True:
+            try:
+                next(steps)
+            except StopIteration as stop:
+                return stop.value
+            await asyncio.sleep(delay)
+    finally:
+        steps.close()
+
+async def replay(trace, display, delay=0.0):
+    """Replay a Trace on a display as a coroutine.
+
+    See Trace.play.
+
+    Positional Arguments:
+        trace - The Trace to replay.
+        display - The display, with the maze drawn.
+
+    Keyword Arguments:
+        delay - How many seconds to wait after each event.
+    """
+    for _ in trace.play(display):
+        await asyncio.sleep(delay)
+
+async def pump(root, interval=0.02):
+    """Handle a Tk window's events from the event loop, in place of mainloop.
+
+    Positional Arguments:
+        root - The Tk window, such as TurtleDisplay.root.
+
+    Keyword Arguments:
+        interval - How many seconds to wait between handling events.
+
+    Returns:
+        Once the window has been closed.
+    """
+    while True:
+        try:
+            root.update()
+        except tkinter.TclError:
+            return
+        await asyncio.sleep(interval)
+
+async def animate(root, *coroutines, interval=0.02):
+    """Run coroutines while keeping a window responsive.
+
+    If the window is closed first, the coroutines still running are
+    cancelled, so closing the window stops the walkers without ending the
+    program. Once they are done the window is no longer handled, so await
+    pump afterwards to keep it open until the user closes it.
+
+    Positional Arguments:
+        root - The Tk window, such as TurtleDisplay.root.
+        coroutines - The coroutines to run, such as from run or replay.
+
+    Keyword Arguments:
+        interval - How many seconds to wait between handling events.
+
+    Returns:
+        results - A list of what each coroutine returned or raised, in
+                  order, with asyncio.CancelledError for the ones cancelled.
+    """
+    tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+    window = asyncio.ensure_future(pump(root, interval))
+    pending = set(tasks)
+    while pending and not window.done():
+        _, pending = await asyncio.wait(
+            pending | {window}, return_when=asyncio.FIRST_COMPLETED)
+        pending.discard(window)
+    window.cancel()
+    for task in pending:
+        task.cancel()
+    return await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,138 @@
+"""Compiling Walker programs into flat bytecode.
+
+A program for Walker.run is a list of directions, numbers repeating the
+next instruction, and nested lists or iterators. It is compiled once into
+an array of ints, with repeated lists turned into loops and the instruction
+limit worked out ahead of time, so running it needs no type checks, lookups
+or recursion.
+
+Program - A compiled program.
+compile_program - Compile a list of instructions.
+
+MOVE - Move up to a number of cells: MOVE heading distance.
+LOOP - Start a loop, skipping it if the count is 0:
+       LOOP count end.
+NEXT - Go back to the start of the loop until it has run enough times:
+       NEXT start.
+BAD - A bad command, at a position in its list: BAD position.
+LIMIT - The instruction limit was reached: LIMIT.
+"""
+from array import array
+from collections.abc import Iterator
+
+MOVE = 0
+LOOP = 1
+NEXT = 2
+BAD = 3
+LIMIT = 4
+
+# Repeats are stored as signed 64 bit ints, so larger ones are cut down to
+# this, which no program will get to the end of anyway.
+_MOST = 2**63 - 1
+
+# Headings 0 to 3 are absolute, in the order of the wall bits, and 4 to 7
+# are relative to the Walker's heading, turning right by the heading - 4.
+HEADINGS = {
+    'north': 0,
+    'east': 1,
+    'south': 2,
+    'west': 3,
+    'forward': 4,
+    'right': 5,
+    'backward': 6,
+    'left': 7}
+
+class Program:
+    """A Walker program compiled to bytecode.
+
+    Attributes:
+        code - An array of the opcodes and their arguments.
+        count - The instructions counted in the outermost list, returned by
+                Walker.run when the program finishes.
+    """
+
+    def __init__(self, code, count):
+        """Initialize the Program.
+
+        Positional Arguments:
+            code - An array of the opcodes and their arguments.
+            count - The instructions counted in the outermost list.
+        """
+        self.code = code
+        self.count = count
+
+def _compile_list(instructions, limit, code):
+    """Compile one list of instructions onto the end of the bytecode.
+
+    The counting matches what Walker.run has always done: each list counts
+    its own instructions, a number or direction counts one, and a nested
+    list counts its length once, however many times it is repeated. A
+    nested iterator, such as a generator, is read into a list and counted
+    the same way. Once the
+    count reaches the limit before an instruction, that instruction becomes
+    LIMIT, and nothing after a LIMIT or BAD can run so it is left out.
+
+    Positional Arguments:
+        instructions - A list of instructions.
+        limit - The most instructions allowed per list, 0 for no limit.
+        code - The bytecode so far.
+
+    Returns:
+        count - How many instructions the list counted.
+
+    Side Effects:
+        Appends to code.
+    """
+    count = 0
+    repeat = 1
+    for position, instruction in enumerate(instructions):
+        if limit > 0 and count >= limit:
+            code.append(LIMIT)
+            break
+        if isinstance(instruction, int):
+            count += 1
+            repeat = max(min(instruction, _MOST), 0)
+        elif isinstance(instruction, (list, Iterator)):
+            if not isinstance(instruction, list):
+                instruction = list(instruction)
+            if repeat == 1:
+                _compile_list(instruction, limit, code)
+            else:
+                code.extend((LOOP, repeat, 0))
+                start = len(code)
+                _compile_list(instruction, limit, code)
+                if len(code) == start:
+                    del code[start-3:]
+                else:
+                    code.extend((NEXT, start))
+                    code[start-1] = len(code)
+            count += len(instruction)
+            repeat = 1
+        else:
+            try:
+                heading = HEADINGS[instruction]
+            except (KeyError, TypeError):
+                code.extend((BAD, position))
+                break
+            code.extend((MOVE, heading, repeat))
+            count += 1
+            repeat = 1
+    return count
+
+def compile_program(instructions, limit=0):
+    """Compile a list of instructions for Walker.run.
+
+    Positional Arguments:
+        instructions - A list of instructions for the Walker. Can be
+                       directions, numbers which repeat the next
+                       instruction, or lists of instructions.
+
+    Keyword Arguments:
+        limit - The most instructions allowed in each list, 0 for no limit.
+
+    Returns:
+        program - The compiled Program.
+    """
+    code = array('q')
+    count = _compile_list(instructions, limit, code)
+    return Program(code, count)
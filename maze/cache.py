@@ -0,0 +1,166 @@
+"""An on-disk cache of generated mazes.
+
+MazeCache - Finished mazes stored by size, algorithm, seed and version.
+"""
+import hashlib
+import os
+
+from . import generators
+from .maze import Maze
+
+DEFAULT_DIRECTORY = os.path.join(os.path.expanduser('~'), '.cache', 'imhotep')
+
+class MazeCache:
+    """A directory of generated mazes, evicting the least recently used.
+
+    Each maze is stored uncompressed with Maze.save, in a file named by a
+    hash of its size, algorithm, seed and generators.VERSION, so a maze is
+    only ever looked up by the parameters which produced it. Reading a maze
+    touches its file, and the files with the oldest modification times are
+    removed whenever the directory grows past its limit.
+
+    Methods:
+        get
+        put
+        fetch
+        clear
+    """
+
+    _SUFFIX = '.maze'
+
+    def __init__(self, directory=DEFAULT_DIRECTORY, limit=256*2**20):
+        """Initialize the MazeCache. The directory is created on first use.
+
+        Keyword Arguments:
+            directory - Where to keep the cached mazes.
+            limit - The most bytes of mazes to keep.
+        """
+        self._directory = directory
+        self._limit = limit
+
+    def _path(self, size, algorithm, seed):
+        """Work out where a maze lives in the cache.
+
+        Positional Arguments:
+            size - The number of maze cells per side.
+            algorithm - The name of the generator.
+            seed - The seed the maze was generated from.
+
+        Returns:
+            path - The path of the maze's file.
+
+        Exceptions:
+            TypeError - Raised if the seed is not an int, str or bytes.
+        """
+        if not isinstance(seed, (int, str, bytes)):
+            raise TypeError('Only int, str and bytes seeds can be cached')
+        key = repr((size, algorithm, seed, generators.VERSION))
+        name = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return os.path.join(self._directory, name + self._SUFFIX)
+
+    def get(self, size, algorithm, seed):
+        """Load a maze from the cache.
+
+        Positional Arguments:
+            size - The number of maze cells per side.
+            algorithm - The name of the generator.
+            seed - The seed the maze was generated from.
+
+        Returns:
+            maze - The cached Maze, or None if it is not in the cache.
+        """
+        path = self._path(size, algorithm, seed)
+        try:
+            maze = Maze.load(path)
+            os.utime(path, None)
+        except (FileNotFoundError, ValueError):
+            return None
+        return maze
+
+    def put(self, maze, algorithm, seed):
+        """Store a maze in the cache, then evict old mazes if needed.
+
+        Positional Arguments:
+            maze - The Maze to store.
+            algorithm - The name of the generator which made it.
+            seed - The seed it was generated from.
+
+        Exceptions:
+            OSError - Raised if the maze could not be written.
+        """
+        path = self._path(maze.size, algorithm, seed)
+        os.makedirs(self._directory, exist_ok=True)
+        partial = '{}.{}.tmp'.format(path, os.getpid())
+        maze.save(partial)
+        os.replace(partial, path)
+        self._evict(keep=path)
+
+    def fetch(self, size, algorithm, seed):
+        """Load a maze from the cache, generating and storing it if missing.
+
+        Failing to store the maze is not an error, it is just regenerated
+        next time.
+
+        Positional Arguments:
+            size - The number of maze cells per side.
+            algorithm - The name of a Maze generation method.
+            seed - The seed to generate the maze from.
+
+        Returns:
+            maze - The Maze.
+
+        Exceptions:
+            KeyError - Raised for an unknown algorithm.
+        """
+        maze = self.get(size, algorithm, seed)
+        if maze is None:
+            if algorithm not in generators.ALGORITHMS:
+                raise KeyError(algorithm)
+            maze = Maze(size)
+            getattr(maze, algorithm)(seed=seed)
+            try:
+                self.put(maze, algorithm, seed)
+            except OSError:
+                pass
+        return maze
+
+    def clear(self):
+        """Remove every maze from the cache."""
+        for path, _ in self._entries():
+            os.remove(path)
+
+    def _entries(self):
+        """List the cached mazes, least recently used first.
+
+        Returns:
+            entries - A list of (path, os.stat_result) tuples.
+        """
+        try:
+            names = os.listdir(self._directory)
+        except FileNotFoundError:
+            return []
+        entries = []
+        for name in names:
+            if name.endswith(self._SUFFIX):
+                path = os.path.join(self._directory, name)
+                entries.append((path, os.stat(path)))
+        entries.sort(key=lambda entry: entry[1].st_mtime)
+        return entries
+
+    def _evict(self, keep):
+        """Remove the least recently used mazes until under the limit.
+
+        Positional Arguments:
+            keep - The path of a maze which must not be removed.
+
+        Side Effects:
+            Deletes files from the cache directory.
+        """
+        entries = self._entries()
+        total = sum(stat.st_size for _, stat in entries)
+        for path, stat in entries:
+            if total <= self._limit:
+                break
+            if path != keep:
+                os.remove(path)
+                total -= stat.st_size
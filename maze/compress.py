@@ -0,0 +1,286 @@
+"""Shrinking Walker programs by folding repeated moves into repeat lists.
+
+Walker.run repeats the instruction after a number that many times, and the
+instruction may be a list, so a path which goes round the same bends over and
+over can be written as [k, [...]] instead of move by move.
+
+A number before an absolute direction moves that many cells, the same as
+the direction that many times. A number before a relative direction turns
+once and then goes that many cells straight, which is not the same as
+turning that many times, so such a pair is kept together as one move, and
+relative directions are only ever repeated as lists, like [3, ['left']].
+
+compress - Turn a program into a shorter one with nested repeats.
+expand - Turn a program back into the flat list of moves it makes.
+"""
+
+_ABSOLUTE = {'north', 'east', 'south', 'west'}
+
+def _absolute(direction):
+    """Check whether an instruction is an absolute direction."""
+    return isinstance(direction, str) and direction in _ABSOLUTE
+
+def expand(instructions):
+    """List every move a program makes, in order.
+
+    Positional Arguments:
+        instructions - A list of instructions as taken by Walker.run.
+
+    Returns:
+        moves - A flat list of the directions moved in, with a relative
+                direction moving more than one cell kept as its count
+                followed by the direction.
+    """
+    moves = []
+    repeat = 1
+    for instruction in instructions:
+        if isinstance(instruction, int):
+            repeat = instruction
+            continue
+        if isinstance(instruction, list):
+            moves.extend(expand(instruction)*repeat)
+        elif repeat == 1 or _absolute(instruction):
+            moves.extend([instruction]*repeat)
+        elif repeat > 1:
+            moves.extend((repeat, instruction))
+        repeat = 1
+    return moves
+
+def _matching(seq, first, second):
+    """Measure how far two positions of a sequence agree.
+
+    Doubles the length compared until the slices differ, then narrows the
+    gap down, so long runs are compared a slice at a time rather than item
+    by item.
+
+    Positional Arguments:
+        seq - The sequence.
+        first - The earlier position.
+        second - The later position.
+
+    Returns:
+        length - How many items from each position are the same.
+    """
+    limit = len(seq) - second
+    low, high = 0, 1
+    while high <= limit and seq[first:first+high] == seq[second:second+high]:
+        low, high = high, high*2
+    high = min(high, limit+1)
+    while high - low > 1:
+        middle = (low + high) // 2
+        if seq[first+low:first+middle] == seq[second+low:second+middle]:
+            low = middle
+        else:
+            high = middle
+    return low
+
+class _Units:
+    """The pieces of a program being compressed, numbered.
+
+    A unit is either a single move or a repeat of a run of other units. A
+    single move is a direction, or a count and a relative direction, which
+    moves that many cells. Each is given an int id the first time it is
+    seen, so runs of units can be compared as lists of ints. The runs
+    already shrunk by _shrink are kept in shrunk, by the ids they had.
+    """
+
+    def __init__(self):
+        self._ids = {}
+        self.costs = []
+        self._pieces = []
+        self.shrunk = {}
+
+    def _add(self, key, piece, cost):
+        """Look up a unit, numbering it if it is new.
+
+        Positional Arguments:
+            key - A hashable description of the unit.
+            piece - The move, or the (count, body) of a repeat.
+            cost - How many instructions the unit is written with.
+
+        Returns:
+            unit - The unit's id.
+        """
+        unit = self._ids.get(key)
+        if unit is None:
+            unit = self._ids[key] = len(self._pieces)
+            self._pieces.append(piece)
+            self.costs.append(cost)
+        return unit
+
+    def move(self, direction, count=1):
+        """Number a single move.
+
+        Positional Arguments:
+            direction - The direction moved in.
+
+        Keyword Arguments:
+            count - How many cells a relative direction moves.
+
+        Returns:
+            unit - The move's id.
+        """
+        if count == 1:
+            return self._add(('move', direction), direction, 1)
+        return self._add(('move', count, direction), [count, direction], 2)
+
+    def repeat(self, count, body):
+        """Number a run of units repeated a number of times.
+
+        A repeat of a single repeat is folded into one, so [2, [3, 'north']]
+        is written as [6, 'north'].
+
+        Positional Arguments:
+            count - How many times the run is repeated.
+            body - A tuple of the ids of the units in the run.
+
+        Returns:
+            unit - The repeat's id.
+        """
+        if len(body) == 1 and isinstance(self._pieces[body[0]], tuple):
+            inner, body = self._pieces[body[0]]
+            count *= inner
+        cost = 1 + sum(self.costs[unit] for unit in body)
+        return self._add(('repeat', count, body), (count, body), cost)
+
+    def program(self, seq):
+        """Write a sequence of units out as instructions.
+
+        Positional Arguments:
+            seq - The ids of the units, in order.
+
+        Returns:
+            instructions - A list of instructions for Walker.run.
+        """
+        instructions = []
+        for unit in seq:
+            piece = self._pieces[unit]
+            if isinstance(piece, list):
+                instructions.extend(piece)
+                continue
+            if not isinstance(piece, tuple):
+                instructions.append(piece)
+                continue
+            count, body = piece
+            instructions.append(count)
+            # Only an absolute direction can follow the count directly.
+            if len(body) == 1 and _absolute(self._pieces[body[0]]):
+                instructions.extend(self.program(body))
+            else:
+                instructions.append(self.program(body))
+        return instructions
+
+def _fold(seq, units, window):
+    """Replace repeated runs of units with repeat units, left to right.
+
+    At each position only the periods at which the same unit turns up again
+    within the window are tried, and of those the one saving the most
+    instructions is taken.
+
+    Positional Arguments:
+        seq - The ids of the units, in order.
+        units - The _Units numbering them.
+        window - The longest run, in units, to look for repeats of.
+
+    Returns:
+        folded - The new sequence of ids.
+    """
+    length = len(seq)
+    following = [length]*length
+    last = {}
+    for index in range(length-1, -1, -1):
+        following[index] = last.get(seq[index], length)
+        last[seq[index]] = index
+    totals = [0]
+    for unit in seq:
+        totals.append(totals[-1] + units.costs[unit])
+    folded = []
+    index = 0
+    while index < length:
+        best, best_period, best_count = 0, 0, 0
+        later = following[index]
+        while later < length and later - index <= window:
+            period = later - index
+            count = 1 + _matching(seq, index, later) // period
+            if count > 1:
+                cost = totals[later] - totals[index]
+                saving = (count - 1)*cost - 1
+                if saving > best:
+                    best, best_period, best_count = saving, period, count
+            later = following[later]
+        if best_count:
+            body = _shrink(seq[index:index+best_period], units, window)
+            folded.append(units.repeat(best_count, body))
+            index += best_period*best_count
+        else:
+            folded.append(seq[index])
+            index += 1
+    return folded
+
+def _shrink(seq, units, window):
+    """Fold a run of units over and over until no more repeats are found.
+
+    The body of every repeat is shrunk the same way before it is numbered,
+    so repeats nest inwards as well as outwards. Each body is only shrunk
+    once, however many times it turns up.
+
+    Positional Arguments:
+        seq - The ids of the units, in order.
+        units - The _Units numbering them.
+        window - The longest run, in units, to look for repeats of.
+
+    Returns:
+        shrunk - A tuple of the ids of the units of the shrunk run.
+    """
+    key = tuple(seq)
+    shrunk = units.shrunk.get(key)
+    if shrunk is None:
+        while True:
+            folded = _fold(seq, units, window)
+            if len(folded) == len(seq):
+                break
+            seq = folded
+        shrunk = units.shrunk[key] = tuple(seq)
+    return shrunk
+
+def _length(instructions):
+    """Count the instructions in a program, a list counting as one more."""
+    return sum(1 + _length(instruction) if isinstance(instruction, list)
+               else 1 for instruction in instructions)
+
+def compress(instructions, window=64):
+    """Find a short program which makes the same moves as another.
+
+    Repeated runs of moves are folded into repeats, and the folding is done
+    again over the result until nothing more is found, so repeats end up
+    nested around repeats. The body of each repeat is compressed the same
+    way, so repeats nest inside repeats too. Each pass takes time close to
+    linear in the length of the program. The program given is returned
+    as is if compressing it would only make it longer.
+
+    Positional Arguments:
+        instructions - A list of instructions as taken by Walker.run, such
+                       as a flat list of moves or the way out from a solver.
+
+    Keyword Arguments:
+        window - The longest run, in units, to look for repeats of. Longer
+                 windows find more repeats but take longer.
+
+    Returns:
+        instructions - An equivalent list of instructions for Walker.run.
+    """
+    units = _Units()
+    seq = []
+    count = 1
+    for move in expand(instructions):
+        if isinstance(move, int):
+            count = move
+        else:
+            seq.append(units.move(move, count))
+            count = 1
+    compressed = units.program(_shrink(seq, units, window))
+    # Folding can split repeats the program already had, so keep whichever
+    # of the two is shorter.
+    if _length(compressed) > _length(instructions):
+        return list(instructions)
+    return compressed
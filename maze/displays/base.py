@@ -0,0 +1,144 @@
+"""The interface every maze display provides.
+
+Display - The base class for displays.
+"""
+import re
+
+# For bytes.translate, 1 for the cells with a given wall bit and 0 for the
+# rest, and a pattern for the runs of ones this leaves along a line.
+_HAS = {bit: bytes(bool(value & bit) for value in range(256))
+        for bit in (1, 2, 4, 8)}
+_RUN = re.compile(b'\x01+')
+
+class Display:
+    """A display for showing the maze and the walker moving through it.
+
+    Subclasses draw the maze, move the walker a number of cells in a
+    direction, and show a toggled wall as opened. The batched methods,
+    move_path and toggle_many, are what the Walker calls, and by default pass
+    each item on to the single versions. A display which can draw a batch
+    faster than one item at a time overrides them.
+
+    Methods:
+        draw
+        north
+        east
+        south
+        west
+        move_path
+        toggle
+        toggle_many
+        show
+    """
+
+    def __init__(self, maze):
+        """Initialize the Display.
+
+        Positional Arguments:
+            maze - The Maze to display.
+        """
+        self._maze = maze
+
+    def draw(self):
+        """Draw the maze, with the walker in the bottom left cell."""
+        raise NotImplementedError
+
+    def _wall_runs(self, horizontal, first=0, last=None, start=0,
+                   stop=None):
+        """Find each wall once, merged into the longest straight runs.
+
+        A wall belongs to the line between two rows or columns of cells,
+        and is there if either cell on it has it, so hand-made mazes whose
+        walls do not match up still show every wall. Each line's walls are
+        worked out with bytes.translate and int operators, and the runs read
+        off with a regular expression, rather than cell by cell.
+
+        Positional Arguments:
+            horizontal - True for the lines between rows, False for the
+                         lines between columns.
+
+        Keyword Arguments:
+            first - The first line, 0 being the bottom or left edge.
+            last - The line after the last one, by default the top or right
+                   edge plus one.
+            start - The first cell along each line to look at.
+            stop - The cell after the last one to look at along each line,
+                   by default the end of the line.
+
+        Returns:
+            A generator of (line, start, end) tuples, for a run of walls on
+            the line from start to end, in cells.
+        """
+        size = self._maze.size
+        cells = self._maze.cells
+        if last is None:
+            last = size + 1
+        if stop is None:
+            stop = size
+        if horizontal:
+            before, after = _HAS[1], _HAS[4]
+            def cells_on(line):
+                return cells[line*size+start:line*size+stop].tobytes()
+        else:
+            before, after = _HAS[2], _HAS[8]
+            def cells_on(line):
+                return cells[line+start*size:line+stop*size:size].tobytes()
+        for line in range(first, last):
+            walls = 0
+            if line > 0:
+                walls = int.from_bytes(
+                    cells_on(line-1).translate(before), 'little')
+            if line < size:
+                walls |= int.from_bytes(
+                    cells_on(line).translate(after), 'little')
+            walls = walls.to_bytes(stop-start, 'little')
+            for run in _RUN.finditer(walls):
+                yield line, start + run.start(), start + run.end()
+
+    def north(self, distance=1):
+        """Move the walker up a number of cells."""
+        raise NotImplementedError
+
+    def east(self, distance=1):
+        """Move the walker right a number of cells."""
+        raise NotImplementedError
+
+    def south(self, distance=1):
+        """Move the walker down a number of cells."""
+        raise NotImplementedError
+
+    def west(self, distance=1):
+        """Move the walker left a number of cells."""
+        raise NotImplementedError
+
+    def move_path(self, segments):
+        """Move the walker along a path of straight lines.
+
+        Positional Arguments:
+            segments - A list of (direction, distance) tuples, in order,
+                       the directions being north, east, south or west.
+        """
+        for direction, distance in segments:
+            getattr(self, direction)(distance)
+
+    def toggle(self, coordinates, direction):
+        """Show a wall as opened.
+
+        Positional Arguments:
+            coordinates - The coordinates of the cell.
+            direction - The side of the cell the wall is on.
+        """
+        raise NotImplementedError
+
+    def toggle_many(self, walls):
+        """Show a number of walls as opened.
+
+        Positional Arguments:
+            walls - A list of (coordinates, direction) tuples.
+        """
+        for coordinates, direction in walls:
+            self.toggle(coordinates, direction)
+
+    def show(self):
+        """Let the user look at the display until they are done with it."""
+        pass
@@ -0,0 +1,273 @@
+"""Tk Canvas backend for the maze display.
+
+CanvasDisplay - A display drawing straight onto a Tk Canvas.
+"""
+import time
+import tkinter
+
+from .base import Display
+
+class CanvasDisplay(Display):
+    """A display for very large mazes, drawing onto a scrollable Canvas.
+
+    The maze is split into square tiles of cells, and only the tiles in
+    view are drawn, each as one batch of line items for its runs of walls.
+    More tiles are drawn as they are scrolled into view, and tiles already
+    drawn are kept. The walker is a single item moved with Canvas.move.
+
+    Methods:
+        draw
+        show
+    """
+
+    _BACKGROUND = 'white'
+
+    def __init__(self, maze, cell=10, tile=64, delay=0.0, width=800,
+                 height=800):
+        """Initialize the CanvasDisplay.
+
+        Positional Arguments:
+            maze - The Maze to display.
+
+        Keyword Arguments:
+            cell - The width of a cell in pixels.
+            tile - The width of a tile in cells.
+            delay - How many seconds to wait after each move, so it can be
+                    followed, 0 to move as fast as possible.
+            width - The most width of the window in pixels.
+            height - The most height of the window in pixels.
+        """
+        super().__init__(maze)
+        self._cell = cell
+        self._tile = tile
+        self._delay = delay
+        self._width = width
+        self._height = height
+        self._root = None
+        self._canvas = None
+        self._walker = None
+        self._drawn = set()
+
+    @property
+    def root(self):
+        """The Tk window the maze is drawn in."""
+        return self._root
+
+    def _point(self, x, y):
+        """Convert maze coordinates, in cells, to Canvas pixels.
+
+        Positional Arguments:
+            x - The distance from the left edge, in cells.
+            y - The distance from the bottom edge, in cells.
+
+        Returns:
+            point - The (x, y) pixels on the Canvas, y going down.
+        """
+        return x*self._cell, (self._maze.size - y)*self._cell
+
+    def draw(self):
+        """Open a window and draw the part of the maze in view."""
+        size = self._maze.size
+        extent = size*self._cell
+        root = tkinter.Tk()
+        root.title('Imhotep')
+        canvas = tkinter.Canvas(
+            root, background=self._BACKGROUND, highlightthickness=0,
+            width=min(extent, self._width), height=min(extent, self._height),
+            scrollregion=(0, 0, extent, extent))
+        across = tkinter.Scrollbar(root, orient=tkinter.HORIZONTAL)
+        down = tkinter.Scrollbar(root, orient=tkinter.VERTICAL)
+        across.configure(command=self._scroller(canvas.xview))
+        down.configure(command=self._scroller(canvas.yview))
+        canvas.configure(xscrollcommand=across.set, yscrollcommand=down.set)
+        canvas.grid(row=0, column=0, sticky='nsew')
+        down.grid(row=0, column=1, sticky='ns')
+        across.grid(row=1, column=0, sticky='ew')
+        root.grid_rowconfigure(0, weight=1)
+        root.grid_columnconfigure(0, weight=1)
+        canvas.bind('<Configure>', lambda event: self._fill())
+        root.bind('q', lambda event: root.destroy())
+        self._root = root
+        self._canvas = canvas
+        self._drawn = set()
+        # Start scrolled to the bottom, where the walker starts.
+        canvas.yview_moveto(1.0)
+        x, y = self._maze.north_east
+        left, top = self._point(x, y+1)
+        margin = self._cell//5
+        canvas.create_rectangle(
+            left+margin, top+margin, left+self._cell-margin,
+            top+self._cell-margin)
+        canvas.create_line(
+            left+margin, top+margin, left+self._cell-margin,
+            top+self._cell-margin)
+        canvas.create_line(
+            left+margin, top+self._cell-margin, left+self._cell-margin,
+            top+margin)
+        left, top = self._point(0, 1)
+        self._walker = canvas.create_oval(
+            left+margin, top+margin, left+self._cell-margin,
+            top+self._cell-margin, fill='black')
+        root.update_idletasks()
+        self._fill()
+
+    def _scroller(self, view):
+        """Wrap a Canvas view method to draw what scrolls into view.
+
+        Positional Arguments:
+            view - Canvas.xview or Canvas.yview.
+
+        Returns:
+            command - A scrollbar command.
+        """
+        def command(*args):
+            view(*args)
+            self._fill()
+        return command
+
+    def _fill(self):
+        """Draw every tile in view which has not been drawn yet."""
+        canvas = self._canvas
+        span = self._tile*self._cell
+        size = self._maze.size
+        tiles = (size + self._tile - 1)//self._tile
+        left = int(canvas.canvasx(0))
+        top = int(canvas.canvasy(0))
+        right = int(canvas.canvasx(canvas.winfo_width()))
+        bottom = int(canvas.canvasy(canvas.winfo_height()))
+        # Tiles are counted from the bottom left, like cells.
+        extent = size*self._cell
+        for across in range(max(left//span, 0), min(right//span + 1, tiles)):
+            for up in range(max((extent - bottom)//span, 0),
+                            min((extent - top)//span + 1, tiles)):
+                if (across, up) not in self._drawn:
+                    self._drawn.add((across, up))
+                    self._draw_tile(across, up)
+        canvas.tag_raise(self._walker)
+
+    def _draw_tile(self, across, up):
+        """Draw the runs of walls in a tile.
+
+        A tile has the lines of walls along its bottom and left edges, and
+        the tiles on the top and right edges of the maze have those edges
+        as well.
+
+        Positional Arguments:
+            across - The column of the tile, from the left.
+            up - The row of the tile, from the bottom.
+        """
+        size = self._maze.size
+        create_line = self._canvas.create_line
+        point = self._point
+        for horizontal, first, start in ((True, up, across),
+                                         (False, across, up)):
+            first *= self._tile
+            start *= self._tile
+            stop = min(start + self._tile, size)
+            last = first + self._tile
+            if last >= size:
+                last = size + 1
+            for line, begin, end in self._wall_runs(
+                    horizontal, first, last, start, stop):
+                if horizontal:
+                    create_line(*point(begin, line) + point(end, line))
+                else:
+                    create_line(*point(line, begin) + point(line, end))
+
+    def _move(self, x, y):
+        """Move the walker by a number of cells.
+
+        Positional Arguments:
+            x - How far to move right.
+            y - How far to move up.
+        """
+        self._canvas.move(self._walker, x*self._cell, -y*self._cell)
+        self._canvas.update()
+        if self._delay:
+            time.sleep(self._delay)
+
+    def north(self, distance=1):
+        """Move the walker up a number of cells.
+
+        Keyword Arguments:
+            distance - How many cells to move.
+        """
+        self._move(0, distance)
+
+    def east(self, distance=1):
+        """Move the walker right a number of cells.
+
+        Keyword Arguments:
+            distance - How many cells to move.
+        """
+        self._move(distance, 0)
+
+    def south(self, distance=1):
+        """Move the walker down a number of cells.
+
+        Keyword Arguments:
+            distance - How many cells to move.
+        """
+        self._move(0, -distance)
+
+    def west(self, distance=1):
+        """Move the walker left a number of cells.
+
+        Keyword Arguments:
+            distance - How many cells to move.
+        """
+        self._move(-distance, 0)
+
+    _STEPS = {
+        'north': (0, 1),
+        'east': (1, 0),
+        'south': (0, -1),
+        'west': (-1, 0)}
+
+    def move_path(self, segments):
+        """Move the walker along a path of straight lines.
+
+        With no delay the walker jumps straight to the end of the path,
+        and the window is only updated once.
+
+        Positional Arguments:
+            segments - A list of (direction, distance) tuples, in order.
+        """
+        if self._delay:
+            super().move_path(segments)
+            return
+        x = y = 0
+        for direction, distance in segments:
+            step_x, step_y = self._STEPS[direction]
+            x += step_x*distance
+            y += step_y*distance
+        self._move(x, y)
+
+    # The ends of each side of a cell, in cells from its bottom left corner.
+    _SIDES = {
+        'north': (0, 1, 1, 1),
+        'east': (1, 0, 1, 1),
+        'south': (0, 0, 1, 0),
+        'west': (0, 0, 0, 1)}
+
+    def toggle(self, coordinates, direction):
+        """Show a wall as opened, by drawing over it in the background color.
+
+        Tiles drawn later are drawn from the maze, which no longer has the
+        wall, so covering it is harmless there.
+
+        Positional Arguments:
+            coordinates - The coordinates of the cell.
+            direction - The side of the cell the wall is on.
+        """
+        x, y = coordinates
+        start_x, start_y, end_x, end_y = self._SIDES[direction]
+        start = self._point(x+start_x, y+start_y)
+        end = self._point(x+end_x, y+end_y)
+        self._canvas.create_line(
+            *start + end, fill=self._BACKGROUND, width=2)
+        self._canvas.tag_raise(self._walker)
+
+    def show(self):
+        """Block until user presses q."""
+        self._root.mainloop()
@@ -0,0 +1,36 @@
+"""A display which shows nothing.
+
+NullDisplay - A display for running walkers without a screen.
+"""
+from .base import Display
+
+class NullDisplay(Display):
+    """A display that ignores everything, for tests and batch jobs.
+
+    Walkers powered on with it run as fast as they can, with no window and
+    no drawing.
+    """
+
+    def draw(self):
+        pass
+
+    def north(self, distance=1):
+        pass
+
+    def east(self, distance=1):
+        pass
+
+    def south(self, distance=1):
+        pass
+
+    def west(self, distance=1):
+        pass
+
+    def move_path(self, segments):
+        pass
+
+    def toggle(self, coordinates, direction):
+        pass
+
+    def toggle_many(self, walls):
+        pass
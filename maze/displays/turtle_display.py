@@ -4,19 +4,35 @@ TurtleDisplay - A Turtle based display for the maze.
 """
 import turtle
 
-class TurtleDisplay:
+from .base import Display
+
+class TurtleDisplay(Display):
     """A display for showing the maze to the user, using Turtle.
 
     Methods:
         draw
     """
-    def __init__(self, maze):
-        self._maze = maze
+    def __init__(self, maze, speed=3):
+        """Initialize the TurtleDisplay.
+
+        Positional Arguments:
+            maze - The Maze to display.
+
+        Keyword Arguments:
+            speed - The turtle speed the walker moves at, 1 to 10, or 0 to
+                    move without animation.
+        """
+        super().__init__(maze)
         self._imhotep = None
+        self._speed = speed
 
     def draw(self):
         """Create a turtle and draw the maze.
 
+        Each wall is drawn once, as part of the longest straight run of
+        walls it is in, so a run costs a single stroke however many cells
+        long it is.
+
         Returns:
             imhotep - The maze turtle, positioned in the bottom left cell.
         """
@@ -28,35 +44,40 @@ class TurtleDisplay:
         imhotep.penup()
         imhotep.speed(0)
         oldtracer = imhotep.screen.tracer()
-        imhotep.screen.tracer(1000)
-        for x in range(self._maze.size):
-            for y in range(self._maze.size):
-                cell = (x, y)
-                for direction in ['north', 'east', 'south', 'west']:
-                    if not self._maze.can_move(cell, direction):
-                        self._draw_wall(cell, direction)
-                if cell == self._maze.north_east:
-                    #draw smaller square
-                    imhotep.setposition(x*10+2, y*10+2)
-                    imhotep.setheading(90)
-                    imhotep.pendown()
-                    for _ in range(4):
-                        imhotep.forward(6)
-                        imhotep.right(90)
-                    #draw an x
-                    imhotep.setheading(45)
-                    imhotep.pendown()
-                    imhotep.setposition(x*10+8, y*10+8)
-                    imhotep.penup()
-                    imhotep.setposition(x*10+2, y*10+8)
-                    imhotep.setheading(-45)
-                    imhotep.pendown()
-                    imhotep.setposition(x*10+8, y*10+2)
-                    imhotep.penup()
+        imhotep.screen.tracer(0)
+        for y, start, end in self._wall_runs(True):
+            imhotep.setposition(start*10, y*10)
+            imhotep.pendown()
+            imhotep.setposition(end*10, y*10)
+            imhotep.penup()
+        for x, start, end in self._wall_runs(False):
+            imhotep.setposition(x*10, start*10)
+            imhotep.pendown()
+            imhotep.setposition(x*10, end*10)
+            imhotep.penup()
+        x, y = self._maze.north_east
+        #draw smaller square
+        imhotep.setposition(x*10+2, y*10+2)
+        imhotep.setheading(90)
+        imhotep.pendown()
+        for _ in range(4):
+            imhotep.forward(6)
+            imhotep.right(90)
+        #draw an x
+        imhotep.setheading(45)
+        imhotep.pendown()
+        imhotep.setposition(x*10+8, y*10+8)
+        imhotep.penup()
+        imhotep.setposition(x*10+2, y*10+8)
+        imhotep.setheading(-45)
+        imhotep.pendown()
+        imhotep.setposition(x*10+8, y*10+2)
+        imhotep.penup()
+        imhotep.screen.update()
         imhotep.screen.tracer(oldtracer)
         imhotep.setposition(5, 5)
         imhotep.setheading(90)
-        imhotep.speed(3)
+        imhotep.speed(self._speed)
         imhotep.showturtle()
         screen = imhotep.getscreen()
         screen.onkey(screen.bye, 'q')
@@ -76,46 +97,63 @@ class TurtleDisplay:
         self._imhotep.forward(10)
         self._imhotep.penup()
 
-    def north(self):
-        """Move the walker up one cell.
+    def north(self, distance=1):
+        """Move the walker up a number of cells.
+
+        Keyword Arguments:
+            distance - How many cells to move.
 
         Side Effects:
             Alters the Walker's coordinates and display.
         """
         self._imhotep.setheading(90)
-        self._imhotep.forward(10)
+        self._imhotep.forward(10*distance)
+
+    def east(self, distance=1):
+        """Move the walker right a number of cells.
 
-    def east(self):
-        """Move the walker right one cell.
+        Keyword Arguments:
+            distance - How many cells to move.
 
         Side Effects:
             Alters the Walker's coordinates and display.
         """
         self._imhotep.setheading(0)
-        self._imhotep.forward(10)
+        self._imhotep.forward(10*distance)
+
+    def south(self, distance=1):
+        """Move the walker down a number of cells.
 
-    def south(self):
-        """Move the walker down one cell.
+        Keyword Arguments:
+            distance - How many cells to move.
 
         Side Effects:
             Alters the Walker's coordinates and display.
         """
         self._imhotep.setheading(270)
-        self._imhotep.forward(10)
+        self._imhotep.forward(10*distance)
+
+    def west(self, distance=1):
+        """Move the walker left a number of cells.
 
-    def west(self):
-        """Move the walker left one cell.
+        Keyword Arguments:
+            distance - How many cells to move.
 
         Side Effects:
             Alters the Walker's coordinates and display.
         """
         self._imhotep.setheading(180)
-        self._imhotep.forward(10)
+        self._imhotep.forward(10*distance)
 
     def show(self):
         """Block until user presses q."""
         self._imhotep.getscreen().mainloop()
 
+    @property
+    def root(self):
+        """The Tk window the maze is drawn in."""
+        return self._imhotep.getscreen().getcanvas().winfo_toplevel()
+
     def toggle(self, coordinates, direction):
         old_position = self._imhotep.position()
         old_heading = self._imhotep.heading()
@@ -126,7 +164,7 @@ class TurtleDisplay:
         self._draw_wall(coordinates, direction)
         self._imhotep.setposition(old_position)
         self._imhotep.setheading(old_heading)
-        self._imhotep.speed(3)
+        self._imhotep.speed(self._speed)
         self._imhotep.showturtle()
         self._imhotep.color('black')
         self._imhotep.clearstamp(stamp)
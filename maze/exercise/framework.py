@@ -4,19 +4,36 @@ from importlib import import_module
 from pathlib import Path
 
 from .. import Maze, Walker, TurtleDisplay
+from ..cache import MazeCache
 from ..errors import BadCommand, TooManyInstructions, Win
 
-def exercise(user_func, size=5, algo='dfs', fields=None):
-    """Handle common exercise setup."""
+# The maze as it was before the last run, and the Trace of the run, for
+# replay.
+_LAST_RUN = {}
+
+def exercise(user_func, size=5, algo='dfs', fields=None, seed=None):
+    """Handle common exercise setup.
+
+    Generated mazes with a seed are kept in the maze cache, so later runs
+    load them instead of generating them again. Every exercise so far is a
+    hand-made maze from fields, so none of them uses the cache yet. The run
+    is recorded, so it can be replayed without running the user's code
+    again.
+    """
     if fields:
-        maze = Maze(len(fields))
-        maze._maze = fields
+        maze = Maze.from_fields(fields)
+    elif seed is not None:
+        maze = MazeCache().fetch(size, algo, seed)
     else:
-        maze = maze(size)
+        maze = Maze(size)
         getattr(maze, algo)()
+    _LAST_RUN['maze'] = Maze(maze.size)
+    _LAST_RUN['maze'].cells[:] = maze.cells
+    _LAST_RUN['maze'].north_east = maze.north_east
     walker = Walker(maze)
     display = TurtleDisplay(maze)
     walker.power_on(display)
+    _LAST_RUN['trace'] = walker.record()
 
     try:
         user_func(walker)
@@ -28,9 +45,31 @@ def exercise(user_func, size=5, algo='dfs', fields=None):
         msg = str(err)
     else:
         msg = "You didn't make it to the exit."
+        distance = maze.distance(walker._coordinates)
+        if distance is not None:
+            msg += " You were {} cells from the exit.".format(distance)
     print("{} Press q to quit.".format(msg))
     display.show()
 
+def replay(delay=None):
+    """Show the last exercise run again, from its recording.
+
+    Keyword Arguments:
+        delay - None to draw the run without animation, or how many seconds
+                to wait between moves.
+
+    Returns:
+        replayed - False if nothing has been run yet.
+    """
+    if not _LAST_RUN:
+        return False
+    display = TurtleDisplay(_LAST_RUN['maze'])
+    display.draw()
+    _LAST_RUN['trace'].replay(display, delay)
+    print("Replay finished. Press q to quit.")
+    display.show()
+    return True
+
 def discover():
     """Find and get the registry details of all exercises."""
     registry = defaultdict(dict)
@@ -0,0 +1,1062 @@
+"""Maze generation engines working directly on a cell buffer.
+
+Each engine carves a perfect maze into a buffer laid out like Maze's cells:
+one byte per cell, row-major from the bottom left corner, with every cell
+starting out fully walled. Cells are addressed by integer ids, the id of the
+cell at (x, y) being y*width + x. Randomness is drawn from the rng argument,
+so passing a seeded random.Random gives the same maze every time.
+
+dfs - Randomized depth first search with an explicit integer stack.
+prim - Randomized Prim's Algorithm with a random access frontier.
+kruskal - Randomized Kruskal's Algorithm over a union-find forest.
+wilson - Wilson's Algorithm, loop-erased random walks.
+eller - Eller's Algorithm, filling a cell buffer.
+eller_rows - Eller's Algorithm, generating one finished row at a time.
+binary_tree - The binary tree algorithm, filling a cell buffer.
+binary_tree_rows - The binary tree algorithm, one finished row at a time.
+sidewinder - The sidewinder algorithm, filling a cell buffer.
+sidewinder_rows - The sidewinder algorithm, one finished row at a time.
+tiled - Generate tiles in parallel with another engine and stitch them.
+open_walls - Remove many walls at once.
+braid - Add loops by opening dead ends and removing walls.
+write_rows - Stream rows to a file or a callback.
+
+ALGORITHMS - The engines above that fill a cell buffer, by name.
+VERSION - Changes whenever an engine's output for a given seed changes.
+"""
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import compress, permutations, repeat
+from operator import add, mod, sub
+import random
+from random import Random
+
+VERSION = 1
+
+# Wall bits, matching Maze._WALLCHECK.
+NORTH = 1
+EAST = 2
+SOUTH = 4
+WEST = 8
+
+# Masks removing a wall from a cell, matching Maze._WALLBREAK.
+_BREAK = {
+    NORTH: 14,
+    EAST: 13,
+    SOUTH: 11,
+    WEST: 7}
+
+_OPPOSITE = {
+    NORTH: SOUTH,
+    EAST: WEST,
+    SOUTH: NORTH,
+    WEST: EAST}
+
+# Every order of the four directions, and for each order and each set of
+# directions blocked by the edge of the grid, the directions left to try.
+# _ORDERS[order*16 + border] is the tuple for that combination.
+_PERMUTATIONS = list(permutations((NORTH, EAST, SOUTH, WEST)))
+_ORDERS = [tuple(d for d in permutation if not d & border)
+           for permutation in _PERMUTATIONS
+           for border in range(16)]
+
+# For each set of directions blocked by the edge of the grid, a table mapping
+# a random byte to one of the remaining directions. Bytes which would bias
+# the choice map to 0 and should be redrawn.
+_CHOICES = []
+for _border in range(16):
+    _open = [d for d in (NORTH, EAST, SOUTH, WEST) if not d & _border]
+    _limit = 256 - 256 % len(_open) if _open else 0
+    _CHOICES.append(bytes(_open[value % len(_open)] if value < _limit else 0
+                          for value in range(256)))
+del _border, _open, _limit
+
+# Translation tables for carving whole rows at once. _CLOSED maps a set of
+# opened walls to the cell left behind, _COIN maps a random byte to a 0 or 1,
+# _BINARY_TREE maps a random byte to a wall to open and _OPEN_EAST maps a 0 to
+# an opening to the east.
+_CLOSED = bytes(15 ^ value if value < 16 else 0 for value in range(256))
+_COIN = bytes(value >> 7 for value in range(256))
+_BINARY_TREE = bytes(WEST if value < 128 else SOUTH for value in range(256))
+_OPEN_EAST = bytes([EAST, 0]) + bytes(254)
+
+# Translation tables for editing walls in bulk. _WALLS keeps only the wall
+# bits, _WITHOUT removes a wall and _WITH adds one, _FACING maps a cell to the
+# wall of the neighbor on one side if the cell's wall on that side is set,
+# _DEAD_END maps a cell with three walls to 1, _HIGH keeps the high nibble of
+# a random byte, and _BRAID maps the walls a cell may open in the low nibble
+# and a random nibble in the high one to one of those walls.
+_WALLS = bytes(value & 15 for value in range(256))
+_WITHOUT = {
+    wall: bytes(value & 15 & ~wall for value in range(256))
+    for wall in (NORTH, EAST, SOUTH, WEST)}
+_WITH = {
+    wall: bytes(value | wall for value in range(256))
+    for wall in (NORTH, EAST, SOUTH, WEST)}
+_FACING = {
+    wall: bytes(_OPPOSITE[wall] if value & wall else 0 for value in range(256))
+    for wall in (NORTH, EAST, SOUTH, WEST)}
+_DEAD_END = bytes(bin(value & 15).count('1') == 3 for value in range(256))
+_HIGH = bytes(value & 240 for value in range(256))
+_BRAID = bytearray(256)
+for _value in range(256):
+    _open = [d for d in (NORTH, EAST, SOUTH, WEST) if d & _value]
+    if _open:
+        _BRAID[_value] = _open[(_value >> 4) % len(_open)]
+_BRAID = bytes(_BRAID)
+del _value, _open
+
+# How many random bytes to draw from the generator at a time.
+_RANDOM_BATCH = 4096
+
+# Cell states for the frontier based engines.
+_UNSEEN = 0
+_FRONTIER = 1
+_VISITED = 2
+
+def _borders(width, height):
+    """Build the border lookup tables for a grid.
+
+    Positional Arguments:
+        width - The number of cells per row.
+        height - The number of rows.
+
+    Returns:
+        columns - A bytes of the edge walls for each column.
+        rows - A bytes of the edge walls for each row.
+    """
+    columns = bytearray(width)
+    columns[0] |= WEST
+    columns[-1] |= EAST
+    rows = bytearray(height)
+    rows[0] |= SOUTH
+    rows[-1] |= NORTH
+    return bytes(columns), bytes(rows)
+
+def _random_bytes(rng):
+    """Generate random bytes, drawn in batches.
+
+    Positional Arguments:
+        rng - The random.Random, or random module, to draw from.
+
+    Yields:
+        value - A uniformly distributed int in range(256).
+    """
+    while True:
+        batch = rng.getrandbits(8*_RANDOM_BATCH)
+        yield from batch.to_bytes(_RANDOM_BATCH, 'little')
+
+def _random_orders(rng):
+    """Generate random indexes into _PERMUTATIONS.
+
+    Bytes which would bias the result are skipped.
+
+    Positional Arguments:
+        rng - The random.Random, or random module, to draw from.
+
+    Yields:
+        order - A uniformly distributed int in range(24).
+    """
+    limit = 256 - 256 % len(_PERMUTATIONS)
+    for value in _random_bytes(rng):
+        if value < limit:
+            yield value % len(_PERMUTATIONS)
+
+def _carve(cells, cell, neighbor, direction):
+    """Remove the wall between two adjacent cells.
+
+    Positional Arguments:
+        cells - The cell buffer.
+        cell - The id of the first cell.
+        neighbor - The id of the second cell.
+        direction - The wall bit of cell facing neighbor.
+
+    Side Effects:
+        Modifies cells in place.
+    """
+    cells[cell] &= _BREAK[direction]
+    cells[neighbor] &= _BREAK[_OPPOSITE[direction]]
+
+def _attach_leaf(cells, width, height, leaf, rng):
+    """Join a cell which was left out of generation to a random neighbor.
+
+    Positional Arguments:
+        cells - The cell buffer.
+        width - The number of cells per row.
+        height - The number of rows.
+        leaf - The id of the cell to join to the rest of the maze.
+        rng - The random.Random, or random module, to draw from.
+
+    Side Effects:
+        Modifies cells in place.
+    """
+    columns, rows = _borders(width, height)
+    border = columns[leaf % width] | rows[leaf // width]
+    offsets = {NORTH: width, EAST: 1, SOUTH: -width, WEST: -1}
+    for value in _random_bytes(rng):
+        direction = _CHOICES[border][value]
+        if direction:
+            _carve(cells, leaf, leaf + offsets[direction], direction)
+            return
+
+def dfs(cells, width, height, leaf=-1, rng=random):
+    """Perform randomized DFS on a cell buffer.
+
+    The backtracking stack holds cell ids, alongside an int per entry packing
+    which neighbor order the cell uses and how far through it we are. Each
+    cell's neighbor order is chosen once, from a precomputed table that
+    already leaves out directions blocked by the edge of the grid.
+
+    Positional Arguments:
+        cells - A writable buffer of width*height fully walled cells.
+        width - The number of cells per row.
+        height - The number of rows.
+
+    Keyword Arguments:
+        leaf - The id of a cell to keep as a dead end, or -1 for none.
+        rng - The random.Random, or random module, to draw from.
+
+    Side Effects:
+        Modifies cells in place.
+    """
+    columns, rows = _borders(width, height)
+    offsets = [0]*9
+    offsets[NORTH] = width
+    offsets[EAST] = 1
+    offsets[SOUTH] = -width
+    offsets[WEST] = -1
+    breaks = [0]*9
+    opposite_breaks = [0]*9
+    for direction, mask in _BREAK.items():
+        breaks[direction] = mask
+        opposite_breaks[direction] = _BREAK[_OPPOSITE[direction]]
+    orders = _random_orders(rng)
+    visited = bytearray(width*height)
+    start = width*height-1 if leaf == 0 else 0
+    border = columns[start % width] | rows[start // width]
+    visited[start] = 1
+    stack = array('q', [start])
+    progress = array('H', [(next(orders)*16 + border)*4])
+    while stack:
+        cell = stack[-1]
+        order, position = divmod(progress[-1], 4)
+        directions = _ORDERS[order]
+        while position < len(directions):
+            direction = directions[position]
+            position += 1
+            neighbor = cell + offsets[direction]
+            if not visited[neighbor]:
+                break
+        else:
+            stack.pop()
+            progress.pop()
+            continue
+        progress[-1] = order*4 + position
+        visited[neighbor] = 1
+        cells[cell] &= breaks[direction]
+        cells[neighbor] &= opposite_breaks[direction]
+        if neighbor != leaf:
+            border = columns[neighbor % width] | rows[neighbor // width]
+            stack.append(neighbor)
+            progress.append((next(orders)*16 + border)*4)
+
+def prim(cells, width, height, leaf=-1, rng=random):
+    """Perform randomized Prim's Algorithm on a cell buffer.
+
+    The frontier is kept in an array, so picking a random cell is a single
+    index and removing it is a swap with the last entry. Whether a cell is
+    unseen, in the frontier or visited is tracked in a bytearray.
+
+    Positional Arguments:
+        cells - A writable buffer of width*height fully walled cells.
+        width - The number of cells per row.
+        height - The number of rows.
+
+    Keyword Arguments:
+        leaf - The id of a cell to keep as a dead end, or -1 for none.
+        rng - The random.Random, or random module, to draw from.
+
+    Side Effects:
+        Modifies cells in place.
+    """
+    total = width*height
+    state = bytearray(total)
+    start = total-1 if leaf == 0 else 0
+    frontier = array('q', [start])
+    state[start] = _FRONTIER
+    parents = []
+    while frontier:
+        index = int(rng.random()*len(frontier))
+        cell = frontier[index]
+        last = frontier.pop()
+        if index < len(frontier):
+            frontier[index] = last
+        state[cell] = _VISITED
+        x = cell % width
+        neighbors = []
+        if cell >= width:
+            neighbors.append((cell-width, SOUTH))
+        if cell < total-width:
+            neighbors.append((cell+width, NORTH))
+        if x > 0:
+            neighbors.append((cell-1, WEST))
+        if x < width-1:
+            neighbors.append((cell+1, EAST))
+        for neighbor, direction in neighbors:
+            if state[neighbor] == _VISITED:
+                if neighbor != leaf:
+                    parents.append((neighbor, direction))
+            elif state[neighbor] == _UNSEEN and cell != leaf:
+                frontier.append(neighbor)
+                state[neighbor] = _FRONTIER
+        if parents:
+            neighbor, direction = parents[int(rng.random()*len(parents))]
+            _carve(cells, cell, neighbor, direction)
+            del parents[:]
+
+class _DisjointSet:
+    """A union-find forest over the ints in range(size).
+
+    Parents are stored in an int array and ranks in a bytearray. Finding
+    halves the path as it goes and union attaches the shallower tree below
+    the deeper one.
+    """
+
+    def __init__(self, size):
+        """Put every int in a set of its own.
+
+        Positional Arguments:
+            size - The number of elements.
+        """
+        self._parents = array('q', range(size))
+        self._ranks = bytearray(size)
+
+    def find(self, element):
+        """Find the representative of an element's set.
+
+        Positional Arguments:
+            element - The element to look up.
+
+        Returns:
+            root - The representative element.
+        """
+        parents = self._parents
+        while parents[element] != element:
+            parents[element] = parents[parents[element]]
+            element = parents[element]
+        return element
+
+    def union(self, first, second):
+        """Merge the sets containing two elements.
+
+        Positional Arguments:
+            first - An element of the first set.
+            second - An element of the second set.
+
+        Returns:
+            merged - False if the elements were already in the same set.
+        """
+        first = self.find(first)
+        second = self.find(second)
+        if first == second:
+            return False
+        if self._ranks[first] < self._ranks[second]:
+            first, second = second, first
+        self._parents[second] = first
+        if self._ranks[first] == self._ranks[second]:
+            self._ranks[first] += 1
+        return True
+
+def kruskal(cells, width, height, leaf=-1, rng=random):
+    """Perform randomized Kruskal's Algorithm on a cell buffer.
+
+    Every wall between two cells is encoded as an int, 2*cell for the wall to
+    the east of cell and 2*cell + 1 for the wall to its north. All of them
+    are shuffled in one go, then knocked down in that order whenever they
+    separate two cells not yet joined, as tracked by a disjoint set.
+
+    Positional Arguments:
+        cells - A writable buffer of width*height fully walled cells.
+        width - The number of cells per row.
+        height - The number of rows.
+
+    Keyword Arguments:
+        leaf - The id of a cell to keep as a dead end, or -1 for none.
+        rng - The random.Random, or random module, to draw from.
+
+    Side Effects:
+        Modifies cells in place.
+    """
+    total = width*height
+    walls = array('q')
+    for row in range(0, total, width):
+        walls.extend(range(2*row, 2*(row+width-1), 2))
+    walls.extend(range(1, 2*(total-width), 2))
+    if leaf >= 0:
+        walls = array('q', (wall for wall in walls
+                            if wall//2 != leaf
+                            and wall//2 + (width if wall & 1 else 1) != leaf))
+    rng.shuffle(walls)
+    forest = _DisjointSet(total)
+    remaining = total - (2 if leaf >= 0 else 1)
+    for wall in walls:
+        if remaining <= 0:
+            break
+        cell = wall >> 1
+        if wall & 1:
+            neighbor, direction = cell + width, NORTH
+        else:
+            neighbor, direction = cell + 1, EAST
+        if forest.union(cell, neighbor):
+            _carve(cells, cell, neighbor, direction)
+            remaining -= 1
+    if leaf >= 0 and total > 1:
+        _attach_leaf(cells, width, height, leaf, rng)
+
+def wilson(cells, width, height, leaf=-1, rng=random):
+    """Perform Wilson's Algorithm on a cell buffer.
+
+    Starting from a tree holding a single cell, random walks are taken
+    from each cell not yet in the tree until they hit it. Each walk only
+    remembers the last direction it left every cell in, which erases any
+    loops, and the path it describes is then added to the tree. This picks
+    uniformly among all spanning trees of the grid.
+
+    Positional Arguments:
+        cells - A writable buffer of width*height fully walled cells.
+        width - The number of cells per row.
+        height - The number of rows.
+
+    Keyword Arguments:
+        leaf - The id of a cell to keep as a dead end, or -1 for none.
+        rng - The random.Random, or random module, to draw from.
+
+    Side Effects:
+        Modifies cells in place.
+    """
+    total = width*height
+    columns, rows = _borders(width, height)
+    offsets = [0]*9
+    offsets[NORTH] = width
+    offsets[EAST] = 1
+    offsets[SOUTH] = -width
+    offsets[WEST] = -1
+    randoms = _random_bytes(rng)
+    in_tree = bytearray(total)
+    exits = bytearray(total)
+    in_tree[total-1 if leaf == 0 else 0] = 1
+    if leaf >= 0:
+        in_tree[leaf] = 1
+    for start in range(total):
+        if in_tree[start]:
+            continue
+        cell = start
+        while not in_tree[cell]:
+            choices = _CHOICES[columns[cell % width] | rows[cell // width]]
+            direction = choices[next(randoms)]
+            if not direction:
+                continue
+            neighbor = cell + offsets[direction]
+            if neighbor == leaf:
+                continue
+            exits[cell] = direction
+            cell = neighbor
+        cell = start
+        while not in_tree[cell]:
+            direction = exits[cell]
+            neighbor = cell + offsets[direction]
+            _carve(cells, cell, neighbor, direction)
+            in_tree[cell] = 1
+            cell = neighbor
+    if leaf >= 0 and total > 1:
+        _attach_leaf(cells, width, height, leaf, rng)
+
+def eller_rows(width, height, leaf=-1, rng=random):
+    """Generate a maze one row at a time with Eller's Algorithm.
+
+    Only the current row and the one above it are held in memory, along with
+    which set each cell of the current row belongs to, so the maze can be far
+    larger than would fit in a cell buffer. Rows come out bottom first, each
+    one final as soon as it is yielded.
+
+    Positional Arguments:
+        width - The number of cells per row.
+        height - The number of rows.
+
+    Keyword Arguments:
+        leaf - -1, or the id of the north east cell to keep it as a dead end.
+        rng - The random.Random, or random module, to draw from.
+
+    Yields:
+        row - A bytes of width cells, encoded like Maze's cells.
+
+    Exceptions:
+        ValueError - Raised if leaf is some other cell.
+    """
+    _check_leaf(width, height, leaf)
+    randoms = _random_bytes(rng)
+    labels = array('q', [0])*width
+    next_label = 1
+    row = bytearray(b'\x0f')*width
+    for y in range(height):
+        last_row = y == height-1
+        # Pinning the north east cell means the cell below it never carves
+        # north, so it has to join its row's set to the west instead.
+        pin = leaf >= 0 and y == height-2 and width > 1
+        members = {}
+        for x in range(width):
+            if not labels[x]:
+                labels[x] = next_label
+                next_label += 1
+            members.setdefault(labels[x], []).append(x)
+        for x in range(width-1):
+            west, east = labels[x], labels[x+1]
+            if west == east:
+                continue
+            if last_row or next(randoms) < 128 or (pin and x == width-2):
+                if len(members[west]) < len(members[east]):
+                    west, east = east, west
+                for column in members[east]:
+                    labels[column] = west
+                members[west].extend(members.pop(east))
+                row[x] &= _BREAK[EAST]
+                row[x+1] &= _BREAK[WEST]
+        if last_row:
+            yield bytes(row)
+            return
+        above = bytearray(b'\x0f')*width
+        carved = array('q', [0])*width
+        for label, columns in members.items():
+            if pin and columns[-1] == width-1:
+                columns.pop()
+            forced = columns[next(randoms) % len(columns)]
+            for column in columns:
+                if column == forced or next(randoms) < 128:
+                    row[column] &= _BREAK[NORTH]
+                    above[column] &= _BREAK[SOUTH]
+                    carved[column] = label
+        yield bytes(row)
+        row = above
+        labels = carved
+
+def eller(cells, width, height, leaf=-1, rng=random):
+    """Perform Eller's Algorithm on a cell buffer.
+
+    Positional Arguments:
+        cells - A writable buffer of width*height fully walled cells.
+        width - The number of cells per row.
+        height - The number of rows.
+
+    Keyword Arguments:
+        leaf - -1, or the id of the north east cell to keep it as a dead end.
+        rng - The random.Random, or random module, to draw from.
+
+    Exceptions:
+        ValueError - Raised if leaf is some other cell.
+
+    Side Effects:
+        Modifies cells in place.
+    """
+    _fill(cells, width, eller_rows(width, height, leaf, rng))
+
+def _fill(cells, width, rows):
+    """Copy rows from one of the row generators into a cell buffer.
+
+    Positional Arguments:
+        cells - The cell buffer.
+        width - The number of cells per row.
+        rows - An iterable of rows, bottom row first.
+
+    Side Effects:
+        Modifies cells in place.
+    """
+    for y, row in enumerate(rows):
+        cells[y*width:(y+1)*width] = row
+
+def _check_leaf(width, height, leaf):
+    """Check that leaf is one that the row generators can honor.
+
+    Positional Arguments:
+        width - The number of cells per row.
+        height - The number of rows.
+        leaf - The id of a cell to keep as a dead end, or -1 for none.
+
+    Exceptions:
+        ValueError - Raised if leaf is not -1 or the north east cell.
+    """
+    if leaf not in (-1, width*height-1):
+        raise ValueError('Only the north east cell can be kept as a dead end')
+
+def _finish_rows(openings, width):
+    """Turn the walls each row opens into finished rows of cells.
+
+    Each row's own openings are combined with the south walls opened by the
+    row above, which become north walls of the row below. Whole rows are
+    combined at once as little endian ints.
+
+    Positional Arguments:
+        openings - An iterable of rows as little endian ints, one byte per
+                   cell holding the wall bits that cell opens, bottom row
+                   first. Openings to the east and west must already agree
+                   with each other.
+        width - The number of cells per row.
+
+    Yields:
+        row - A bytes of width cells, encoded like Maze's cells.
+    """
+    south = int.from_bytes(bytes([SOUTH])*width, 'little')
+    below = None
+    for row in openings:
+        if below is not None:
+            below |= (row & south) >> 2
+            yield below.to_bytes(width, 'little').translate(_CLOSED)
+        below = row
+    if below is not None:
+        yield below.to_bytes(width, 'little').translate(_CLOSED)
+
+def _random_row(width, rng):
+    """Draw one random byte for every cell in a row.
+
+    Positional Arguments:
+        width - The number of cells per row.
+        rng - The random.Random, or random module, to draw from.
+
+    Returns:
+        row - A bytes of width random bytes.
+    """
+    return rng.getrandbits(8*width).to_bytes(width, 'little')
+
+def binary_tree_rows(width, height, leaf=-1, rng=random):
+    """Generate a maze one row at a time with the binary tree algorithm.
+
+    Every cell opens either its south or its west wall at random, except
+    along the bottom row and west column where only one of them leads
+    anywhere. Whole rows are carved with bytes.translate and int operations,
+    with no loop over the cells in Python. The north east cell is always a
+    dead end.
+
+    Positional Arguments:
+        width - The number of cells per row.
+        height - The number of rows.
+
+    Keyword Arguments:
+        leaf - -1, or the id of the north east cell.
+        rng - The random.Random, or random module, to draw from.
+
+    Yields:
+        row - A bytes of width cells, encoded like Maze's cells.
+
+    Exceptions:
+        ValueError - Raised if leaf is some other cell.
+    """
+    _check_leaf(width, height, leaf)
+    west = int.from_bytes(bytes([WEST])*width, 'little')
+    def openings():
+        for y in range(height):
+            if y:
+                row = bytearray(
+                    _random_row(width, rng).translate(_BINARY_TREE))
+                row[0] = SOUTH
+            else:
+                row = bytearray([WEST])*width
+                row[0] = 0
+            # A west opening is also an east opening for the cell to the west.
+            row = int.from_bytes(row, 'little')
+            yield row | ((row >> 8) & west) >> 2
+    return _finish_rows(openings(), width)
+
+def binary_tree(cells, width, height, leaf=-1, rng=random):
+    """Perform the binary tree algorithm on a cell buffer.
+
+    Positional Arguments:
+        cells - A writable buffer of width*height fully walled cells.
+        width - The number of cells per row.
+        height - The number of rows.
+
+    Keyword Arguments:
+        leaf - -1, or the id of the north east cell.
+        rng - The random.Random, or random module, to draw from.
+
+    Exceptions:
+        ValueError - Raised if leaf is some other cell.
+
+    Side Effects:
+        Modifies cells in place.
+    """
+    _fill(cells, width, binary_tree_rows(width, height, leaf, rng))
+
+def sidewinder_rows(width, height, leaf=-1, rng=random):
+    """Generate a maze one row at a time with the sidewinder algorithm.
+
+    The bottom row is one long corridor. Every other row is cut into runs of
+    cells opened to each other east to west, and each run opens its south
+    wall from one cell picked at random. Run boundaries, run lengths and the
+    picks are all worked out for a whole row with bytes.translate, and with
+    compress and map over C builtins, with no loop over the cells in Python.
+    With leaf set, the north east cell is only picked when its run has no
+    other cells.
+
+    Positional Arguments:
+        width - The number of cells per row.
+        height - The number of rows.
+
+    Keyword Arguments:
+        leaf - -1, or the id of the north east cell to keep it as a dead end.
+        rng - The random.Random, or random module, to draw from.
+
+    Yields:
+        row - A bytes of width cells, encoded like Maze's cells.
+
+    Exceptions:
+        ValueError - Raised if leaf is some other cell.
+    """
+    _check_leaf(width, height, leaf)
+    mask = (1 << 8*width) - 1
+    columns = range(width)
+    def openings():
+        for y in range(height):
+            if y:
+                closed = bytearray(_random_row(width, rng).translate(_COIN))
+                closed[-1] = 1
+            else:
+                closed = bytearray(width)
+                closed[-1] = 1
+            east = int.from_bytes(closed.translate(_OPEN_EAST), 'little')
+            row = east | ((east << 8) & mask) << 2
+            if y:
+                starts = list(compress(columns, b'\x01' + closed[:-1]))
+                ends = list(compress(columns, closed))
+                # One less than the length of each run.
+                lengths = list(map(sub, ends, starts))
+                if leaf >= 0 and y == height-1 and lengths[-1]:
+                    # Keep the north east cell out of the pick.
+                    lengths[-1] -= 1
+                picks = array('L')
+                picks.frombytes(_random_row(picks.itemsize*len(starts), rng))
+                picks = map(mod, picks, map(add, lengths, repeat(1)))
+                picked = bytearray(width)
+                deque(map(picked.__setitem__, map(add, starts, picks),
+                          repeat(SOUTH)), 0)
+                row |= int.from_bytes(picked, 'little')
+            yield row
+    return _finish_rows(openings(), width)
+
+def sidewinder(cells, width, height, leaf=-1, rng=random):
+    """Perform the sidewinder algorithm on a cell buffer.
+
+    Positional Arguments:
+        cells - A writable buffer of width*height fully walled cells.
+        width - The number of cells per row.
+        height - The number of rows.
+
+    Keyword Arguments:
+        leaf - -1, or the id of the north east cell to keep it as a dead end.
+        rng - The random.Random, or random module, to draw from.
+
+    Exceptions:
+        ValueError - Raised if leaf is some other cell.
+
+    Side Effects:
+        Modifies cells in place.
+    """
+    _fill(cells, width, sidewinder_rows(width, height, leaf, rng))
+
+def write_rows(rows, sink):
+    """Send rows of cells somewhere as they are generated.
+
+    Positional Arguments:
+        rows - An iterable of rows, such as from eller_rows.
+        sink - A binary file, or any callable taking one row at a time.
+
+    Returns:
+        count - The number of rows written.
+    """
+    write = sink.write if hasattr(sink, 'write') else sink
+    count = 0
+    for row in rows:
+        write(row)
+        count += 1
+    return count
+
+def _tile_starts(length, tile_size):
+    """Split a length into tiles of about tile_size.
+
+    A remainder too short to leave the stitching any choice of where to cut
+    through is folded into the previous tile.
+
+    Positional Arguments:
+        length - The length to split.
+        tile_size - The preferred length of each tile.
+
+    Returns:
+        starts - The offset of each tile, followed by length.
+    """
+    starts = list(range(0, length, tile_size))
+    if len(starts) > 1 and length - starts[-1] < 2:
+        starts.pop()
+    starts.append(length)
+    return starts
+
+def _generate_tile(job):
+    """Generate a single tile, possibly in a worker process.
+
+    Positional Arguments:
+        job - A tuple of the algorithm name, the tile's width and height, the
+              tile's leaf and a seed for the tile's random.Random.
+
+    Returns:
+        cells - A bytes of the tile's cells.
+    """
+    algorithm, width, height, leaf, tile_seed = job
+    cells = bytearray(b'\x0f')*(width*height)
+    ALGORITHMS[algorithm](cells, width, height, leaf=leaf,
+                          rng=Random(tile_seed))
+    return bytes(cells)
+
+def tiled(cells, width, height, leaf=-1, rng=random, algorithm='dfs',
+          tile_size=256, workers=None):
+    """Generate a maze as separate tiles over a process pool.
+
+    Each tile is a perfect maze of its own, generated independently with the
+    given engine. The tiles are then joined along a random spanning tree of
+    the grid of tiles, itself carved by kruskal, opening one wall at a random
+    spot along each border in the tree. This keeps the whole maze perfect.
+
+    Positional Arguments:
+        cells - A writable buffer of width*height fully walled cells.
+        width - The number of cells per row.
+        height - The number of rows.
+
+    Keyword Arguments:
+        leaf - -1, or the id of the north east cell to keep it as a dead end.
+        rng - The random.Random, or random module, to draw from.
+        algorithm - The name of the engine in ALGORITHMS for each tile.
+        tile_size - The number of cells per side of a tile.
+        workers - The number of worker processes, or None for one per CPU.
+                  With 1, or a single tile, everything runs in this process.
+
+    Exceptions:
+        KeyError - Raised for an unknown algorithm.
+        ValueError - Raised if leaf is some other cell.
+
+    Side Effects:
+        Modifies cells in place.
+    """
+    _check_leaf(width, height, leaf)
+    if algorithm not in ALGORITHMS:
+        raise KeyError(algorithm)
+    columns = _tile_starts(width, tile_size)
+    rows = _tile_starts(height, tile_size)
+    tiles = [(x0, y0, x1-x0, y1-y0)
+             for y0, y1 in zip(rows, rows[1:])
+             for x0, x1 in zip(columns, columns[1:])]
+    jobs = []
+    for x0, y0, tile_width, tile_height in tiles:
+        tile_leaf = -1
+        if leaf >= 0 and x0+tile_width == width and y0+tile_height == height:
+            tile_leaf = tile_width*tile_height - 1
+        jobs.append((algorithm, tile_width, tile_height, tile_leaf,
+                     rng.getrandbits(64)))
+    if workers == 1 or len(jobs) == 1:
+        executor = None
+        results = map(_generate_tile, jobs)
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        results = executor.map(_generate_tile, jobs)
+    try:
+        for (x0, y0, tile_width, tile_height), tile in zip(tiles, results):
+            for row in range(tile_height):
+                start = (y0+row)*width + x0
+                cells[start:start+tile_width] = \
+                    tile[row*tile_width:(row+1)*tile_width]
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    tile_columns = len(columns) - 1
+    tile_rows = len(rows) - 1
+    joins = bytearray(b'\x0f')*(tile_columns*tile_rows)
+    kruskal(joins, tile_columns, tile_rows, rng=rng)
+    for tile_id, (x0, y0, tile_width, tile_height) in enumerate(tiles):
+        for direction in (EAST, NORTH):
+            if joins[tile_id] & direction:
+                continue
+            if direction == EAST:
+                x = x0 + tile_width - 1
+                spots = [y*width + x for y in range(y0, y0+tile_height)]
+                offset = 1
+            else:
+                y = y0 + tile_height - 1
+                spots = [y*width + x for x in range(x0, x0+tile_width)]
+                offset = width
+            spots = [spot for spot in spots if leaf not in (spot, spot+offset)]
+            spot = spots[int(rng.random()*len(spots))]
+            _carve(cells, spot, spot+offset, direction)
+
+def _edges(cells, width, height, tables):
+    """Translate the cells along each edge of the grid with its own table.
+
+    Positional Arguments:
+        cells - The cell buffer, or a copy of it.
+        width - The number of cells per row.
+        height - The number of rows.
+        tables - A dict of translation tables, by the wall on each edge.
+
+    Side Effects:
+        Modifies cells in place.
+    """
+    total = width*height
+    for wall, edge in (
+            (SOUTH, slice(0, width)),
+            (NORTH, slice(total-width, total)),
+            (WEST, slice(0, total, width)),
+            (EAST, slice(width-1, total, width))):
+        cells[edge] = bytes(cells[edge]).translate(tables[wall])
+
+def _inner_walls(cells, width, height, leaf):
+    """Find the walls which divide two cells and may be removed.
+
+    Positional Arguments:
+        cells - The cell buffer.
+        width - The number of cells per row.
+        height - The number of rows.
+        leaf - The id of a cell whose walls must stay, or -1 for none.
+
+    Returns:
+        walls - A bytearray of the removable wall bits of each cell.
+    """
+    walls = bytearray(bytes(cells).translate(_WALLS))
+    _edges(walls, width, height, _WITHOUT)
+    if leaf >= 0:
+        walls[leaf] = 0
+        for direction, neighbor in (
+                (NORTH, leaf + width),
+                (EAST, leaf + 1 if (leaf + 1) % width else -1),
+                (SOUTH, leaf - width),
+                (WEST, leaf - 1 if leaf % width else -1)):
+            if 0 <= neighbor < len(walls):
+                walls[neighbor] &= ~_OPPOSITE[direction]
+    return walls
+
+def open_walls(cells, width, height, walls):
+    """Remove many walls at once, from both of the cells they divide.
+
+    The walls to remove and the walls of the neighbors facing them are
+    gathered into one int holding a byte per cell, shifting by a cell or a
+    row, and cleared from the whole buffer with a single and. The toggle bits
+    of the removed walls go with them.
+
+    Positional Arguments:
+        cells - The cell buffer.
+        width - The number of cells per row.
+        height - The number of rows.
+        walls - A bytes-like with a byte per cell of the wall bits to remove
+                from that cell. Walls on the edge of the grid and any other
+                bits are ignored.
+
+    Exceptions:
+        ValueError - Raised if walls is not the same length as cells.
+
+    Side Effects:
+        Modifies cells in place.
+    """
+    total = width*height
+    if len(walls) != total:
+        raise ValueError('Expected {} cells of walls'.format(total))
+    walls = bytearray(bytes(walls).translate(_WALLS))
+    _edges(walls, width, height, _WITHOUT)
+    walls = bytes(walls)
+    removed = int.from_bytes(walls, 'little')
+    for wall, shift in ((NORTH, 8*width), (EAST, 8)):
+        facing = int.from_bytes(walls.translate(_FACING[wall]), 'little')
+        removed |= facing << shift
+    for wall, shift in ((SOUTH, 8*width), (WEST, 8)):
+        facing = int.from_bytes(walls.translate(_FACING[wall]), 'little')
+        removed |= facing >> shift
+    removed |= removed << 4
+    kept = int.from_bytes(cells, 'little') & ~removed
+    cells[:] = kept.to_bytes(total, 'little')
+
+def _remove_walls(cells, width, height, count, leaf, rng):
+    """Remove walls between cells at random.
+
+    Positional Arguments:
+        cells - The cell buffer.
+        width - The number of cells per row.
+        height - The number of rows.
+        count - How many walls to remove, at most.
+        leaf - The id of a cell which is left alone, or -1 for none.
+        rng - The random.Random, or random module, to draw from.
+
+    Side Effects:
+        Modifies cells in place.
+    """
+    inner = _inner_walls(cells, width, height, leaf)
+    # Every wall between two cells is counted once from each side.
+    remaining = sum(inner.count(value) * bin(value).count('1')
+                    for value in range(1, 16)) // 2
+    count = min(count, remaining)
+    offsets = {NORTH: width, EAST: 1, SOUTH: -width, WEST: -1}
+    walls = bytearray(width*height)
+    randoms = _random_bytes(rng)
+    while count:
+        cell = rng.randrange(len(walls))
+        direction = _CHOICES[15 ^ inner[cell]][next(randoms)]
+        if not inner[cell] or not direction:
+            continue
+        inner[cell] &= ~direction
+        inner[cell + offsets[direction]] &= ~_OPPOSITE[direction]
+        walls[cell] |= direction
+        count -= 1
+    open_walls(cells, width, height, walls)
+
+def braid(cells, width, height, fraction=1.0, loops=0, leaf=-1, rng=random):
+    """Add loops to a maze, so there is more than one way through it.
+
+    Each dead end is opened into a random neighbor with the given chance.
+    Finding the dead ends, picking which are opened and picking their walls
+    are each done over the whole buffer with bytes.translate and int
+    operations, and the walls are then removed with open_walls. After that,
+    more walls between cells are removed at random, each closing a loop.
+
+    Positional Arguments:
+        cells - The cell buffer.
+        width - The number of cells per row.
+        height - The number of rows.
+
+    Keyword Arguments:
+        fraction - The chance of each dead end being opened up.
+        loops - How many more walls to remove afterwards. Fewer are removed
+                if the maze runs out of walls between cells.
+        leaf - The id of a cell to keep as it is, or -1 for none.
+        rng - The random.Random, or random module, to draw from.
+
+    Side Effects:
+        Modifies cells in place.
+    """
+    total = width*height
+    inner = _inner_walls(cells, width, height, leaf)
+    sealed = bytearray(cells)
+    _edges(sealed, width, height, _WITH)
+    chance = bytes(value < fraction*256 for value in range(256))
+    picked = (
+        int.from_bytes(bytes(sealed).translate(_DEAD_END), 'little')
+        & int.from_bytes(_random_row(total, rng).translate(chance), 'little'))
+    keys = (int.from_bytes(inner, 'little')
+            | int.from_bytes(_random_row(total, rng).translate(_HIGH),
+                             'little'))
+    choices = keys.to_bytes(total, 'little').translate(_BRAID)
+    walls = int.from_bytes(choices, 'little') & picked*15
+    open_walls(cells, width, height, walls.to_bytes(total, 'little'))
+    if loops:
+        _remove_walls(cells, width, height, loops, leaf, rng)
+
+ALGORITHMS = {
+    'dfs': dfs,
+    'prim': prim,
+    'kruskal': kruskal,
+    'wilson': wilson,
+    'eller': eller,
+    'binary_tree': binary_tree,
+    'sidewinder': sidewinder,
+    'tiled': tiled}
@@ -0,0 +1,124 @@
+"""A maze kept on disk instead of in memory.
+
+MappedMaze - A Maze whose cells are a memory mapped maze file.
+"""
+import mmap
+
+from .maze import Maze
+
+class MappedMaze(Maze):
+    """A Maze backed by an uncompressed maze file, mapped into memory.
+
+    The cell buffer is a view of the mapped file, so opening a maze of any
+    size takes the same time, and the operating system only reads in the
+    pages around the cells which are actually used. Changes are written back
+    to the file.
+
+    Views from the cells property keep the file mapped, so they have to be
+    released before close.
+
+    Methods:
+        create
+        flush
+        close
+    """
+
+    def __init__(self, path, writable=True):
+        """Map a maze file saved without compression.
+
+        Positional Arguments:
+            path - The path of the maze file.
+
+        Keyword Arguments:
+            writable - Whether changes to the maze go back to the file.
+
+        Exceptions:
+            ValueError - Raised if the file is not an uncompressed maze this
+                         version can read, or is truncated.
+        """
+        with open(path, 'r+b' if writable else 'rb') as maze_file:
+            size, north_east, compression = self._read_header(maze_file)
+            if compression != self._COMPRESSION[None]:
+                raise ValueError('Only uncompressed mazes can be mapped')
+            access = mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ
+            self._mmap = mmap.mmap(maze_file.fileno(), 0, access=access)
+        if len(self._mmap) - self._HEADER.size < size*size:
+            self._mmap.close()
+            raise ValueError('Truncated maze cells')
+        super().__init__(size)
+        self.north_east = north_east
+
+    def _allocate(self, size):
+        """Use the mapped file as the cell buffer.
+
+        Positional Arguments:
+            size - The number of maze cells per side.
+
+        Returns:
+            cells - A memoryview of the cells in the mapped file.
+        """
+        start = self._HEADER.size
+        return memoryview(self._mmap)[start:start+size*size]
+
+    @classmethod
+    def create(cls, path, size, chunk=2**20):
+        """Write a new fully walled maze file and map it.
+
+        Positional Arguments:
+            path - The path of the maze file to write.
+            size - The number of maze cells per side.
+
+        Keyword Arguments:
+            chunk - How many cells to write at a time.
+
+        Returns:
+            maze - The new MappedMaze, ready for generation.
+        """
+        total = size*size
+        walls = b'\x0f'*min(chunk, total)
+        rows = (walls[:min(chunk, total-start)]
+                for start in range(0, total, chunk))
+        cls.save_stream(path, size, rows)
+        return cls(path)
+
+    @classmethod
+    def load(cls, file):
+        """Map a maze file, the same as MappedMaze(file).
+
+        Positional Arguments:
+            file - The path of the maze file.
+
+        Returns:
+            maze - The MappedMaze.
+        """
+        return cls(file)
+
+    def flush(self):
+        """Write changes to the cells back to the file."""
+        self._mmap.flush()
+
+    def close(self):
+        """Unmap the file. The maze can not be used afterwards.
+
+        Every view from the cells property is a view of the mapped file, so
+        they all have to be released, or dropped, before the file can be
+        unmapped, for example with memoryview.release or by using the view
+        in a with statement.
+
+        Exceptions:
+            BufferError - Raised if a view from cells is still in use. The
+                          maze is left open and usable.
+        """
+        self._cells.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            self._cells = self._allocate(self._size)
+            raise BufferError('Release the views from MappedMaze.cells '
+                              'before closing it')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -2,32 +2,64 @@
 
 Maze - A Maze to be walked through.
 """
-from collections import deque
-from random import sample, choice
+import random
+import struct
+import zlib
+from array import array
+from collections import Counter
+
+from . import generators
 
 class Maze:
     """A Randomized maze.
 
     Methods:
+        from_fields
+        from_rows
+        load
+        save
+        save_stream
         dfs
         prim
+        kruskal
+        wilson
+        eller
+        binary_tree
+        sidewinder
+        tiled
         can_move
+        corridors
+        toggle
+        punch_many
+        set_toggles
+        braid
+        distance
+        hint
+        on_path
+        validate
+        stats
+        snapshot
+        restore
+        discard_snapshots
 
     Attributes:
         north_east - The coordinates of the top right cell of the maze.
+        cells - A zero-copy view of the cell buffer.
     """
 
-    # The maze is represented by a double list of 8-bit long ints. Each int
-    # represents a cell of the maze and defines the walls around that cell, with
-    # the lower 4 bits representing a wall and the upper 4 bits representing if
-    # a wall is removable. The mapping is 0000 -> WSEN, with a 1 being a wall
-    # for the lower 4 bits, and a 1 being a toggleable wall for the upper 4
-    # bits. These three dicts are useful for operating on these ints. Bitwise
-    # and with an entry in the _WALLCHECK dict will tell you if there is a wall
-    # in a given direction. Bitwise and with an entry in the _WALLBREAK dict
-    # will return a cell with the given wall removed and the other walls
-    # unchanged. Bitwise and with an entry in the _TOGGLE dict will tell you if
-    # the wall in that direction is toggleable.
+    # The maze is represented by a flat bytearray, one byte per cell, stored
+    # row-major from the bottom left corner, so the cell at (x, y) lives at
+    # index y*size + x. Each byte represents a cell of the maze and defines the
+    # walls around that cell, with the lower 4 bits representing a wall and the
+    # upper 4 bits representing if a wall is removable. The mapping is
+    # 0000 -> WSEN, with a 1 being a wall for the lower 4 bits, and a 1 being a
+    # toggleable wall for the upper 4 bits. These dicts are useful for
+    # operating on these bytes. Bitwise and with an entry in the _WALLCHECK
+    # dict will tell you if there is a wall in a given direction. Bitwise and
+    # with an entry in the _WALLBREAK dict will return a cell with the given
+    # wall removed and the other walls unchanged. Bitwise and with an entry in
+    # the _TOGGLE dict will tell you if the wall in that direction is
+    # toggleable.
     _WALLCHECK = {
         'north': 1,
         'east': 2,
@@ -43,6 +75,23 @@ class Maze:
         'east': 32,
         'south': 64,
         'west': 128}
+    _OPPOSITE = {
+        'north': 'south',
+        'east': 'west',
+        'south': 'north',
+        'west': 'east'}
+
+    # Saved mazes start with a fixed size header: magic, format version, cell
+    # encoding, compression, a pad byte, then the size and the coordinates of
+    # the exit. The cells follow, in the same layout as self._cells, either
+    # as is or as a single zlib stream running to the end of the file.
+    _HEADER = struct.Struct('<4sBBBxQQQ')
+    _MAGIC = b'IMHO'
+    _FORMAT_VERSION = 1
+    _ENCODING_WSEN = 0
+    _COMPRESSION = {
+        None: 0,
+        'zlib': 1}
 
     def __init__(self, size):
         """Initialize the Maze and derive the north_east attribute.
@@ -52,93 +101,415 @@ class Maze:
         """
         self._size = size
         self.north_east = (size-1, size-1)
-        self._maze = [[15 for i in range(size)] for j in range(size)]
+        self._cells = self._allocate(size)
+        self._distances = None
+        self._path = None
+        self._corridors = None
+        self._journal = None
+        self._snapshots = []
+        self._snapshot_ids = 0
+
+    def _allocate(self, size):
+        """Create the cell buffer, with every wall in place.
+
+        Positional Arguments:
+            size - The number of maze cells per side.
+
+        Returns:
+            cells - A writable buffer of size*size bytes.
+        """
+        return bytearray(b'\x0f') * (size*size)
+
+    @classmethod
+    def from_fields(cls, fields):
+        """Build a Maze from a double list of cells, indexed as fields[x][y].
+
+        Positional Arguments:
+            fields - A list of columns, each a list of cell ints.
+
+        Returns:
+            maze - A new Maze holding a copy of the given cells.
+
+        Exceptions:
+            ValueError - Raised if the fields are not square or a cell does
+                         not fit in a byte.
+        """
+        maze = cls(len(fields))
+        for x, column in enumerate(fields):
+            maze._cells[x::maze._size] = bytes(column)
+        return maze
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Build a Maze from rows of cells, bottom row first.
+
+        This reads the output of generators.eller_rows, or the same rows back
+        from a file, for example with iter(partial(file.read, size), b'').
+
+        Positional Arguments:
+            rows - An iterable of bytes-like rows, one byte per cell.
+
+        Returns:
+            maze - A new Maze holding a copy of the given cells.
+
+        Exceptions:
+            ValueError - Raised if the rows do not make a square.
+        """
+        cells = bytearray()
+        for row in rows:
+            cells += row
+        size = int(len(cells)**0.5)
+        if size*size != len(cells) or (cells and len(row) != size):
+            raise ValueError('Rows do not make a square maze')
+        maze = cls(size)
+        maze._cells[:] = cells
+        return maze
+
+    @classmethod
+    def load(cls, file):
+        """Load a Maze saved with save or save_stream.
+
+        Uncompressed cells are read straight into the new cell buffer, once
+        the file is known to hold them all.
+
+        Positional Arguments:
+            file - A path, or a binary file positioned at the maze.
+
+        Returns:
+            maze - The loaded Maze.
+
+        Exceptions:
+            ValueError - Raised if the file is not a maze this version can
+                         read, or is truncated.
+        """
+        if not hasattr(file, 'read'):
+            with open(file, 'rb') as maze_file:
+                return cls.load(maze_file)
+        size, north_east, compression = cls._read_header(file)
+        total = size*size
+        # The size is checked against what the file holds before the cell
+        # buffer is made, so a corrupt size can not allocate gigabytes.
+        cells = None
+        if compression == cls._COMPRESSION[None]:
+            left = cls._bytes_left(file)
+            if left is None:
+                cells = bytearray()
+                while len(cells) < total:
+                    chunk = file.read(min(total - len(cells), 2**20))
+                    if not chunk:
+                        break
+                    cells += chunk
+            elif left < total:
+                raise ValueError('Truncated maze cells')
+        else:
+            decompressor = zlib.decompressobj()
+            try:
+                cells = decompressor.decompress(file.read(), total+1)
+            except zlib.error:
+                raise ValueError('Corrupt compressed maze cells')
+            if not decompressor.eof:
+                raise ValueError('Truncated maze cells')
+        if cells is not None and len(cells) != total:
+            raise ValueError('Truncated maze cells')
+        maze = cls(size)
+        maze.north_east = north_east
+        if cells is None:
+            if file.readinto(maze._cells) != total:
+                raise ValueError('Truncated maze cells')
+        else:
+            maze._cells[:] = cells
+        return maze
+
+    @staticmethod
+    def _bytes_left(file):
+        """Find how many bytes are left in a file after its position.
+
+        Positional Arguments:
+            file - A binary file.
+
+        Returns:
+            left - The number of bytes left, or None if the file can not
+                   seek, such as a pipe.
+        """
+        try:
+            position = file.tell()
+            end = file.seek(0, 2)
+            file.seek(position)
+        except OSError:
+            return None
+        return end - position
+
+    @classmethod
+    def _read_header(cls, file):
+        """Read and check the header of a saved maze.
+
+        Positional Arguments:
+            file - A binary file positioned at the start of the maze.
+
+        Returns:
+            size - The number of maze cells per side.
+            north_east - The coordinates of the exit.
+            compression - The compression code of the cells.
+
+        Exceptions:
+            ValueError - Raised if the file is not a maze this version can
+                         read, or its exit is not inside the maze.
+        """
+        header = file.read(cls._HEADER.size)
+        if len(header) != cls._HEADER.size:
+            raise ValueError('Truncated maze header')
+        magic, version, encoding, compression, size, x, y = \
+            cls._HEADER.unpack(header)
+        if magic != cls._MAGIC:
+            raise ValueError('Not a maze file')
+        if version != cls._FORMAT_VERSION or encoding != cls._ENCODING_WSEN:
+            raise ValueError('Unsupported maze file version or encoding')
+        if compression not in cls._COMPRESSION.values():
+            raise ValueError('Unsupported maze file compression')
+        if not (x < size and y < size):
+            raise ValueError('Maze exit is not inside the maze')
+        return size, (x, y), compression
+
+    def save(self, file, compression=None):
+        """Save the Maze in the binary maze format.
+
+        Positional Arguments:
+            file - A path, or a binary file to write to.
+
+        Keyword Arguments:
+            compression - None, or 'zlib' to compress the cells.
+
+        Exceptions:
+            KeyError - Raised for an unknown compression.
+        """
+        self.save_stream(file, self._size, [self.cells], compression,
+                         north_east=self.north_east)
+
+    @classmethod
+    def save_stream(cls, file, size, rows, compression=None,
+                    north_east=None):
+        """Save cells in the binary maze format as they are generated.
+
+        Together with generators.eller_rows, this writes mazes which would
+        not fit in memory.
+
+        Positional Arguments:
+            file - A path, or a binary file to write to.
+            size - The number of maze cells per side.
+            rows - An iterable of bytes-like chunks of cells, in order.
+
+        Keyword Arguments:
+            compression - None, or 'zlib' to compress the cells.
+            north_east - The coordinates of the exit, by default the top
+                         right cell.
+
+        Exceptions:
+            KeyError - Raised for an unknown compression.
+        """
+        if not hasattr(file, 'write'):
+            with open(file, 'wb') as maze_file:
+                cls.save_stream(maze_file, size, rows, compression,
+                                north_east)
+            return
+        if north_east is None:
+            north_east = (size-1, size-1)
+        x, y = north_east
+        file.write(cls._HEADER.pack(
+            cls._MAGIC, cls._FORMAT_VERSION, cls._ENCODING_WSEN,
+            cls._COMPRESSION[compression], size, x, y))
+        if compression is None:
+            for row in rows:
+                file.write(row)
+        else:
+            compressor = zlib.compressobj()
+            for row in rows:
+                file.write(compressor.compress(row))
+            file.write(compressor.flush())
 
     @property
     def size(self):
         """Read only property for size."""
         return self._size
 
-    def dfs(self):
+    @property
+    def cells(self):
+        """Writable memoryview of the cell buffer, without copying it."""
+        return memoryview(self._cells)
+
+    def _index(self, coordinates):
+        """Convert coordinates into an index into the cell buffer.
+
+        Positional Arguments:
+            coordinates - The coordinates of the cell.
+
+        Returns:
+            index - The position of the cell in self._cells.
+
+        Exceptions:
+            IndexError - Raised if the coordinates are not inside the maze.
+        """
+        x, y = coordinates
+        if not (0 <= x < self._size and 0 <= y < self._size):
+            raise IndexError('Coordinates are not inside the maze')
+        return y*self._size + x
+
+    def dfs(self, seed=None):
         """Perform randomized DFS to generate the maze.
 
-        Uses a stack of generators to perform the backtracking instead of
-        recursion. I like big mazes and I cannot lie.
+        Uses an explicit stack of cell ids to perform the backtracking instead
+        of recursion, see generators.dfs for details. I like big mazes and I
+        cannot lie.
+
+        Keyword Arguments:
+            seed - A seed for the maze, or a random.Random to draw from. By
+                   default the random module is used.
 
         Side Effects:
-            Modifies self._maze in place.
+            Modifies self._cells in place.
         """
-        coordinates = (0, 0)
-        visited = set()
-        stack = deque()
-        while True:
-            visited.add(coordinates)
-            try:
-                if coordinates == self.north_east:
-                    raise StopIteration
-                gen = self._neighbors(coordinates)
-                while True:
-                    neighbor = next(gen)
-                    if neighbor not in visited:
-                        break
-                self._punch_hole(coordinates, neighbor)
-                stack.append((coordinates, gen))
-                coordinates = neighbor
-            except StopIteration:
-                if coordinates == (0, 0):
-                    break
-                coordinates, gen = stack.pop()
-
-    def prim(self):
+        self._generate('dfs', seed)
+
+    def prim(self, seed=None):
         """Perform randomized Prim's Algorithm to generate the maze.
 
+        Runs in time roughly linear in the number of cells, see
+        generators.prim for details.
+
+        Keyword Arguments:
+            seed - A seed for the maze, or a random.Random to draw from. By
+                   default the random module is used.
+
         Side Effects:
-            Modifies self._maze in place.
-        """
-        visited = {(0, 0)}
-        candidates = {(0, 1), (1, 0)}
-        while candidates:
-            coordinates = choice(sorted(candidates))
-            punched = False
-            for neighbor in self._neighbors(coordinates):
-                if neighbor in visited:
-                    if not punched and neighbor != self.north_east:
-                        self._punch_hole(neighbor, coordinates)
-                        punched = True
-                elif coordinates != self.north_east:
-                    candidates.add(neighbor)
-            candidates.remove(coordinates)
-            visited.add(coordinates)
+            Modifies self._cells in place.
+        """
+        self._generate('prim', seed)
 
-    _RELATIVE_COORDINATES = {
-        'north': lambda x, y: (x, y+1),
-        'east': lambda x, y: (x+1, y),
-        'south': lambda x, y: (x, y-1),
-        'west': lambda x, y: (x-1, y)}
+    def kruskal(self, seed=None):
+        """Perform randomized Kruskal's Algorithm to generate the maze.
+
+        Keyword Arguments:
+            seed - A seed for the maze, or a random.Random to draw from. By
+                   default the random module is used.
+
+        Side Effects:
+            Modifies self._cells in place.
+        """
+        self._generate('kruskal', seed)
+
+    def wilson(self, seed=None):
+        """Perform Wilson's Algorithm to generate the maze.
+
+        Every possible maze is equally likely, apart from the exit always
+        being a dead end.
 
-    def _neighbors(self, coordinates):
-        """Generate the coordinates of neighboring cells in random order.
+        Keyword Arguments:
+            seed - A seed for the maze, or a random.Random to draw from. By
+                   default the random module is used.
+
+        Side Effects:
+            Modifies self._cells in place.
+        """
+        self._generate('wilson', seed)
+
+    def eller(self, seed=None):
+        """Perform Eller's Algorithm to generate the maze.
+
+        Keyword Arguments:
+            seed - A seed for the maze, or a random.Random to draw from. By
+                   default the random module is used.
+
+        Side Effects:
+            Modifies self._cells in place.
+        """
+        self._generate('eller', seed)
+
+    def binary_tree(self, seed=None):
+        """Perform the binary tree algorithm to generate the maze.
+
+        Fast, but every cell leads south or west, so the way back to the
+        entrance is never hard to find.
+
+        Keyword Arguments:
+            seed - A seed for the maze, or a random.Random to draw from. By
+                   default the random module is used.
+
+        Side Effects:
+            Modifies self._cells in place.
+        """
+        self._generate('binary_tree', seed)
+
+    def sidewinder(self, seed=None):
+        """Perform the sidewinder algorithm to generate the maze.
+
+        Keyword Arguments:
+            seed - A seed for the maze, or a random.Random to draw from. By
+                   default the random module is used.
+
+        Side Effects:
+            Modifies self._cells in place.
+        """
+        self._generate('sidewinder', seed)
+
+    def tiled(self, seed=None, algorithm='dfs', tile_size=256, workers=None):
+        """Generate the maze in tiles, in parallel over a process pool.
+
+        Keyword Arguments:
+            seed - A seed for the maze, or a random.Random to draw from. By
+                   default the random module is used.
+            algorithm - The name of the generator to use for each tile.
+            tile_size - The number of cells per side of a tile.
+            workers - The number of worker processes, or None for one per CPU.
+
+        Exceptions:
+            KeyError - Raised for an unknown algorithm.
+
+        Side Effects:
+            Modifies self._cells in place.
+        """
+        self._generate('tiled', seed, algorithm=algorithm,
+                       tile_size=tile_size, workers=workers)
+
+    def _generate(self, name, seed, **options):
+        """Run one of the engines in generators over the cell buffer.
 
         Positional Arguments:
-            coordinates - The coordinates of the cell to get the neighbors of.
+            name - The name of the engine in generators.ALGORITHMS.
+            seed - A seed, a random.Random or None for the random module.
+
+        Keyword Arguments:
+            Passed on to the engine.
 
-        Yields:
-            neighbor - The coordinates of a random neighboring cell.
+        Side Effects:
+            Modifies self._cells in place.
         """
-        x, y = coordinates
+        self._journal_all()
+        generators.ALGORITHMS[name](
+            self._cells, self._size, self._size,
+            leaf=self._index(self.north_east), rng=self._random(seed),
+            **options)
+        self._forget()
 
-        neighbors = {c: f(x, y) for c, f in self._RELATIVE_COORDINATES.items()}
+    @staticmethod
+    def _random(seed):
+        """Work out where to draw random numbers from.
 
-        if x == 0:
-            del neighbors['west']
-        elif x == self._size-1:
-            del neighbors['east']
-        if y == 0:
-            del neighbors['south']
-        elif y == self._size-1:
-            del neighbors['north']
-        for neighbor in sample(list(neighbors.values()), len(neighbors)):
-            yield neighbor
+        Positional Arguments:
+            seed - A seed, a random.Random or None for the random module.
+
+        Returns:
+            rng - A random.Random, or the random module.
+        """
+        if seed is None:
+            return random
+        if isinstance(seed, random.Random):
+            return seed
+        return random.Random(seed)
+
+    _RELATIVE_COORDINATES = {
+        'north': lambda x, y: (x, y+1),
+        'east': lambda x, y: (x+1, y),
+        'south': lambda x, y: (x, y-1),
+        'west': lambda x, y: (x-1, y)}
 
     def _punch_hole(self, start_coordinates, end_coordinates):
         """Removes the walls between two adjacent cells.
@@ -152,30 +523,109 @@ class Maze:
             IndexError - Raised if the coordinates are not inside the maze.
 
         Side Effects:
-            Modifies self._maze in place.
+            Modifies self._cells in place.
         """
         start_x, start_y = start_coordinates
         end_x, end_y = end_coordinates
         if start_x == end_x:
             if end_y - start_y == 1:
-                self._maze[start_x][start_y] &= self._WALLBREAK['north']
-                self._maze[end_x][end_y] &= self._WALLBREAK['south']
+                direction = 'north'
             elif end_y - start_y == -1:
-                self._maze[start_x][start_y] &= self._WALLBREAK['south']
-                self._maze[end_x][end_y] &= self._WALLBREAK['north']
+                direction = 'south'
             else:
                 raise ValueError('Coordinates are not adjacent')
         elif start_y == end_y:
             if end_x - start_x == 1:
-                self._maze[start_x][start_y] &= self._WALLBREAK['east']
-                self._maze[end_x][end_y] &= self._WALLBREAK['west']
+                direction = 'east'
             elif end_x - start_x == -1:
-                self._maze[start_x][start_y] &= self._WALLBREAK['west']
-                self._maze[end_x][end_y] &= self._WALLBREAK['east']
+                direction = 'west'
             else:
                 raise ValueError('Coordinates are not adjacent')
         else:
             raise ValueError('Coordinates are not adjacent')
+        start = self._index(start_coordinates)
+        end = self._index(end_coordinates)
+        if self._journal is not None:
+            self._journal.append((self._cells, start, self._cells[start]))
+            self._journal.append((self._cells, end, self._cells[end]))
+        self._cells[start] &= self._WALLBREAK[direction]
+        self._cells[end] &= self._WALLBREAK[self._OPPOSITE[direction]]
+        corridors = self._corridors
+        self._forget()
+        if corridors is not None:
+            self._join_corridors(corridors, start, end, direction)
+            self._corridors = corridors
+
+    def snapshot(self):
+        """Mark the walls as they are now, to go back to with restore.
+
+        From the first snapshot on, every change to a cell is written to a
+        journal with the value it had before, and so is every change to the
+        corridor tables, so restore only has to undo the changes made since,
+        however large the maze. Toggling walls and punching holes change a
+        cell or two each. The bulk methods, generating, punch_many,
+        set_toggles and braid, note a copy of the whole cell buffer instead.
+
+        Each snapshot gets its own id, and the ids of the snapshots which can
+        still be restored are kept in order, so restore can tell when it is
+        handed one which has been undone or discarded.
+
+        Returns:
+            snapshot - A token for restore.
+        """
+        if self._journal is None:
+            self._journal = []
+        self._snapshot_ids += 1
+        self._snapshots.append(self._snapshot_ids)
+        return (self._snapshot_ids, len(self._journal), self._distances,
+                self._path, self._corridors)
+
+    def restore(self, snapshot):
+        """Put the walls back the way they were at a snapshot.
+
+        The snapshot can be restored again afterwards, as can any snapshot
+        taken before it, but not ones taken after it, which are dropped.
+
+        Positional Arguments:
+            snapshot - A token from snapshot.
+
+        Exceptions:
+            ValueError - Raised if the snapshot has been undone already, or
+                         snapshots were discarded since.
+
+        Side Effects:
+            Modifies self._cells in place.
+        """
+        snapshot_id, position, distances, path, corridors = snapshot
+        if snapshot_id not in self._snapshots:
+            raise ValueError('The snapshot can no longer be restored')
+        del self._snapshots[self._snapshots.index(snapshot_id)+1:]
+        journal = self._journal
+        while len(journal) > position:
+            table, index, value = journal.pop()
+            if table is None:
+                self._cells[:] = value
+            else:
+                table[index] = value
+        self._distances = distances
+        self._path = path
+        self._corridors = corridors
+
+    def discard_snapshots(self):
+        """Stop keeping the journal, so no snapshot can be restored."""
+        self._journal = None
+        self._snapshots = []
+
+    def _journal_all(self):
+        """Note a copy of every cell, before a change to many of them."""
+        if self._journal is not None:
+            self._journal.append((None, 0, bytes(self._cells)))
+
+    def _forget(self):
+        """Drop everything worked out from the walls, after they change."""
+        self._distances = None
+        self._path = None
+        self._corridors = None
 
     def can_move(self, coordinates, direction):
         """Check if we can move from the given coordinates in the given direction.
@@ -190,9 +640,8 @@ class Maze:
         Exceptions:
             IndexError - Raised if the coordinates are not inside the maze.
         """
-        x, y = coordinates
         clear = True
-        if self._maze[x][y] & self._WALLCHECK[direction]:
+        if self._cells[self._index(coordinates)] & self._WALLCHECK[direction]:
             clear = False
         return clear
 
@@ -211,8 +660,530 @@ class Maze:
         """
         x, y = coordinates
         clear = False
-        if self._maze[x][y] & self._TOGGLE[direction]:
+        if self._cells[self._index(coordinates)] & self._TOGGLE[direction]:
             self._punch_hole(coordinates,
                              self._RELATIVE_COORDINATES[direction](x, y))
             clear = True
         return clear
+
+    _ADJACENT = {
+        (0, 1): 1,
+        (1, 0): 2,
+        (0, -1): 4,
+        (-1, 0): 8}
+
+    def punch_many(self, pairs):
+        """Remove the walls between many pairs of adjacent cells at once.
+
+        The walls are gathered into a buffer of a byte per cell and removed
+        in one pass over the cells, see generators.open_walls.
+
+        Positional Arguments:
+            pairs - An iterable of (start_coordinates, end_coordinates).
+
+        Exceptions:
+            ValueError - Raised if a pair of coordinates are not adjacent.
+            IndexError - Raised if the coordinates are not inside the maze.
+
+        Side Effects:
+            Modifies self._cells in place.
+        """
+        walls = bytearray(self._size*self._size)
+        for start_coordinates, end_coordinates in pairs:
+            start = self._index(start_coordinates)
+            self._index(end_coordinates)
+            offset = (end_coordinates[0] - start_coordinates[0],
+                      end_coordinates[1] - start_coordinates[1])
+            if offset not in self._ADJACENT:
+                raise ValueError('Coordinates are not adjacent')
+            walls[start] |= self._ADJACENT[offset]
+        self._journal_all()
+        generators.open_walls(self._cells, self._size, self._size, walls)
+        self._forget()
+
+    def set_toggles(self, mask):
+        """Choose which walls can be toggled, for every cell at once.
+
+        Positional Arguments:
+            mask - A bytes-like with a byte per cell, indexed like
+                   self._cells, of the walls which become toggleable, using
+                   the bits of _WALLCHECK. Toggles on walls which are not
+                   there are dropped, and every other toggle is cleared.
+
+        Exceptions:
+            ValueError - Raised if mask is not the same length as the cells.
+
+        Side Effects:
+            Modifies self._cells in place.
+        """
+        total = self._size*self._size
+        if len(mask) != total:
+            raise ValueError('Expected {} cells of toggles'.format(total))
+        walls = int.from_bytes(bytes(self._cells).translate(
+            generators._WALLS), 'little')
+        toggles = int.from_bytes(mask, 'little') & walls
+        self._journal_all()
+        self._cells[:] = (walls | toggles << 4).to_bytes(total, 'little')
+
+    def braid(self, fraction=1.0, loops=0, seed=None):
+        """Add loops to the maze, so there is more than one way through it.
+
+        Dead ends are opened up, then more walls are removed, see
+        generators.braid. The exit is left a dead end.
+
+        Keyword Arguments:
+            fraction - The chance of each dead end being opened up.
+            loops - How many more walls to remove afterwards.
+            seed - A seed, or a random.Random to draw from. By default the
+                   random module is used.
+
+        Side Effects:
+            Modifies self._cells in place.
+        """
+        self._journal_all()
+        generators.braid(self._cells, self._size, self._size, fraction,
+                         loops, leaf=self._index(self.north_east),
+                         rng=self._random(seed))
+        self._forget()
+
+    def _reach(self, cell, heading, distance):
+        """Find how far a cell can see in a straight line, up to a distance.
+
+        If the corridor tables have been built they are used. Otherwise only
+        the cells up to distance ahead are read, as one slice of the cell
+        buffer searched with bytes.find, so a move only touches the cells it
+        passes, which matters for a MappedMaze. The edge of the maze always
+        counts as a wall.
+
+        Positional Arguments:
+            cell - The id of the cell.
+            heading - The heading to look in, 0 to 3 for north, east, south
+                      and west.
+            distance - The furthest to look.
+
+        Returns:
+            reach - How many cells can be moved, at most distance.
+        """
+        if self._corridors is not None:
+            return min(self._corridors[heading][cell], max(distance, 0))
+        size = self._size
+        x, y = cell % size, cell // size
+        ahead = (size - y, size - x, y + 1, x + 1)[heading]
+        count = min(distance, ahead)
+        if count <= 0:
+            return 0
+        step = (size, 1, -size, -1)[heading]
+        if step > 0:
+            line = self._cells[cell:cell + count*step:step]
+        else:
+            line = self._cells[cell + (count-1)*step:cell + 1:-step][::-1]
+        wall = bytes(line).translate(self._OPEN[1 << heading]).find(0)
+        if wall < 0:
+            return count if count < ahead else count - 1
+        return wall
+
+    # Corridor tables are indexed by heading, in the order of the wall bits.
+    _HEADINGS = ('north', 'east', 'south', 'west')
+
+    def corridors(self):
+        """Find how far each cell can see in a straight line, worked out once.
+
+        For each heading, the cells are laid out along that heading, a row or
+        a column at a time, and split at the walls with bytes.split. A run of
+        k open cells before a wall then counts down k, k-1, ... 0, and each
+        of these countdowns is built once and joined with the rest as bytes
+        rather than filled in a cell at a time. The edge of the maze always
+        counts as a wall.
+
+        Returns:
+            corridors - A tuple of four arrays, for north, east, south and
+                        west, each of how many cells can be moved from each
+                        cell in that direction before a wall, indexed like
+                        self._cells.
+        """
+        if self._corridors is not None:
+            return self._corridors
+        size = self._size
+        total = size*size
+        cells = bytes(self._cells)
+        columns = b''.join(cells[x::size] for x in range(size))
+        typecode = 'H' if size <= 2**16 else 'I'
+        corridors = []
+        for heading, wall in enumerate((1, 2, 4, 8)):
+            # Lay the cells out so that this heading goes towards the end of
+            # each line, and so the last cell of each line is on the edge.
+            lines = columns if heading % 2 == 0 else cells
+            if heading >= 2:
+                lines = lines[::-1]
+            opens = bytearray(lines.translate(self._OPEN[wall]))
+            opens[size-1::size] = bytes(size)
+            lengths = list(map(len, opens.split(b'\x00')[:-1]))
+            countdowns = {
+                length: array(typecode, range(length, -1, -1)).tobytes()
+                for length in set(lengths)}
+            runs = array(typecode)
+            runs.frombytes(b''.join(map(countdowns.__getitem__, lengths)))
+            if heading >= 2:
+                runs.reverse()
+            if heading % 2 == 0:
+                by_column = runs
+                runs = array(typecode, bytes(runs.itemsize*total))
+                for x in range(size):
+                    runs[x::size] = by_column[x*size:(x+1)*size]
+            corridors.append(runs)
+        self._corridors = tuple(corridors)
+        return self._corridors
+
+    def _join_corridors(self, corridors, start, end, direction):
+        """Update the corridor tables after the wall between two cells goes.
+
+        Only the cells looking through the gap change: the ones in line
+        behind start which could see as far as start, and the ones in line
+        behind end which could see as far as end.
+
+        Positional Arguments:
+            corridors - The tables from corridors, from before the wall went.
+            start - The id of the first cell.
+            end - The id of the second cell, next to start in direction.
+            direction - The direction from start to end.
+
+        Side Effects:
+            Modifies corridors in place, noting the old values in the
+            journal.
+        """
+        journal = self._journal
+        size = self._size
+        heading = self._HEADINGS.index(direction)
+        offset = (size, 1, -size, -1)[heading]
+        for runs, near, far, step in (
+                (corridors[heading], start, end, -offset),
+                (corridors[(heading+2) % 4], end, start, offset)):
+            if runs[near]:
+                continue
+            gained = runs[far] + 1
+            cell = near
+            seen = 0
+            while 0 <= cell < len(runs) and runs[cell] == seen:
+                if journal is not None:
+                    journal.append((runs, cell, seen))
+                runs[cell] += gained
+                cell += step
+                seen += 1
+
+    # Distances are stored as unsigned 32 bit ints, with the largest value
+    # meaning the exit can not be reached.
+    _UNREACHABLE = 2**32 - 1
+
+    def _distance_field(self):
+        """Get the distance to the exit from every cell, working it out once.
+
+        A single breadth first search runs backwards from the exit, over an
+        array of cell ids used as a queue. Hand-made mazes' walls do not
+        always match up, so each step checks the wall on the side it comes
+        from.
+
+        Returns:
+            distances - An array of the number of moves to the exit from each
+                        cell, indexed like self._cells.
+        """
+        if self._distances is not None:
+            return self._distances
+        size = self._size
+        cells = self._cells
+        distances = array('I', [self._UNREACHABLE]) * (size*size)
+        exit_cell = self._index(self.north_east)
+        distances[exit_cell] = 0
+        queue = array('q', [exit_cell])
+        far = self._UNREACHABLE
+        last_row = len(cells) - size
+        head = 0
+        # A neighbor is a step further away if it can move into this cell,
+        # so it is the neighbor's wall facing this cell that has to be open.
+        while head < len(queue):
+            cell = queue[head]
+            head += 1
+            step = distances[cell] + 1
+            x = cell % size
+            if cell < last_row:
+                neighbor = cell + size
+                if not cells[neighbor] & 4 and distances[neighbor] == far:
+                    distances[neighbor] = step
+                    queue.append(neighbor)
+            if x < size-1:
+                neighbor = cell + 1
+                if not cells[neighbor] & 8 and distances[neighbor] == far:
+                    distances[neighbor] = step
+                    queue.append(neighbor)
+            if cell >= size:
+                neighbor = cell - size
+                if not cells[neighbor] & 1 and distances[neighbor] == far:
+                    distances[neighbor] = step
+                    queue.append(neighbor)
+            if x > 0:
+                neighbor = cell - 1
+                if not cells[neighbor] & 2 and distances[neighbor] == far:
+                    distances[neighbor] = step
+                    queue.append(neighbor)
+        self._distances = distances
+        return distances
+
+    def distance(self, coordinates):
+        """Find how many moves it takes to get from a cell to the exit.
+
+        Positional Arguments:
+            coordinates - The coordinates of the cell.
+
+        Returns:
+            distance - The number of moves, or None if the exit can not be
+                       reached from the cell.
+
+        Exceptions:
+            IndexError - Raised if the coordinates are not inside the maze.
+        """
+        distance = self._distance_field()[self._index(coordinates)]
+        if distance == self._UNREACHABLE:
+            return None
+        return distance
+
+    def hint(self, coordinates):
+        """Find the direction to move in to get closer to the exit.
+
+        Positional Arguments:
+            coordinates - The coordinates of the cell.
+
+        Returns:
+            direction - The direction to move, or None at the exit or if the
+                        exit can not be reached.
+
+        Exceptions:
+            IndexError - Raised if the coordinates are not inside the maze.
+        """
+        distances = self._distance_field()
+        cell = self._index(coordinates)
+        if distances[cell] in (0, self._UNREACHABLE):
+            return None
+        x, y = coordinates
+        size = self._size
+        for direction, wall in self._WALLCHECK.items():
+            if not self._cells[cell] & wall:
+                # Hand-made mazes may have openings in the outer wall.
+                next_x, next_y = self._RELATIVE_COORDINATES[direction](x, y)
+                if not (0 <= next_x < size and 0 <= next_y < size):
+                    continue
+                neighbor = next_y*size + next_x
+                if distances[neighbor] == distances[cell] - 1:
+                    return direction
+        return None
+
+    def on_path(self, coordinates):
+        """Check if a cell is on the shortest way from entrance to exit.
+
+        The path is found once by following hints from the entrance and kept
+        as a bytearray over the cells.
+
+        Positional Arguments:
+            coordinates - The coordinates of the cell.
+
+        Returns:
+            on_path - A boolean, False for every cell if the exit can not be
+                      reached from the entrance.
+
+        Exceptions:
+            IndexError - Raised if the coordinates are not inside the maze.
+        """
+        if self._path is None:
+            path = bytearray(self._size*self._size)
+            if self.distance((0, 0)) is not None:
+                current = (0, 0)
+                path[0] = 1
+                while True:
+                    direction = self.hint(current)
+                    if direction is None:
+                        break
+                    current = self._RELATIVE_COORDINATES[direction](*current)
+                    path[self._index(current)] = 1
+            self._path = path
+        return bool(self._path[self._index(coordinates)])
+
+    # Tables for bytes.translate, so checks run over every cell at once in C.
+    # _OPEN maps a cell to 1 if the wall in a direction is missing, _SEAL
+    # adds the wall in a direction, _EXITS counts the missing walls,
+    # _LOOSE_TOGGLES maps a cell to 1 if a wall is marked toggleable without
+    # being there, and _TOGGLED maps a cell to its toggleable walls.
+    _OPEN = {
+        wall: bytes(not value & wall for value in range(256))
+        for wall in (1, 2, 4, 8)}
+    _SEAL = {
+        wall: bytes(value | wall for value in range(256))
+        for wall in (1, 2, 4, 8)}
+    _EXITS = bytes(4 - bin(value & 15).count('1') for value in range(256))
+    _LOOSE_TOGGLES = bytes(
+        bool(value >> 4 & ~value & 15) for value in range(256))
+    _TOGGLED = bytes(value >> 4 & value for value in range(256))
+
+    def _passages(self, cells):
+        """Count the open walls between neighboring cells.
+
+        Positional Arguments:
+            cells - The cells as bytes.
+
+        Returns:
+            passages - The number of open east walls not on the east border
+                       plus the number of open north walls not on the north
+                       border.
+        """
+        size = self._size
+        east = cells.translate(self._OPEN[2])
+        north = cells.translate(self._OPEN[1])
+        return (east.count(1) - east[size-1::size].count(1)
+                + north.count(1) - north[len(north)-size:].count(1))
+
+    def _components(self, cells):
+        """Count the separate parts the passages split the cells into.
+
+        The passages are the same ones _passages counts, found with
+        bytes.find, and joined with a union find over the cell ids.
+
+        Positional Arguments:
+            cells - The cells as bytes.
+
+        Returns:
+            components - The number of separate parts, a lone cell being
+                         one.
+        """
+        size = self._size
+        total = size*size
+        parent = list(range(total))
+        components = total
+        for wall, step in ((2, 1), (1, size)):
+            passages = cells.translate(self._OPEN[wall])
+            start = passages.find(1)
+            while start >= 0:
+                cell, neighbor = start, start + step
+                if neighbor < total and (step == size or neighbor % size):
+                    while parent[cell] != cell:
+                        parent[cell] = parent[parent[cell]]
+                        cell = parent[cell]
+                    while parent[neighbor] != neighbor:
+                        parent[neighbor] = parent[parent[neighbor]]
+                        neighbor = parent[neighbor]
+                    if cell != neighbor:
+                        parent[cell] = neighbor
+                        components -= 1
+                start = passages.find(1, start + 1)
+        return components
+
+    def validate(self, perfect=True):
+        """Check that the maze is well formed.
+
+        Each cell is one byte, so the cells are compared with their
+        neighbors by packing them into ints and shifting one of them by a
+        cell or a row, and counted with bytes.translate and bytes.count.
+        Only reaching the exit takes a search, which is the cached distance
+        field.
+
+        Keyword Arguments:
+            perfect - Whether to also check that there are no loops, so that
+                      there is exactly one way between any two cells.
+                      Toggleable walls count as open for this and for
+                      reaching the exit.
+
+        Returns:
+            problems - A list of descriptions of what is wrong, empty if the
+                       maze is fine.
+        """
+        size = self._size
+        total = size*size
+        cells = bytes(self._cells)
+        problems = []
+        east = int.from_bytes(cells.translate(self._OPEN[2]), 'little')
+        west = int.from_bytes(cells.translate(self._OPEN[8]), 'little')
+        unmatched = (east ^ west >> 8).to_bytes(total, 'little')
+        count = unmatched.count(1) - unmatched[size-1::size].count(1)
+        if count:
+            problems.append(
+                '{} east walls do not match the west wall next to them'.format(
+                    count))
+        north = int.from_bytes(cells.translate(self._OPEN[1]), 'little')
+        south = int.from_bytes(cells.translate(self._OPEN[4]), 'little')
+        unmatched = (north ^ south >> 8*size).to_bytes(total, 'little')
+        count = unmatched[:total-size].count(1)
+        if count:
+            problems.append(
+                '{} north walls do not match the south wall above them'.format(
+                    count))
+        count = (cells[:size].translate(self._OPEN[4]).count(1)
+                 + cells[total-size:].translate(self._OPEN[1]).count(1)
+                 + cells[::size].translate(self._OPEN[8]).count(1)
+                 + cells[size-1::size].translate(self._OPEN[2]).count(1))
+        if count:
+            problems.append('{} openings in the outer wall'.format(count))
+        count = cells.translate(self._LOOSE_TOGGLES).count(1)
+        if count:
+            problems.append(
+                '{} cells have toggles on walls that are not there'.format(
+                    count))
+        # Toggleable walls can be opened, so the rest is checked on a copy
+        # of the maze with them open.
+        opened = self
+        toggled = cells.translate(self._TOGGLED)
+        if toggled.count(0) != total:
+            opened = Maze(size)
+            opened.north_east = self.north_east
+            opened._cells[:] = cells
+            generators.open_walls(opened._cells, size, size, toggled)
+            cells = bytes(opened._cells)
+        count = opened._distance_field().count(self._UNREACHABLE)
+        if count:
+            problems.append('{} cells can not reach the exit'.format(count))
+        # A maze in k separate parts with one way between any two cells in
+        # the same part has total - k passages, and each passage more closes
+        # a loop. With every cell reaching the exit through walls that match
+        # up there is one part, so the parts are only counted otherwise.
+        components = 1
+        if problems:
+            components = self._components(cells)
+        count = self._passages(cells) - (total - components)
+        if perfect and count > 0:
+            problems.append('{} passages too many, making loops'.format(count))
+        return problems
+
+    def stats(self):
+        """Describe the shape of the maze.
+
+        The outer wall is treated as closed whether or not it is.
+
+        Returns:
+            stats - A dict of:
+                passages - The number of open walls between cells.
+                dead_ends - The number of cells with one way out.
+                junctions - The number of cells with three or four ways out.
+                corridors - A dict of how many straight corridors there are
+                            of each length, in cells, counting north-south
+                            and east-west ones separately. Single cells are
+                            not corridors.
+        """
+        size = self._size
+        total = size*size
+        cells = bytearray(self._cells)
+        cells[:size] = cells[:size].translate(self._SEAL[4])
+        cells[total-size:] = cells[total-size:].translate(self._SEAL[1])
+        cells[::size] = cells[::size].translate(self._SEAL[8])
+        cells[size-1::size] = cells[size-1::size].translate(self._SEAL[2])
+        cells = bytes(cells)
+        exits = cells.translate(self._EXITS)
+        # Corridors are runs of open walls in a row, or in a column once the
+        # cells are rearranged column by column, split at the closed walls.
+        runs = []
+        for wall, line in (
+                (2, cells),
+                (1, b''.join(cells[x::size] for x in range(size)))):
+            runs.extend(line.translate(self._OPEN[wall]).split(b'\x00'))
+        corridors = {
+            length+1: count
+            for length, count in Counter(map(len, runs)).items() if length}
+        return {
+            'passages': self._passages(cells),
+            'dead_ends': exits.count(1),
+            'junctions': exits.count(3) + exits.count(4),
+            'corridors': corridors}
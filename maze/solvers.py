@@ -0,0 +1,281 @@
+"""Solvers finding the way from a cell to the exit of a Maze.
+
+Each solver works on the Maze's cell buffer with integer cell ids, and
+returns the way out as a list of instructions ready for Walker.run, with
+runs of the same direction written as a count followed by the direction.
+
+bfs - Breadth first search.
+astar - A* search, guided by the distance to the exit.
+dead_end_filling - Fill in every dead end, then follow what is left.
+"""
+from array import array
+from heapq import heappop, heappush
+
+_DIRECTIONS = {
+    1: 'north',
+    2: 'east',
+    4: 'south',
+    8: 'west'}
+
+# How a cell was reached, stored per cell. A direction bit from _DIRECTIONS,
+# or one of these for the starting cell and for cells ruled out in advance.
+_ORIGIN = 16
+_BLOCKED = 32
+
+# Map a cell to 1 if the wall in a direction is missing, for bytes.translate.
+_OPEN_NORTH, _OPEN_EAST, _OPEN_SOUTH, _OPEN_WEST = (
+    bytes(not value & wall for value in range(256)) for wall in (1, 2, 4, 8))
+
+def _ends(maze, start):
+    """Work out the ids of the starting cell and the exit.
+
+    Positional Arguments:
+        maze - The Maze to solve.
+        start - The coordinates of the starting cell.
+
+    Returns:
+        origin - The id of the starting cell.
+        goal - The id of the exit.
+
+    Exceptions:
+        IndexError - Raised if start is not inside the maze.
+    """
+    return maze._index(start), maze._index(maze.north_east)
+
+def _either(first, second):
+    """Combine two equal length runs of 0 and 1 bytes with a bitwise or.
+
+    Positional Arguments:
+        first - The first run, as bytes.
+        second - The second run, as bytes.
+
+    Returns:
+        either - The bytes which are 1 where either run has a 1.
+    """
+    return (int.from_bytes(first, 'little')
+            | int.from_bytes(second, 'little')).to_bytes(len(first), 'little')
+
+def _program(arrived, size, origin, goal):
+    """Turn the record of how each cell was reached into instructions.
+
+    Positional Arguments:
+        arrived - A bytearray of the direction each cell was entered from.
+        size - The number of maze cells per side.
+        origin - The id of the starting cell.
+        goal - The id of the exit.
+
+    Returns:
+        instructions - A list of directions, each preceded by its repeat
+                       count when it is more than one.
+    """
+    offsets = {1: size, 2: 1, 4: -size, 8: -1}
+    moves = bytearray()
+    cell = goal
+    while cell != origin:
+        direction = arrived[cell]
+        moves.append(direction)
+        cell -= offsets[direction]
+    moves.reverse()
+    instructions = []
+    count = 0
+    for index, direction in enumerate(moves):
+        count += 1
+        if index+1 == len(moves) or moves[index+1] != direction:
+            if count > 1:
+                instructions.append(count)
+            instructions.append(_DIRECTIONS[direction])
+            count = 0
+    return instructions
+
+def _breadth_first(cells, size, origin, goal, arrived):
+    """Search outwards from a cell until the exit is reached.
+
+    Cells are queued by id in an array, and arrived records the direction
+    each cell was first entered from, which doubles as the visited check.
+
+    Positional Arguments:
+        cells - The cell buffer.
+        size - The number of maze cells per side.
+        origin - The id of the starting cell.
+        goal - The id of the exit.
+        arrived - A bytearray over the cells, zero for cells still to visit.
+
+    Returns:
+        found - Whether the exit was reached.
+
+    Side Effects:
+        Fills in arrived.
+    """
+    last_row = len(cells) - size
+    arrived[origin] = _ORIGIN
+    queue = array('q', [origin])
+    head = 0
+    while head < len(queue):
+        cell = queue[head]
+        head += 1
+        if cell == goal:
+            return True
+        walls = cells[cell]
+        x = cell % size
+        if not walls & 1 and cell < last_row and not arrived[cell+size]:
+            arrived[cell+size] = 1
+            queue.append(cell+size)
+        if not walls & 2 and x < size-1 and not arrived[cell+1]:
+            arrived[cell+1] = 2
+            queue.append(cell+1)
+        if not walls & 4 and cell >= size and not arrived[cell-size]:
+            arrived[cell-size] = 4
+            queue.append(cell-size)
+        if not walls & 8 and x > 0 and not arrived[cell-1]:
+            arrived[cell-1] = 8
+            queue.append(cell-1)
+    return False
+
+def bfs(maze, start=(0, 0)):
+    """Find the shortest way to the exit with breadth first search.
+
+    Positional Arguments:
+        maze - The Maze to solve.
+
+    Keyword Arguments:
+        start - The coordinates of the starting cell.
+
+    Returns:
+        instructions - The way to the exit for Walker.run, or None if there
+                       is no way out.
+
+    Exceptions:
+        IndexError - Raised if start is not inside the maze.
+    """
+    origin, goal = _ends(maze, start)
+    arrived = bytearray(maze.size*maze.size)
+    if not _breadth_first(maze.cells, maze.size, origin, goal, arrived):
+        return None
+    return _program(arrived, maze.size, origin, goal)
+
+def astar(maze, start=(0, 0)):
+    """Find the shortest way to the exit with A* search.
+
+    The heap holds plain ints, each cell's estimated total cost times the
+    number of cells plus its id, and the cost so far for every cell is kept
+    in an array. The estimate is the Manhattan distance to the exit.
+
+    Positional Arguments:
+        maze - The Maze to solve.
+
+    Keyword Arguments:
+        start - The coordinates of the starting cell.
+
+    Returns:
+        instructions - The way to the exit for Walker.run, or None if there
+                       is no way out.
+
+    Exceptions:
+        IndexError - Raised if start is not inside the maze.
+    """
+    origin, goal = _ends(maze, start)
+    size = maze.size
+    cells = maze.cells
+    total = size*size
+    last_row = total - size
+    goal_x, goal_y = maze.north_east
+    unseen = 2**32 - 1
+    costs = array('I', [unseen]) * total
+    arrived = bytearray(total)
+    costs[origin] = 0
+    arrived[origin] = _ORIGIN
+    heap = [(abs(goal_x-start[0]) + abs(goal_y-start[1]))*total + origin]
+    while heap:
+        estimate, cell = divmod(heappop(heap), total)
+        if cell == goal:
+            return _program(arrived, size, origin, goal)
+        cost = costs[cell]
+        x, y = cell % size, cell // size
+        if estimate > cost + abs(goal_x-x) + abs(goal_y-y):
+            continue
+        walls = cells[cell]
+        cost += 1
+        for neighbor, direction, inside in (
+                (cell+size, 1, cell < last_row),
+                (cell+1, 2, x < size-1),
+                (cell-size, 4, cell >= size),
+                (cell-1, 8, x > 0)):
+            if inside and not walls & direction and cost < costs[neighbor]:
+                costs[neighbor] = cost
+                arrived[neighbor] = direction
+                estimate = cost + abs(goal_x - neighbor % size) \
+                    + abs(goal_y - neighbor // size)
+                heappush(heap, estimate*total + neighbor)
+    return None
+
+def dead_end_filling(maze, start=(0, 0)):
+    """Find the way to the exit by filling in dead ends.
+
+    Every cell with a single way out, other than the start and the exit, is
+    filled in, which may turn its neighbor into a dead end in turn. In a
+    perfect maze only the way out is left afterwards, and a breadth first
+    search restricted to the cells left over reads it off. In a hand-made
+    maze whose walls do not match on both sides, a way counts if the wall is
+    missing on either side, and the search moves as bfs does.
+
+    Positional Arguments:
+        maze - The Maze to solve.
+
+    Keyword Arguments:
+        start - The coordinates of the starting cell.
+
+    Returns:
+        instructions - The way to the exit for Walker.run, or None if there
+                       is no way out.
+
+    Exceptions:
+        IndexError - Raised if start is not inside the maze.
+    """
+    origin, goal = _ends(maze, start)
+    size = maze.size
+    cells = maze.cells
+    total = size*size
+    last_row = total - size
+    # Link neighbors whose shared wall is missing on either side, so the
+    # counts stay in step however the walls of a hand-made maze disagree.
+    # vertical[cell] links a cell to the one north of it, and
+    # horizontal[cell] to the one east of it.
+    data = bytes(cells)
+    vertical = _either(data[:last_row].translate(_OPEN_NORTH),
+                       data[size:].translate(_OPEN_SOUTH))
+    horizontal = bytearray(_either(data[:-1].translate(_OPEN_EAST),
+                                   data[1:].translate(_OPEN_WEST)))
+    horizontal[size-1::size] = bytes(len(range(size-1, total-1, size)))
+    # Count the ways out of every cell at once. No count goes past 4, so
+    # adding the links as big ints never carries from one cell to the next.
+    zeros = bytes(size)
+    exits = bytearray(sum(
+        int.from_bytes(links, 'little') for links in (
+            vertical + zeros, zeros + vertical,
+            horizontal + b'\x00', b'\x00' + horizontal)
+        ).to_bytes(total, 'little'))
+    arrived = bytearray(total)
+    dead_ends = array('q')
+    for dead_end in (0, 1):
+        cell = exits.find(dead_end)
+        while cell >= 0:
+            dead_ends.append(cell)
+            cell = exits.find(dead_end, cell+1)
+    while dead_ends:
+        cell = dead_ends.pop()
+        if cell in (origin, goal) or arrived[cell]:
+            continue
+        arrived[cell] = _BLOCKED
+        x = cell % size
+        for neighbor, linked in (
+                (cell+size, cell < last_row and vertical[cell]),
+                (cell+1, horizontal[cell] if cell < total-1 else 0),
+                (cell-size, cell >= size and vertical[cell-size]),
+                (cell-1, x > 0 and horizontal[cell-1])):
+            if linked and not arrived[neighbor]:
+                exits[neighbor] -= 1
+                if exits[neighbor] <= 1:
+                    dead_ends.append(neighbor)
+    if not _breadth_first(cells, size, origin, goal, arrived):
+        return None
+    return _program(arrived, size, origin, goal)
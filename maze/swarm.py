@@ -0,0 +1,288 @@
+"""Many walkers moving through one maze together.
+
+WalkerSwarm - A crowd of walkers, stepped all at once.
+"""
+from array import array
+from itertools import repeat
+from operator import add, eq, floordiv, mod
+import random
+
+from .bytecode import (
+    BAD, HEADINGS, LOOP, MOVE, NEXT, Program, compile_program)
+from .errors import BadCommand, TooManyInstructions
+from .generators import _WITH, _edges
+
+# Translation tables for whole swarms at once. _WALLS keeps a cell's wall
+# bits and _HIGH a random byte's high nibble. _RESOLVE maps a walker's
+# heading times 8 plus a heading from bytecode.HEADINGS to an absolute
+# heading. _FREE maps a heading times 16 plus a cell's walls to 1 if there is
+# no wall that way, and _MOVES maps 4 for a free walker plus its heading to
+# the index of its step in WalkerSwarm._offsets, 4 being no step. _RANDOM
+# maps a cell's walls plus a random high nibble to an open heading, and
+# _FOLLOW maps a heading times 16 plus a cell's walls to the heading a hand
+# on the right or left wall leads to. Headings with nowhere to go are left
+# pointing at a wall, so the walker stays put.
+_WALLS = bytes(key & 15 for key in range(256))
+_HIGH = bytes(key & 240 for key in range(256))
+_FREE = bytes(key < 64 and not key & 1 << (key >> 4) for key in range(256))
+_MOVES = bytes(key - 4 if 4 <= key < 8 else 4 for key in range(256))
+_RESOLVE = bytes(
+    (key >> 3) + (key & 7) & 3 if key & 4 else key & 3
+    for key in range(32)) + bytes(224)
+_RANDOM = bytearray(256)
+for _key in range(256):
+    _open = [h for h in range(4) if not _key & 1 << h]
+    if _open:
+        _RANDOM[_key] = _open[(_key >> 4) % len(_open)]
+_RANDOM = bytes(_RANDOM)
+_FOLLOW = {}
+for _hand, _turns in (('right', (1, 0, 3, 2)), ('left', (3, 0, 1, 2))):
+    _table = bytearray(256)
+    for _key in range(64):
+        _heading = _key >> 4
+        _table[_key] = (_heading + 2) % 4
+        for _turn in _turns:
+            if not _key & 1 << (_heading + _turn) % 4:
+                _table[_key] = (_heading + _turn) % 4
+                break
+    _FOLLOW[_hand] = bytes(_table)
+del _key, _open, _hand, _turns, _table, _heading
+
+def _int(flags):
+    """Pack a bytes-like into an int, the first byte lowest."""
+    return int.from_bytes(flags, 'little')
+
+def _bytes(flags, count):
+    """Unpack an int made by _int into count bytes."""
+    return flags.to_bytes(count, 'little')
+
+class WalkerSwarm:
+    """A number of walkers in the same maze, kept as arrays.
+
+    Each walker is an entry in an array of cell ids, a bytearray of
+    headings and a bytearray of whether it has reached the exit. A step
+    moves every walker one cell at once, with map over the cell buffer,
+    int operators and bytes.translate, and no loop over the walkers in
+    Python. Walkers which have reached the exit stay there. The edge of the
+    grid counts as a wall, as it does for Walker, so openings in the outer
+    wall of a hand-made maze lead nowhere.
+
+    Methods:
+        step
+        move
+        random_step
+        follow_wall
+        run
+
+    Attributes:
+        cells - An array of the cell id of each walker, y*size + x.
+        headings - A bytearray of each walker's heading, 0 to 3 for north,
+                   east, south and west.
+        won - A bytearray of 1 for each walker which reached the exit.
+    """
+
+    def __init__(self, maze, count, start=(0, 0)):
+        """Initialize the WalkerSwarm, with every walker facing north.
+
+        Positional Arguments:
+            maze - The Maze the walkers are in.
+            count - How many walkers there are.
+
+        Keyword Arguments:
+            start - The coordinates every walker starts at.
+
+        Exceptions:
+            IndexError - Raised if start is not inside the maze.
+        """
+        self._maze = maze
+        size = maze.size
+        x, y = start
+        if not (0 <= x < size and 0 <= y < size):
+            raise IndexError('Coordinates are not inside the maze')
+        self.cells = array('q', [y*size + x]) * count
+        self.headings = bytearray(count)
+        self.won = bytearray(count)
+        self._offsets = (size, 1, -size, -1, 0)
+        # The walls along the edge of the grid, added to every cell's own.
+        self._border = bytearray(size*size)
+        _edges(self._border, size, size, _WITH)
+        self._goal = maze.north_east[1]*size + maze.north_east[0]
+
+    def __len__(self):
+        return len(self.cells)
+
+    @property
+    def x(self):
+        """An array of each walker's x coordinate."""
+        return array('q', map(mod, self.cells, repeat(self._maze.size)))
+
+    @property
+    def y(self):
+        """An array of each walker's y coordinate."""
+        return array('q', map(floordiv, self.cells, repeat(self._maze.size)))
+
+    def _walls(self):
+        """Read the walls of the cell under every walker.
+
+        Returns:
+            walls - A bytes of the wall bits of each walker's cell, with the
+                    edge of the grid as walls.
+        """
+        cells = self._maze.cells
+        walls = bytes(map(cells.__getitem__, self.cells)).translate(_WALLS)
+        border = bytes(map(self._border.__getitem__, self.cells))
+        return _bytes(_int(walls) | _int(border), len(self))
+
+    def step(self, headings):
+        """Move every walker one cell, each in its own direction.
+
+        Per walker flags and headings are single bytes, so they are combined
+        by turning each bytes into one int and using int operators, with
+        tables from bytes.translate to look up the result for each walker.
+        Only reading the cells and the new cell ids need map.
+
+        Positional Arguments:
+            headings - A bytes-like with a heading from bytecode.HEADINGS
+                       for each walker, so relative headings turn from the
+                       way that walker faces.
+
+        Returns:
+            moved - How many walkers moved.
+
+        Side Effects:
+            Alters cells, headings and won.
+        """
+        count = len(self)
+        old = _int(self.headings)
+        headings = _bytes(old << 3 | _int(headings), count).translate(
+            _RESOLVE)
+        # A walker moves if the wall ahead is missing and it has not won.
+        free = _int(_bytes(
+            _int(self._walls()) | _int(headings) << 4, count).translate(
+                _FREE)) & ~_int(self.won)
+        moves = _bytes(free << 2 | _int(headings), count).translate(_MOVES)
+        self.cells = array('q', map(
+            add, self.cells, map(self._offsets.__getitem__, moves)))
+        kept = free*255
+        self.headings = bytearray(_bytes(
+            _int(headings) & kept | old & ~kept, count))
+        won = bytes(map(eq, self.cells, repeat(self._goal)))
+        self.won = bytearray(_bytes(_int(self.won) | _int(won), count))
+        return bin(free).count('1')
+
+    def move(self, direction):
+        """Move every walker one cell in the same direction.
+
+        Positional Arguments:
+            direction - An absolute or relative direction, as for Walker.
+
+        Returns:
+            moved - How many walkers moved.
+
+        Exceptions:
+            KeyError - Raised if the given direction is not valid.
+
+        Side Effects:
+            Alters cells, headings and won.
+        """
+        return self.step(bytes([HEADINGS[direction]])*len(self))
+
+    def random_step(self, rng=random):
+        """Move every walker one cell in a random open direction.
+
+        Keyword Arguments:
+            rng - The random.Random, or random module, to draw from.
+
+        Returns:
+            moved - How many walkers moved.
+
+        Side Effects:
+            Alters cells, headings and won.
+        """
+        count = len(self)
+        draws = rng.getrandbits(8*count).to_bytes(count, 'little')
+        keys = _int(self._walls()) | _int(draws.translate(_HIGH))
+        return self.step(_bytes(keys, count).translate(_RANDOM))
+
+    def follow_wall(self, hand='right'):
+        """Move every walker one cell, keeping a hand on the wall.
+
+        Each walker turns towards its hand if it can, otherwise goes
+        forward, turns away, or goes back, in that order.
+
+        Keyword Arguments:
+            hand - Which hand to keep on the wall, 'right' or 'left'.
+
+        Returns:
+            moved - How many walkers moved.
+
+        Exceptions:
+            KeyError - Raised if hand is not 'right' or 'left'.
+
+        Side Effects:
+            Alters cells, headings and won.
+        """
+        keys = _int(self._walls()) | _int(self.headings) << 4
+        return self.step(_bytes(keys, len(self)).translate(_FOLLOW[hand]))
+
+    def run(self, instructions, limit=0):
+        """Run the same program on every walker.
+
+        The program is compiled as for Walker.run, and each move is made a
+        cell at a time for the whole swarm, stopping early once no walker
+        can go any further. Reaching the exit is recorded in won rather
+        than raised.
+
+        Positional Arguments:
+            instructions - A list of instructions, as for Walker.run, or a
+                           bytecode.Program.
+
+        Keyword Arguments:
+            limit - The most instructions allowed in each list, 0 for no
+                    limit.
+
+        Exceptions:
+            BadCommand - Raised for commands which are not directions.
+            TooManyInstructions - Raised when a list goes over the limit.
+
+        Side Effects:
+            Alters cells, headings and won.
+        """
+        program = instructions
+        if not isinstance(program, Program):
+            program = compile_program(instructions, limit)
+        code = program.code.tolist()
+        counters = []
+        pc = 0
+        while pc < len(code):
+            op = code[pc]
+            if op == MOVE:
+                # Relative headings turn once, from the way each walker
+                # faces now, and the walkers then go straight.
+                count = len(self)
+                headings = _bytes(
+                    _int(self.headings) << 3
+                    | _int(bytes([code[pc+1]])*count),
+                    count).translate(_RESOLVE)
+                for _ in range(code[pc+2]):
+                    if not self.step(headings):
+                        break
+                pc += 3
+            elif op == NEXT:
+                counters[-1] -= 1
+                if counters[-1]:
+                    pc = code[pc+1]
+                else:
+                    counters.pop()
+                    pc += 2
+            elif op == LOOP:
+                if code[pc+1]:
+                    counters.append(code[pc+1])
+                    pc += 3
+                else:
+                    pc = code[pc+2]
+            elif op == BAD:
+                raise BadCommand('Bad command at position {}.'.format(
+                    code[pc+1]))
+            else:
+                raise TooManyInstructions
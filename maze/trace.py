@@ -0,0 +1,295 @@
+"""Recording what a Walker did, to replay or study afterwards.
+
+A trace is three arrays side by side, one entry per event: an opcode byte,
+the cell id the Walker was in afterwards, and a number whose meaning
+depends on the opcode. Nothing about the user's code is kept, so a trace
+replays the same way every time, even for the randomized exercises.
+
+Trace - A recorded run of a Walker.
+
+MOVED - Moved the whole way asked for: heading, cells moved.
+BLOCKED - Stopped by a wall, maybe after some cells: 4 + heading, cells
+          moved.
+OPENED - Called open_sesame: OPENED, wall bits of the walls opened.
+WON - Reached the exit: WON, 0.
+"""
+from array import array
+from itertools import accumulate
+import struct
+import sys
+import time
+
+MOVED = 0
+BLOCKED = 4
+OPENED = 8
+WON = 9
+
+_DIRECTIONS = ('north', 'east', 'south', 'west')
+
+class Trace:
+    """The events of one run of a Walker, packed into arrays.
+
+    Methods:
+        moved
+        blocked
+        opened
+        won
+        save
+        load
+        play
+        replay
+        heatmap
+
+    Attributes:
+        size - The number of maze cells per side.
+        start - The cell id the Walker started in, y*size + x.
+        heading - The heading the Walker started with, 0 to 3.
+        ops - An array of the opcode of each event.
+        cells - An array of the cell id after each event.
+        values - An array of the cells moved or walls opened by each event.
+    """
+
+    # Saved traces have a header of magic, format version, three pad bytes,
+    # the size, start, heading and number of events. The arrays follow one
+    # after the other, with the ids and values as little endian 64 bit ints.
+    _HEADER = struct.Struct('<4sBxxxQQQQ')
+    _MAGIC = b'IMTR'
+    _FORMAT_VERSION = 1
+
+    def __init__(self, size, start=0, heading=0):
+        """Initialize an empty Trace.
+
+        Positional Arguments:
+            size - The number of maze cells per side.
+
+        Keyword Arguments:
+            start - The cell id the Walker starts in.
+            heading - The heading the Walker starts with.
+        """
+        self.size = size
+        self.start = start
+        self.heading = heading
+        self.ops = array('B')
+        self.cells = array('q')
+        self.values = array('q')
+
+    def __len__(self):
+        return len(self.ops)
+
+    def _add(self, op, cell, value):
+        self.ops.append(op)
+        self.cells.append(cell)
+        self.values.append(value)
+
+    def moved(self, heading, distance, cell):
+        """Record a move which went the whole way.
+
+        Positional Arguments:
+            heading - The absolute heading moved in.
+            distance - How many cells were moved.
+            cell - The cell id moved to.
+        """
+        self._add(MOVED + heading, cell, distance)
+
+    def blocked(self, heading, distance, cell):
+        """Record a move which ran into a wall.
+
+        Positional Arguments:
+            heading - The absolute heading moved in.
+            distance - How many cells were moved before the wall, maybe 0.
+            cell - The cell id stopped in.
+        """
+        self._add(BLOCKED + heading, cell, distance)
+
+    def opened(self, cell, walls):
+        """Record a call to open_sesame.
+
+        Positional Arguments:
+            cell - The cell id of the Walker.
+            walls - The wall bits of the walls which opened, maybe 0.
+        """
+        self._add(OPENED, cell, walls)
+
+    def won(self, cell):
+        """Record reaching the exit.
+
+        Positional Arguments:
+            cell - The cell id of the exit.
+        """
+        self._add(WON, cell, 0)
+
+    def save(self, file):
+        """Save the Trace in the binary trace format.
+
+        Positional Arguments:
+            file - A path, or a binary file to write to.
+        """
+        if not hasattr(file, 'write'):
+            with open(file, 'wb') as trace_file:
+                self.save(trace_file)
+            return
+        file.write(self._HEADER.pack(
+            self._MAGIC, self._FORMAT_VERSION, self.size, self.start,
+            self.heading, len(self)))
+        file.write(self.ops.tobytes())
+        for numbers in (self.cells, self.values):
+            if sys.byteorder == 'big':
+                numbers = array('q', numbers)
+                numbers.byteswap()
+            file.write(numbers.tobytes())
+
+    @classmethod
+    def load(cls, file):
+        """Load a Trace saved with save.
+
+        Positional Arguments:
+            file - A path, or a binary file positioned at the trace.
+
+        Returns:
+            trace - The loaded Trace.
+
+        Exceptions:
+            ValueError - Raised if the file is not a trace this version can
+                         read, starts outside the maze, or is truncated.
+        """
+        if not hasattr(file, 'read'):
+            with open(file, 'rb') as trace_file:
+                return cls.load(trace_file)
+        header = file.read(cls._HEADER.size)
+        if len(header) != cls._HEADER.size:
+            raise ValueError('Truncated trace header')
+        magic, version, size, start, heading, count = \
+            cls._HEADER.unpack(header)
+        if magic != cls._MAGIC:
+            raise ValueError('Not a trace file')
+        if version != cls._FORMAT_VERSION:
+            raise ValueError('Unsupported trace file version')
+        if start >= size*size or heading > 3:
+            raise ValueError('Trace start is not inside the maze')
+        trace = cls(size, start, heading)
+        # Read a chunk at a time, so a corrupt count can not allocate more
+        # than the file holds.
+        try:
+            for events in (trace.ops, trace.cells, trace.values):
+                for done in range(0, count, 2**16):
+                    events.fromfile(file, min(count - done, 2**16))
+        except EOFError:
+            raise ValueError('Truncated trace events')
+        if sys.byteorder == 'big':
+            trace.cells.byteswap()
+            trace.values.byteswap()
+        return trace
+
+    def _walls(self, cell, walls):
+        """List the walls opened by an open_sesame event, for toggle_many.
+
+        Positional Arguments:
+            cell - The cell id of the Walker.
+            walls - The wall bits of the walls opened.
+
+        Returns:
+            walls - A list of (coordinates, direction) tuples.
+        """
+        coordinates = (cell % self.size, cell // self.size)
+        return [(coordinates, direction)
+                for bit, direction in enumerate(_DIRECTIONS)
+                if walls & 1 << bit]
+
+    def play(self, display):
+        """Show the recorded run on a display an event at a time.
+
+        The display should have drawn the maze already, with the walker in
+        the starting cell. Events which show nothing are skipped.
+
+        Positional Arguments:
+            display - The display to replay on.
+
+        Returns:
+            A generator yielding None after each event is shown.
+        """
+        for op, cell, value in zip(self.ops, self.cells, self.values):
+            if op < OPENED and value:
+                getattr(display, _DIRECTIONS[op & 3])(value)
+            elif op == OPENED and value:
+                display.toggle_many(self._walls(cell, value))
+            else:
+                continue
+            yield
+
+    def replay(self, display, delay=None):
+        """Show the recorded run on a display.
+
+        The display should have drawn the maze already, with the walker in
+        the starting cell.
+
+        Positional Arguments:
+            display - The display to replay on.
+
+        Keyword Arguments:
+            delay - None to give the display every move between two
+                    open_sesame calls as one path, with no animation of
+                    its own, or how many seconds to wait after each event.
+        """
+        if delay is not None:
+            for _ in self.play(display):
+                if delay:
+                    time.sleep(delay)
+            return
+        segments = []
+        for op, cell, value in zip(self.ops, self.cells, self.values):
+            if op < OPENED and value:
+                direction = _DIRECTIONS[op & 3]
+                if segments and segments[-1][0] == direction:
+                    value += segments.pop()[1]
+                segments.append((direction, value))
+            elif op == OPENED and value:
+                if segments:
+                    display.move_path(segments)
+                    segments = []
+                display.toggle_many(self._walls(cell, value))
+        if segments:
+            display.move_path(segments)
+
+    def heatmap(self):
+        """Count how many times the Walker entered each cell.
+
+        The starting cell counts as entered once. Each move covers a run of
+        cells, which is a run of ids for east and west moves and a run in a
+        column for north and south. The runs are marked at their ends in two
+        arrays, one of them by column, and itertools.accumulate adds them up,
+        so the time taken goes with the number of events and cells, not with
+        the length of the moves.
+
+        Returns:
+            visits - An array of the visits to each cell, by cell id.
+        """
+        size = self.size
+        total = size*size
+        rows = [0]*(total+1)
+        columns = [0]*(total+1)
+        rows[self.start] += 1
+        rows[self.start+1] -= 1
+        for op, cell, value in zip(self.ops, self.cells, self.values):
+            if op >= OPENED or not value:
+                continue
+            heading = op & 3
+            if heading == 1:
+                rows[cell-value+1] += 1
+                rows[cell+1] -= 1
+            elif heading == 3:
+                rows[cell] += 1
+                rows[cell+value] -= 1
+            else:
+                column = cell % size*size + cell // size
+                if heading == 0:
+                    columns[column-value+1] += 1
+                    columns[column+1] -= 1
+                else:
+                    columns[column] += 1
+                    columns[column+value] -= 1
+        visits = array('q', accumulate(rows[:total]))
+        by_column = array('q', accumulate(columns[:total]))
+        for x in range(size):
+            visits[x::size] = array('q', map(
+                int.__add__, visits[x::size], by_column[x*size:(x+1)*size]))
+        return visits
@@ -2,23 +2,61 @@
 
 Walker - A walker for the Maze.
 """
+from collections.abc import Iterator
+from operator import index
 
+from .bytecode import (
+    BAD, HEADINGS, LOOP, MOVE, NEXT, Program, compile_program)
+from .displays.null_display import NullDisplay
 from .errors import WalkerStateError, BadCommand, TooManyInstructions, Win
+from .trace import Trace
+
+def _replayable(instructions):
+    """Read instructions into a list, with nested iterators as lists too.
+
+    Positional Arguments:
+        instructions - An iterable of instructions.
+
+    Returns:
+        instructions - A list of instructions which can be run repeatedly.
+    """
+    return [_replayable(instruction)
+            if isinstance(instruction, (list, Iterator)) else instruction
+            for instruction in instructions]
 
 class Walker:
     """A vehicle for traversing a treacherous maze.
 
     Methods:
         power_on
+        record
+        stop_recording
+        flush
         move
         run
+        execute_iter
+        start
+        step
+        open_sesame
+        snapshot
+        restore
     """
 
-    _RELATIVE_MAP = {
-        'north': {'forward': 'north', 'right': 'east', 'backward': 'south', 'left': 'west'},
-        'east': {'forward': 'east', 'right': 'south', 'backward': 'west', 'left': 'north'},
-        'south': {'forward': 'south', 'right': 'west', 'backward': 'north', 'left': 'east'},
-        'west': {'forward': 'west', 'right': 'north', 'backward': 'east', 'left': 'south'}}
+    # The display method and the step in x and y for each absolute heading,
+    # in the order of bytecode.HEADINGS and the wall bits.
+    _STEPS = (
+        ('north', 0, 1),
+        ('east', 1, 0),
+        ('south', 0, -1),
+        ('west', -1, 0))
+
+    # What a move or a program ended with, returned by _advance and _execute
+    # so that nothing is raised until the end.
+    _MOVED = 0
+    _BLOCKED = 1
+    _WON = 2
+    _BAD = 3
+    _LIMIT = 4
 
     def __init__(self, maze):
         """Initialize the Walker.
@@ -29,22 +67,72 @@ class Walker:
         self._maze = maze
         self._coordinates = (0, 0)
         self._display = None
-        self._direction_map = {
-            'north': self._north,
-            'east': self._east,
-            'south': self._south,
-            'west': self._west}
-        self._relative_directions = self._RELATIVE_MAP['north']
-
-    def power_on(self, display):
+        self._heading = 0
+        self._segments = []
+        self._trace = None
+        self._program = None
+
+    def power_on(self, display=None):
         """Turn on the Walker's lights, so you can see the Maze.
 
+        Keyword Arguments:
+            display - The display to show the Maze on. By default a
+                      NullDisplay, which shows nothing.
+
         Side Effects:
             Initializes self._display.
         """
+        if display is None:
+            display = NullDisplay(self._maze)
         self._display = display
         self._display.draw()
 
+    def record(self, trace=None):
+        """Start recording every move, open_sesame and win to a Trace.
+
+        Keyword Arguments:
+            trace - A Trace to add to. By default a new one, starting where
+                    the Walker is now.
+
+        Returns:
+            trace - The Trace being recorded to.
+
+        Side Effects:
+            Replaces any Trace already being recorded to.
+        """
+        if trace is None:
+            x, y = self._coordinates
+            trace = Trace(self._maze.size, y*self._maze.size + x,
+                          self._heading)
+        self._trace = trace
+        return trace
+
+    def stop_recording(self):
+        """Stop recording to the Trace.
+
+        Returns:
+            trace - The Trace which was being recorded to, or None.
+        """
+        trace = self._trace
+        self._trace = None
+        return trace
+
+    def flush(self):
+        """Send the moves made since the last flush to the display.
+
+        Moves are kept as a list of straight lines and handed over in one
+        call to the display's move_path. run, move and open_sesame flush
+        before they return or raise, so the display has caught up whenever
+        control goes back to the caller.
+
+        Side Effects:
+            Empties the list of moves.
+        """
+        if self._segments:
+            segments = self._segments
+            self._segments = []
+            self._display.move_path(segments)
+
     def move(self, direction, distance=1):
         """Attempt to move the walker a number of cells in the given direction.
 
@@ -61,6 +149,7 @@ class Walker:
         Exceptions:
             WalkerStateError - Raised if trying to move before the walker is powered.
             KeyError - Raised if the given direction is not valid.
+            TypeError - Raised if the distance is not an integer.
             Win - Raised if the walker has reached the exit.
 
         Side Effects:
@@ -68,96 +157,401 @@ class Walker:
         """
         if self._display is None:
             raise WalkerStateError('Try calling power_on() first.')
-        if direction in self._relative_directions:
-            direction = self._relative_directions[direction]
-        op = self._direction_map[direction]
-        success = True
-        for _ in range(distance):
-            if not self._maze.can_move(self._coordinates, direction):
-                success = False
-                break
-            op()
-            self._relative_directions = self._RELATIVE_MAP[direction]
-            if self._coordinates == self._maze.north_east:
-                raise Win
-        return success
-
-    def _north(self):
-        """Move the walker up one cell.
+        heading = HEADINGS[direction]
+        distance = index(distance)
+        try:
+            status = self._advance(heading, distance)
+        finally:
+            self.flush()
+        if status == self._WON:
+            raise Win
+        return status == self._MOVED
 
-        Side Effects:
-            Alters the Walker's coordinates and display.
-        """
-        self._display.north()
-        self._coordinates = (self._coordinates[0], self._coordinates[1]+1)
+    def _advance(self, heading, distance):
+        """Move the walker up to a number of cells in a straight line.
 
-    def _east(self):
-        """Move the walker right one cell.
+        How far the Walker can go is found from the cells ahead of it, see
+        Maze._reach, and it goes there in one step, stopping early at the exit.
+        The move is added to the straight lines waiting for the display,
+        joined onto the last one if it goes the same way.
 
-        Side Effects:
-            Alters the Walker's coordinates and display.
-        """
-        self._display.east()
-        self._coordinates = (self._coordinates[0]+1, self._coordinates[1])
+        Positional Arguments:
+            heading - The heading to move in, from bytecode.HEADINGS.
+            distance - How many cells to attempt to move.
 
-    def _south(self):
-        """Move the walker down one cell.
+        Returns:
+            status - _MOVED if the whole distance was moved, _BLOCKED if a
+                     wall was in the way, or _WON if the exit was reached.
 
         Side Effects:
-            Alters the Walker's coordinates and display.
+            Alters the Walker's coordinates, heading and waiting moves.
         """
-        self._display.south()
-        self._coordinates = (self._coordinates[0], self._coordinates[1]-1)
+        if heading > 3:
+            heading = (self._heading + heading) % 4
+        maze = self._maze
+        x, y = self._coordinates
+        length = maze._reach(y*maze.size + x, heading, distance)
+        status = self._BLOCKED if length < distance else self._MOVED
+        length = max(min(length, distance), 0)
+        _, step_x, step_y = self._STEPS[heading]
+        if length:
+            # The exit is only passed through if it is in line and within
+            # reach.
+            goal_x, goal_y = maze.north_east
+            if step_x:
+                ahead = (goal_x - x)*step_x if y == goal_y else 0
+            else:
+                ahead = (goal_y - y)*step_y if x == goal_x else 0
+            if 0 < ahead <= length:
+                length = ahead
+                status = self._WON
+            name = self._STEPS[heading][0]
+            if self._segments and self._segments[-1][0] == name:
+                self._segments[-1] = (name, self._segments[-1][1] + length)
+            else:
+                self._segments.append((name, length))
+            x += step_x*length
+            y += step_y*length
+            self._coordinates = (x, y)
+            self._heading = heading
+        if self._trace is not None:
+            cell = y*maze.size + x
+            if status == self._BLOCKED:
+                self._trace.blocked(heading, length, cell)
+            else:
+                self._trace.moved(heading, length, cell)
+                if status == self._WON:
+                    self._trace.won(cell)
+        return status
+
+    def _execute(self, code):
+        """Run bytecode until it ends, the exit is reached or it fails.
+
+        Positional Arguments:
+            code - An array of bytecode, see bytecode.compile_program.
 
-    def _west(self):
-        """Move the walker left one cell.
+        Returns:
+            status - _MOVED if the program ran to the end, or _WON, _BAD or
+                     _LIMIT.
+            position - The position of the bad command for _BAD.
+
+        Exceptions:
+            WalkerStateError - Raised if trying to move before the walker is
+                               powered.
 
         Side Effects:
-            Alters the Walker's coordinates and display.
+            May call functions which alter the Walker's coordinates and display.
         """
-        self._display.west()
-        self._coordinates = (self._coordinates[0]-1, self._coordinates[1])
+        code = code.tolist()
+        counters = []
+        pc = 0
+        end = len(code)
+        while pc < end:
+            op = code[pc]
+            if op == MOVE:
+                if self._display is None:
+                    raise WalkerStateError('Try calling power_on() first.')
+                if self._advance(code[pc+1], code[pc+2]) == self._WON:
+                    return self._WON, None
+                pc += 3
+            elif op == NEXT:
+                counters[-1] -= 1
+                if counters[-1]:
+                    pc = code[pc+1]
+                else:
+                    counters.pop()
+                    pc += 2
+            elif op == LOOP:
+                if code[pc+1]:
+                    counters.append(code[pc+1])
+                    pc += 3
+                else:
+                    pc = code[pc+2]
+            elif op == BAD:
+                if self._display is None:
+                    raise WalkerStateError('Try calling power_on() first.')
+                return self._BAD, code[pc+1]
+            else:
+                return self._LIMIT, None
+        return self._MOVED, None
 
     def run(self, instructions, limit=0):
         """Process a list of commands and attempt to move the Walker accordingly.
 
+        A list is compiled to bytecode first, see bytecode.compile_program,
+        so the limit is checked before anything moves, though the exceptions
+        come in the order the instructions would have run in. Any other
+        iterable, such as a generator, is read lazily an instruction at a
+        time, see execute_iter, so the whole program never has to be in
+        memory at once.
+
         Positional Arguments:
-            instructions - A list of instructions for the Walker. Can be
-                           directions or numbers, which will repeat the next
-                           direction.
+            instructions - A list or other iterable of instructions for the
+                           Walker. Can be directions or numbers, which will
+                           repeat the next direction. Can also be a
+                           bytecode.Program.
+
+        Keyword Arguments:
+            limit - The most instructions allowed in each list, 0 for no
+                    limit. A Program has its limit compiled in, so this is
+                    ignored for one.
+
+        Returns:
+            count - The number of instructions in the outermost list.
 
         Exceptions:
             BadCommandError - Raised for commands which are not directions.
+            TooManyInstructions - Raised when a list goes over the limit.
+            Win - Raised if the walker has reached the exit.
+
+        Side Effects:
+            May call functions which alter the Walker's coordinates and display.
+        """
+        program = instructions
+        if not isinstance(program, (Program, list)):
+            steps = self._interpret(instructions, limit)
+            try:
+                while True:
+                    next(steps)
+            except StopIteration as stop:
+                status, value, _ = stop.value
+            finally:
+                self.flush()
+            return self._finish(status, value)
+        if not isinstance(program, Program):
+            program = compile_program(instructions, limit)
+        try:
+            status, position = self._execute(program.code)
+        finally:
+            self.flush()
+        if status == self._MOVED:
+            return program.count
+        return self._finish(status, position)
+
+    def _finish(self, status, value):
+        """Turn how a program ended into its result or an exception.
+
+        Positional Arguments:
+            status - What the program ended with, as from _execute.
+            value - The instruction count for _MOVED, or the position of the
+                    bad command for _BAD.
+
+        Returns:
+            count - The instruction count, for _MOVED.
+
+        Exceptions:
+            BadCommandError - Raised for _BAD.
+            TooManyInstructions - Raised for _LIMIT.
+            Win - Raised for _WON.
+        """
+        if status == self._WON:
+            raise Win
+        if status == self._BAD:
+            raise BadCommand('Bad command at position {}.'.format(value))
+        if status == self._LIMIT:
+            raise TooManyInstructions
+        return value
+
+    def _interpret(self, instructions, limit):
+        """Run instructions as they are read, pausing after each move.
+
+        This counts instructions the same way as bytecode.compile_program,
+        except that a nested iterator, which has no length, counts the
+        number of instructions read from it. A repeated list or iterator is
+        copied into a list first, along with any iterators inside it, since
+        it has to be gone through more than once.
+
+        Positional Arguments:
+            instructions - An iterable of instructions.
+            limit - The most instructions allowed per list, 0 for no limit.
+
+        Returns:
+            A generator yielding None after each move, and returning:
+            status - _MOVED if the instructions ran to the end, or _WON,
+                     _BAD or _LIMIT.
+            value - The instruction count for _MOVED, or the position of the
+                    bad command for _BAD.
+            read - How many instructions were read.
+
+        Exceptions:
+            WalkerStateError - Raised if trying to move before the walker is
+                               powered.
 
         Side Effects:
             May call functions which alter the Walker's coordinates and display.
         """
         count = 0
         repeat = 1
-        for i, instruction in enumerate(instructions):
+        read = 0
+        for position, instruction in enumerate(instructions):
+            read += 1
             if limit > 0 and count >= limit:
-                raise TooManyInstructions
+                return self._LIMIT, None, read
             if isinstance(instruction, int):
                 count += 1
-                repeat = instruction
-            elif isinstance(instruction, list):
+                repeat = max(instruction, 0)
+                continue
+            if isinstance(instruction, (list, Iterator)):
+                if repeat != 1:
+                    instruction = _replayable(instruction)
                 for _ in range(repeat):
-                    self.run(instruction, limit)
-                count += len(instruction)
-                repeat = 1
+                    status, value, length = yield from self._interpret(
+                        instruction, limit)
+                    if status != self._MOVED:
+                        return status, value, read
+                if isinstance(instruction, list):
+                    length = len(instruction)
+                count += length
             else:
+                if self._display is None:
+                    raise WalkerStateError('Try calling power_on() first.')
                 try:
-                    self.move(instruction, repeat)
+                    heading = HEADINGS[instruction]
                 except (KeyError, TypeError):
-                    raise BadCommand('Bad command at position {}.'.format(i))
+                    return self._BAD, position, read
+                if self._advance(heading, repeat) == self._WON:
+                    return self._WON, None, read
+                yield
                 count += 1
-                repeat = 1
-        return count
+            repeat = 1
+        return self._MOVED, count, read
+
+    def execute_iter(self, instructions, limit=0):
+        """Run instructions a move at a time, handing back control in between.
+
+        The instructions are read lazily, as for run with an iterable which
+        is not a list, and the display is brought up to date before each
+        pause, so a display or controller can drive the Walker at its own
+        pace.
+
+        Positional Arguments:
+            instructions - An iterable of instructions, as for run.
+
+        Keyword Arguments:
+            limit - The most instructions allowed in each list, 0 for no
+                    limit.
+
+        Returns:
+            A generator yielding the Walker's coordinates after each move,
+            and returning the number of instructions in the outermost list.
+
+        Exceptions:
+            Raised from the generator, as for run.
+
+        Side Effects:
+            May call functions which alter the Walker's coordinates and display.
+        """
+        steps = self._interpret(instructions, limit)
+        try:
+            while True:
+                try:
+                    next(steps)
+                except StopIteration as stop:
+                    status, value, _ = stop.value
+                    break
+                self.flush()
+                yield self._coordinates
+        finally:
+            self.flush()
+        return self._finish(status, value)
+
+    def start(self, instructions, limit=0):
+        """Load instructions to be run a move at a time with step.
+
+        Positional Arguments:
+            instructions - An iterable of instructions, as for run.
+
+        Keyword Arguments:
+            limit - The most instructions allowed in each list, 0 for no
+                    limit.
+
+        Side Effects:
+            Replaces any program loaded before.
+        """
+        self._program = self.execute_iter(instructions, limit)
+
+    def step(self):
+        """Make the next move of the program loaded with start.
+
+        Returns:
+            moving - True after a move, or False once the program has ended.
+
+        Exceptions:
+            WalkerStateError - Raised if no program has been loaded.
+            Raised from the program, as for run.
+
+        Side Effects:
+            May call functions which alter the Walker's coordinates and display.
+        """
+        if self._program is None:
+            raise WalkerStateError('Try calling start() first.')
+        try:
+            next(self._program)
+        except StopIteration:
+            self._program = None
+            return False
+        except BaseException:
+            self._program = None
+            raise
+        return True
+
+    def snapshot(self):
+        """Mark where the Walker and the maze's walls are now.
+
+        See Maze.snapshot, which this takes as well, since open_sesame
+        changes the walls.
+
+        Returns:
+            snapshot - A token for restore.
+
+        Side Effects:
+            Flushes the moves so far to the display.
+        """
+        if self._display is not None:
+            self.flush()
+        recorded = len(self._trace) if self._trace is not None else 0
+        return (self._coordinates, self._heading, recorded,
+                self._maze.snapshot())
+
+    def restore(self, snapshot):
+        """Put the Walker and the maze's walls back as they were.
+
+        Any Trace being recorded to is cut back to the snapshot as well. The
+        display is not moved back, so searching by running and restoring is
+        best done with a NullDisplay, or without powering on at all.
+
+        Positional Arguments:
+            snapshot - A token from snapshot.
+
+        Exceptions:
+            ValueError - Raised if the maze snapshot can no longer be
+                         restored.
+
+        Side Effects:
+            Alters the Walker's coordinates and heading, and the maze.
+        """
+        coordinates, heading, recorded, maze_snapshot = snapshot
+        self._maze.restore(maze_snapshot)
+        self._coordinates = coordinates
+        self._heading = heading
+        self._segments = []
+        if self._trace is not None:
+            for numbers in (self._trace.ops, self._trace.cells,
+                            self._trace.values):
+                del numbers[recorded:]
 
     def open_sesame(self):
+        self.flush()
         opened = []
-        for direction in ['north', 'east', 'south', 'west']:
+        walls = 0
+        for bit, direction in enumerate(['north', 'east', 'south', 'west']):
             if self._maze.toggle(self._coordinates, direction):
                 opened.append(direction)
-                self._display.toggle(self._coordinates, direction)
+                walls |= 1 << bit
+        if self._trace is not None:
+            x, y = self._coordinates
+            self._trace.opened(y*self._maze.size + x, walls)
+        if opened:
+            self._display.toggle_many(
+                [(self._coordinates, direction) for direction in opened])
         return opened
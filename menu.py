@@ -5,7 +5,7 @@ import sys
 from cmd import Cmd
 from importlib import reload
 
-from maze.exercise.framework import discover
+from maze.exercise.framework import discover, replay
 
 if sys.version_info.major != 3 or sys.version_info.minor < 4:
     sys.exit('Python 3.4 or greater is required.')
@@ -112,7 +112,9 @@ class Exercise(MyCmd):
         self.intro = '''Available Commands:
 story - {}
 run - {}
-quit - {}'''.format(self.do_story.__doc__, self.do_run.__doc__, self.do_quit.__doc__)
+replay - {}
+quit - {}'''.format(self.do_story.__doc__, self.do_run.__doc__,
+                   self.do_replay.__doc__, self.do_quit.__doc__)
         self.prompt = '\n' + category + '/' + exercise + '> '
 
     def do_story(self, _):
@@ -129,5 +131,10 @@ quit - {}'''.format(self.do_story.__doc__, self.do_run.__doc__, self.do_quit.__d
         else:
             self.modules[0].main()
 
+    def do_replay(self, _):
+        """Show the last run again without running your solution."""
+        if not replay():
+            print('Nothing has been run yet.')
+
 if __name__ == '__main__':
     Outer().cmdloop()
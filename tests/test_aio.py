@@ -0,0 +1,91 @@
+"""Running walkers and replaying traces as coroutines."""
+import asyncio
+import random
+import tkinter
+import unittest
+
+from maze import Maze, Walker
+from maze.aio import animate, replay, run
+
+from .test_walker import _STEPS, _Recorder, _outcome, _program
+
+class _Window:
+    """Enough of a Tk window to pump, closing after some updates."""
+
+    def __init__(self, updates):
+        self.updates = updates
+
+    def update(self):
+        if not self.updates:
+            raise tkinter.TclError('window closed')
+        self.updates -= 1
+
+class AioTest(unittest.TestCase):
+
+    def setUp(self):
+        self.maze = Maze(6)
+        self.maze.dfs(seed=1)
+        self.maze.braid(0.5, seed=1)
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def _walker(self, run):
+        display = _Recorder(self.maze)
+        walker = Walker(self.maze)
+        walker.power_on(display)
+        return _outcome(walker, display, lambda: run(walker))
+
+    def test_run(self):
+        rng = random.Random(23)
+        for _ in range(300):
+            instructions = _program(rng)
+            limit = rng.choice([0, 0, 1, 2, 3, 5])
+            self.assertEqual(
+                self._walker(lambda walker: self.loop.run_until_complete(
+                    run(walker, instructions, limit))),
+                self._walker(lambda walker: walker.run(
+                    iter(instructions), limit)),
+                instructions)
+
+    def test_cancel(self):
+        display = _Recorder(self.maze)
+        walker = Walker(self.maze)
+        walker.power_on(display)
+        task = self.loop.create_task(run(walker, ['north', 'south']*50))
+        for _ in range(5):
+            self.loop.run_until_complete(asyncio.sleep(0))
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            self.loop.run_until_complete(task)
+        self.assertLess(len(display.log), 100)
+        x, y = 0, 0
+        for direction in display.log:
+            step_x, step_y = _STEPS[direction]
+            x, y = x + step_x, y + step_y
+        self.assertEqual(walker._coordinates, (x, y))
+
+    def test_replay(self):
+        walker = Walker(self.maze)
+        walker.power_on()
+        trace = walker.record()
+        walker.run(['north', 'east', 'south', 'west']*5)
+        display = _Recorder(self.maze)
+        trace.replay(display)
+        replayed = _Recorder(self.maze)
+        self.loop.run_until_complete(replay(trace, replayed))
+        self.assertEqual(replayed.log, display.log)
+
+    def test_animate(self):
+        walkers = [Walker(self.maze), Walker(self.maze)]
+        for walker in walkers:
+            walker.power_on()
+        results = self.loop.run_until_complete(animate(
+            _Window(3), run(walkers[0], ['north', 'south']*100, delay=0.01),
+            run(walkers[1], ['east']), interval=0))
+        self.assertIsInstance(results[0], asyncio.CancelledError)
+        self.assertEqual(results[1], 1)
+
+if __name__ == '__main__':
+    unittest.main()
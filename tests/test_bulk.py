@@ -0,0 +1,73 @@
+"""Maze.punch_many, Maze.set_toggles and Maze.braid."""
+import random
+import unittest
+
+from maze import Maze
+
+_STEPS = {
+    'north': (0, 1),
+    'east': (1, 0),
+    'south': (0, -1),
+    'west': (-1, 0)}
+
+class BulkTest(unittest.TestCase):
+
+    def test_punch_many(self):
+        rng = random.Random(12)
+        for _ in range(50):
+            maze = Maze(8)
+            expected = Maze(8)
+            pairs = []
+            for _ in range(rng.randrange(40)):
+                x, y = rng.randrange(8), rng.randrange(8)
+                step_x, step_y = _STEPS[rng.choice(list(_STEPS))]
+                if 0 <= x+step_x < 8 and 0 <= y+step_y < 8:
+                    pairs.append(((x, y), (x+step_x, y+step_y)))
+            maze.punch_many(pairs)
+            for start, end in pairs:
+                expected._punch_hole(start, end)
+            self.assertEqual(bytes(maze.cells), bytes(expected.cells))
+        with self.assertRaises(ValueError):
+            maze.punch_many([((0, 0), (1, 1))])
+        with self.assertRaises(IndexError):
+            maze.punch_many([((7, 0), (8, 0))])
+
+    def test_set_toggles(self):
+        rng = random.Random(13)
+        maze = Maze(8)
+        maze.dfs(seed=1)
+        walls = bytes(cell & 15 for cell in maze.cells)
+        for _ in range(20):
+            mask = bytes(rng.randrange(256) for _ in range(64))
+            maze.set_toggles(mask)
+            self.assertEqual(
+                bytes(maze.cells),
+                bytes(wall | (toggle & wall) << 4
+                      for wall, toggle in zip(walls, mask)))
+        self.assertEqual(maze.validate(perfect=False), [])
+        with self.assertRaises(ValueError):
+            maze.set_toggles(bytes(63))
+
+    def test_braid(self):
+        for seed in range(10):
+            maze = Maze(12)
+            maze.dfs(seed=seed)
+            maze.braid(seed=seed)
+            self.assertEqual(maze.validate(perfect=False), [])
+            stats = maze.stats()
+            self.assertEqual(stats['dead_ends'], 1)
+            self.assertEqual(bin(maze.cells[-1] & 15).count('1'), 3)
+            maze.braid(0.0, loops=7, seed=seed)
+            self.assertEqual(maze.stats()['passages'],
+                             stats['passages'] + 7)
+            self.assertEqual(maze.validate(perfect=False), [])
+            self.assertEqual(bin(maze.cells[-1] & 15).count('1'), 3)
+            partial = Maze(12)
+            partial.dfs(seed=seed)
+            dead_ends = partial.stats()['dead_ends']
+            partial.braid(0.5, seed=seed)
+            self.assertLess(partial.stats()['dead_ends'], dead_ends)
+            self.assertEqual(partial.validate(perfect=False), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+"""MazeCache keeps generated mazes, and survives bad files."""
+import os
+import tempfile
+import unittest
+
+from maze import Maze
+from maze.cache import MazeCache
+
+class CacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.directory = self._directory.name
+        self.cache = MazeCache(self.directory)
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def test_fetch(self):
+        self.assertIsNone(self.cache.get(12, 'prim', 3))
+        maze = self.cache.fetch(12, 'prim', 3)
+        expected = Maze(12)
+        expected.prim(seed=3)
+        self.assertEqual(bytes(maze.cells), bytes(expected.cells))
+        cached = self.cache.get(12, 'prim', 3)
+        self.assertEqual(bytes(cached.cells), bytes(expected.cells))
+        self.assertIsNone(self.cache.get(12, 'prim', 4))
+        self.assertIsNone(self.cache.get(12, 'dfs', 3))
+        with self.assertRaises(KeyError):
+            self.cache.fetch(12, 'maze', 3)
+        with self.assertRaises(TypeError):
+            self.cache.fetch(12, 'prim', 3.0)
+        self.cache.clear()
+        self.assertIsNone(self.cache.get(12, 'prim', 3))
+
+    def test_bad_file(self):
+        maze = self.cache.fetch(12, 'dfs', 'seed')
+        path = self.cache._path(12, 'dfs', 'seed')
+        for data in (b'', b'IMHO', b'\xff'*40,
+                     Maze._HEADER.pack(Maze._MAGIC, 1, 0, 0, 2**33, 0, 0)):
+            with open(path, 'wb') as maze_file:
+                maze_file.write(data)
+            self.assertIsNone(self.cache.get(12, 'dfs', 'seed'))
+            fetched = self.cache.fetch(12, 'dfs', 'seed')
+            self.assertEqual(bytes(fetched.cells), bytes(maze.cells))
+
+    def test_evict(self):
+        self.cache.fetch(10, 'dfs', 0)
+        file_size = os.path.getsize(self.cache._path(10, 'dfs', 0))
+        cache = MazeCache(self.directory, limit=3*file_size)
+        for seed in range(1, 3):
+            cache.fetch(10, 'dfs', seed)
+            os.utime(cache._path(10, 'dfs', seed), (seed, seed))
+        # Reading the first maze makes it the most recently used.
+        os.utime(cache._path(10, 'dfs', 0), (0, 0))
+        cache.get(10, 'dfs', 0)
+        cache.fetch(10, 'dfs', 3)
+        kept = {seed for seed in range(4)
+                if os.path.exists(cache._path(10, 'dfs', seed))}
+        self.assertEqual(kept, {0, 2, 3})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+"""Compressed programs go the same way as the original, and are shorter."""
+import random
+import unittest
+
+from maze import Maze, Walker
+from maze.compress import compress, expand
+from maze.errors import Win
+
+from .test_walker import _TOKENS, _program
+
+def _length(instructions):
+    """Count the instructions in a program, a list counting as one more."""
+    return sum(1 + _length(instruction) if isinstance(instruction, list)
+               else 1 for instruction in instructions)
+
+class CompressTest(unittest.TestCase):
+
+    def test_relative(self):
+        self.assertEqual(compress(['east', 'left', 'left', 'left']),
+                         ['east', 3, ['left']])
+
+    def test_nested(self):
+        self.assertEqual(compress((['north', 'east']*5 + ['south'])*4),
+                         [4, [5, ['north', 'east'], 'south']])
+        self.assertEqual(
+            compress(((['west']*3 + ['left', 'left'])*2 + ['north'])*3),
+            [3, [2, [3, 'west', 'left', 'left'], 'north']])
+
+    def test_never_longer(self):
+        rng = random.Random(4)
+        for _ in range(3000):
+            instructions = []
+            for _ in range(rng.randrange(8)):
+                if rng.random() < 0.4:
+                    instructions.append(rng.randint(2, 6))
+                instructions.append(rng.choice([_program(rng, odd=False)]
+                                               + _TOKENS*3))
+            compressed = compress(instructions)
+            self.assertLessEqual(_length(compressed), _length(instructions),
+                                 instructions)
+            self.assertEqual(expand(compressed), expand(instructions))
+
+    def test_compress(self):
+        rng = random.Random(3)
+        for seed in range(20):
+            maze = Maze(7)
+            maze.dfs(seed=seed)
+            maze.braid(0.7, seed=seed)
+            for _ in range(100):
+                instructions = []
+                for _ in range(rng.randint(1, 4)):
+                    piece = _program(rng, odd=False)
+                    piece += [rng.randint(0, 4), rng.choice(_TOKENS)]
+                    instructions += piece*rng.randint(1, 3)
+                ends = set()
+                for program in (instructions, expand(instructions),
+                                compress(instructions, window=8)):
+                    walker = Walker(maze)
+                    walker.power_on()
+                    try:
+                        walker.run(program)
+                        ends.add((walker._coordinates, walker._heading))
+                    except Win:
+                        ends.add('won')
+                self.assertEqual(len(ends), 1, instructions)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+"""How far the Walker can see along a corridor."""
+import random
+import unittest
+
+from maze import Maze
+
+_STEPS = ((0, 1), (1, 0), (0, -1), (-1, 0))
+
+def _reach(maze, x, y, heading, distance):
+    """Step a cell at a time until a wall, the edge or the distance."""
+    size = maze.size
+    step_x, step_y = _STEPS[heading]
+    moved = 0
+    while (moved < distance and not maze.cells[y*size + x] & 1 << heading
+           and 0 <= x+step_x < size and 0 <= y+step_y < size):
+        x, y = x + step_x, y + step_y
+        moved += 1
+    return moved
+
+class CorridorTest(unittest.TestCase):
+
+    def test_reach(self):
+        rng = random.Random(17)
+        for _ in range(100):
+            size = rng.randint(1, 7)
+            maze = Maze(size)
+            if rng.random() < 0.5:
+                maze.dfs(seed=rng.random())
+                maze.braid(rng.random(), seed=rng.random())
+            else:
+                maze.cells[:] = bytes(rng.randrange(16)
+                                      for _ in range(size*size))
+            expected = {}
+            for cell in range(size*size):
+                for heading in range(4):
+                    for distance in range(-1, size+2):
+                        expected[cell, heading, distance] = _reach(
+                            maze, cell % size, cell // size, heading,
+                            distance)
+                        self.assertEqual(
+                            maze._reach(cell, heading, distance),
+                            expected[cell, heading, distance])
+            corridors = maze.corridors()
+            for (cell, heading, distance), reach in expected.items():
+                self.assertEqual(maze._reach(cell, heading, distance), reach)
+                if distance > size:
+                    self.assertEqual(corridors[heading][cell], reach)
+
+    def test_toggle_keeps_corridors(self):
+        maze = Maze(10)
+        maze.dfs(seed=5)
+        maze.set_toggles(bytes([15])*100)
+        maze.corridors()
+        rng = random.Random(18)
+        for _ in range(40):
+            x, y = rng.randrange(1, 9), rng.randrange(1, 9)
+            maze.toggle((x, y), rng.choice(['north', 'east', 'south',
+                                            'west']))
+            fresh = Maze(10)
+            fresh.cells[:] = maze.cells
+            self.assertEqual(maze.corridors(), fresh.corridors())
+
+if __name__ == '__main__':
+    unittest.main()
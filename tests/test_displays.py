@@ -0,0 +1,207 @@
+"""What displays are asked to draw."""
+import random
+import unittest
+
+from maze import CanvasDisplay, Maze, Walker
+from maze.displays.base import Display
+from maze.displays.null_display import NullDisplay
+from maze.errors import BadCommand, Win
+from maze.solvers import bfs
+
+from .test_walker import _Recorder, _program
+
+class _Batches(Display):
+    """A display which keeps each batch it is sent."""
+
+    def __init__(self, maze):
+        super().__init__(maze)
+        self.paths = []
+        self.toggled = []
+
+    def draw(self):
+        pass
+
+    def move_path(self, segments):
+        self.paths.append(segments)
+
+    def toggle_many(self, walls):
+        self.toggled.append(walls)
+
+class BatchTest(unittest.TestCase):
+    """The Walker hands its moves over in batches."""
+
+    def test_move_path(self):
+        rng = random.Random(14)
+        maze = Maze(8)
+        maze.dfs(seed=3)
+        maze.braid(0.5, seed=3)
+        for _ in range(300):
+            instructions = [instruction for instruction in _program(rng)
+                            if isinstance(instruction, (str, list))]
+            displays = (_Batches(maze), _Recorder(maze))
+            for display in displays:
+                walker = Walker(maze)
+                walker.power_on(display)
+                try:
+                    walker.run(instructions)
+                except (BadCommand, Win):
+                    pass
+            batches, cells = displays
+            self.assertLessEqual(len(batches.paths), 1)
+            moved = [direction for path in batches.paths
+                     for direction, distance in path
+                     for _ in range(distance)]
+            self.assertEqual(moved, cells.log)
+            for path in batches.paths:
+                for (first, _), (second, _) in zip(path, path[1:]):
+                    self.assertNotEqual(first, second)
+
+    def test_toggle_many(self):
+        maze = Maze(3)
+        maze.punch_many([((0, 0), (1, 0)), ((1, 0), (2, 0)),
+                         ((2, 0), (2, 1)), ((2, 1), (2, 2))])
+        mask = bytearray(9)
+        mask[0] = 3
+        maze.set_toggles(mask)
+        display = _Batches(maze)
+        walker = Walker(maze)
+        walker.power_on(display)
+        self.assertEqual(walker.open_sesame(), ['north'])
+        self.assertEqual(display.toggled, [[((0, 0), 'north')]])
+        walker.move('east')
+        self.assertEqual(walker.open_sesame(), [])
+        self.assertEqual(len(display.toggled), 1)
+        self.assertEqual(display.paths, [[('east', 1)]])
+
+    def test_null_display(self):
+        maze = Maze(6)
+        maze.dfs(seed=1)
+        walker = Walker(maze)
+        walker.power_on()
+        self.assertIsInstance(walker._display, NullDisplay)
+        with self.assertRaises(Win):
+            walker.run(bfs(maze))
+
+def _runs(maze, horizontal, first, last, start, stop):
+    """Find the runs of walls along lines a cell at a time."""
+    size = maze.size
+    def cell(x, y):
+        return maze.cells[y*size + x] if horizontal else \
+            maze.cells[x*size + y]
+    below, above = (1, 4) if horizontal else (2, 8)
+    runs = []
+    for line in range(first, last):
+        begin = None
+        for along in range(start, stop+1):
+            wall = along < stop and (
+                line > 0 and cell(along, line-1) & below
+                or line < size and cell(along, line) & above)
+            if wall and begin is None:
+                begin = along
+            elif not wall and begin is not None:
+                runs.append((line, begin, along))
+                begin = None
+    return runs
+
+class WallRunTest(unittest.TestCase):
+    """Display._wall_runs finds every wall once."""
+
+    def test_wall_runs(self):
+        rng = random.Random(15)
+        for _ in range(300):
+            size = rng.randint(1, 9)
+            maze = Maze(size)
+            if rng.random() < 0.5:
+                maze.dfs(seed=rng.random())
+                maze.braid(rng.random(), seed=rng.random())
+            else:
+                maze.cells[:] = bytes(rng.randrange(16)
+                                      for _ in range(size*size))
+            display = NullDisplay(maze)
+            for horizontal in (True, False):
+                self.assertEqual(
+                    list(display._wall_runs(horizontal)),
+                    _runs(maze, horizontal, 0, size+1, 0, size))
+                first = rng.randint(0, size)
+                last = rng.randint(first, size+1)
+                start = rng.randint(0, size-1)
+                stop = rng.randint(start+1, size)
+                self.assertEqual(
+                    list(display._wall_runs(horizontal, first, last, start,
+                                            stop)),
+                    _runs(maze, horizontal, first, last, start, stop))
+
+class _Canvas:
+    """Enough of a Tk Canvas to draw tiles on, showing part of the maze."""
+
+    def __init__(self, left, top, width, height):
+        self.lines = []
+        self._view = (left, top, width, height)
+
+    def create_line(self, *points, **options):
+        self.lines.append(points)
+
+    def canvasx(self, x):
+        return self._view[0] + x
+
+    def canvasy(self, y):
+        return self._view[1] + y
+
+    def winfo_width(self):
+        return self._view[2]
+
+    def winfo_height(self):
+        return self._view[3]
+
+    def tag_raise(self, item):
+        pass
+
+class CanvasTileTest(unittest.TestCase):
+    """CanvasDisplay draws each wall once, a tile at a time."""
+
+    def test_tiles(self):
+        rng = random.Random(16)
+        for _ in range(50):
+            size = rng.randint(1, 20)
+            tile = rng.randint(1, 7)
+            maze = Maze(size)
+            maze.cells[:] = bytes(rng.randrange(16)
+                                  for _ in range(size*size))
+            display = CanvasDisplay(maze, cell=10, tile=tile)
+            display._canvas = _Canvas(0, 0, 0, 0)
+            tiles = (size + tile - 1)//tile
+            for across in range(tiles):
+                for up in range(tiles):
+                    display._draw_tile(across, up)
+            drawn = []
+            for x0, y0, x1, y1 in display._canvas.lines:
+                # Back to cells, y going up, split into single walls.
+                x0, x1 = x0//10, x1//10
+                y0, y1 = size - y0//10, size - y1//10
+                if y0 == y1:
+                    drawn.extend((True, y0, x) for x in range(x0, x1))
+                else:
+                    drawn.extend((False, x0, y) for y in range(y0, y1))
+            walls = [(horizontal, line, along)
+                     for horizontal in (True, False)
+                     for line, begin, end in _runs(
+                         maze, horizontal, 0, size+1, 0, size)
+                     for along in range(begin, end)]
+            self.assertEqual(sorted(drawn), sorted(walls))
+
+    def test_fill(self):
+        maze = Maze(50)
+        display = CanvasDisplay(maze, cell=10, tile=8)
+        # 500 pixels square, showing x from 95 to 255 and y from 300 to 340
+        # pixels down, which is cells 9 to 25 across and 16 to 20 up.
+        display._canvas = _Canvas(95, 300, 160, 40)
+        display._fill()
+        self.assertEqual(display._drawn,
+                         {(across, up) for across in range(1, 4)
+                          for up in range(2, 3)})
+        drawn = len(display._canvas.lines)
+        display._fill()
+        self.assertEqual(len(display._canvas.lines), drawn)
+
+if __name__ == '__main__':
+    unittest.main()
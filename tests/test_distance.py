@@ -0,0 +1,84 @@
+"""Maze.distance, Maze.hint and Maze.on_path against a plain search."""
+import random
+import unittest
+
+from maze import Maze
+
+_STEPS = {
+    'north': (0, 1),
+    'east': (1, 0),
+    'south': (0, -1),
+    'west': (-1, 0)}
+
+def _distances(maze):
+    """Find the distance to the exit from every cell with can_move."""
+    size = maze.size
+    distances = {}
+    for x in range(size):
+        for y in range(size):
+            frontier = {(x, y)}
+            seen = {(x, y)}
+            moves = 0
+            while frontier and maze.north_east not in frontier:
+                following = set()
+                for cell_x, cell_y in frontier:
+                    for direction, (step_x, step_y) in _STEPS.items():
+                        cell = (cell_x + step_x, cell_y + step_y)
+                        if (maze.can_move((cell_x, cell_y), direction)
+                                and 0 <= cell[0] < size
+                                and 0 <= cell[1] < size
+                                and cell not in seen):
+                            seen.add(cell)
+                            following.add(cell)
+                frontier = following
+                moves += 1
+            distances[(x, y)] = moves if frontier else None
+    return distances
+
+class DistanceTest(unittest.TestCase):
+
+    def check(self, maze):
+        distances = _distances(maze)
+        for (x, y), distance in distances.items():
+            self.assertEqual(maze.distance((x, y)), distance)
+            direction = maze.hint((x, y))
+            if not distance:
+                self.assertIsNone(direction)
+                continue
+            self.assertTrue(maze.can_move((x, y), direction))
+            step_x, step_y = _STEPS[direction]
+            self.assertEqual(distances[(x + step_x, y + step_y)],
+                             distance - 1)
+
+    def test_generated(self):
+        for seed in range(10):
+            maze = Maze(9)
+            maze.dfs(seed=seed)
+            maze.braid(0.3, seed=seed)
+            self.check(maze)
+            path = [(0, 0)]
+            while maze.hint(path[-1]):
+                step_x, step_y = _STEPS[maze.hint(path[-1])]
+                path.append((path[-1][0] + step_x, path[-1][1] + step_y))
+            self.assertEqual(
+                {(x, y) for x in range(9) for y in range(9)
+                 if maze.on_path((x, y))}, set(path))
+
+    def test_hand_made(self):
+        maze = Maze(2)
+        maze.cells[:] = bytes([15, 15, 12, 7])
+        self.assertEqual(maze.hint((0, 1)), 'east')
+        self.assertFalse(maze.on_path((0, 1)))
+        rng = random.Random(9)
+        for _ in range(500):
+            size = rng.randint(1, 4)
+            maze = Maze(size)
+            maze.cells[:] = bytes(rng.randrange(16)
+                                  for _ in range(size*size))
+            self.check(maze)
+            for x in range(size):
+                for y in range(size):
+                    maze.on_path((x, y))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+"""Round trips through the saved maze format."""
+import io
+import os
+import tempfile
+import unittest
+
+from maze import Maze
+from maze.mapped import MappedMaze
+
+def _saved(maze, compression=None):
+    """Save a maze into a BytesIO, left at the start."""
+    file = io.BytesIO()
+    maze.save(file, compression)
+    file.seek(0)
+    return file
+
+class _Pipe(io.RawIOBase):
+    """A readable file which can not seek."""
+
+    def __init__(self, data):
+        self._data = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        return self._data.readinto(buffer)
+
+class MazeFileTest(unittest.TestCase):
+    """Maze.save, Maze.save_stream and Maze.load."""
+
+    def setUp(self):
+        self.maze = Maze(23)
+        self.maze.dfs(seed=4)
+        self.maze.north_east = (20, 3)
+
+    def assertSame(self, loaded):
+        self.assertEqual(loaded.size, self.maze.size)
+        self.assertEqual(loaded.north_east, self.maze.north_east)
+        self.assertEqual(bytes(loaded.cells), bytes(self.maze.cells))
+
+    def test_round_trip(self):
+        for compression in (None, 'zlib'):
+            self.assertSame(Maze.load(_saved(self.maze, compression)))
+
+    def test_save_stream(self):
+        size = self.maze.size
+        cells = bytes(self.maze.cells)
+        rows = [cells[start:start+size]
+                for start in range(0, len(cells), size)]
+        for compression in (None, 'zlib'):
+            file = io.BytesIO()
+            Maze.save_stream(file, size, rows, compression,
+                             north_east=self.maze.north_east)
+            file.seek(0)
+            self.assertSame(Maze.load(file))
+
+    def test_header(self):
+        saved = _saved(self.maze).getvalue()
+        self.assertEqual(saved[:4], b'IMHO')
+        self.assertEqual(len(saved), Maze._HEADER.size + self.maze.size**2)
+
+    def test_bad_files(self):
+        for compression in (None, 'zlib'):
+            saved = _saved(self.maze, compression).getvalue()
+            corrupt = saved[:40] + b'\xff\xff' + saved[42:]
+            for data in (saved[:10], saved[:-5], b'NOPE' + saved[4:],
+                         corrupt if compression else saved[:-1]):
+                with self.assertRaises(ValueError):
+                    Maze.load(io.BytesIO(data))
+
+    def test_bad_headers(self):
+        def saved(size, x=0, y=0, compression=0):
+            return io.BytesIO(Maze._HEADER.pack(
+                Maze._MAGIC, Maze._FORMAT_VERSION, Maze._ENCODING_WSEN,
+                compression, size, x, y) + b'\x0f'*4)
+        for file in (saved(2**33), saved(10**5), saved(10**5, compression=1),
+                     saved(2, 99, 99), saved(2, 1, 2)):
+            with self.assertRaises(ValueError):
+                Maze.load(file)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'maze')
+            with open(path, 'wb') as maze_file:
+                maze_file.write(saved(2, 2, 0).getvalue())
+            with self.assertRaises(ValueError):
+                MappedMaze(path)
+
+    def test_pipe(self):
+        saved = _saved(self.maze).getvalue()
+        self.assertSame(Maze.load(io.BufferedReader(_Pipe(saved))))
+        for data in (saved[:-1], saved[:-len(self.maze.cells)] + b'\x0f'):
+            with self.assertRaises(ValueError):
+                Maze.load(io.BufferedReader(_Pipe(data)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+"""Every generator carves a perfect maze, with the exit as a dead end."""
+import io
+import random
+import unittest
+
+from maze import Maze
+from maze import generators
+
+_SIZES = (1, 2, 3, 16, 33)
+
+def _walls(maze, coordinates):
+    """Count the walls around a cell."""
+    x, y = coordinates
+    return bin(maze.cells[y*maze.size + x] & 15).count('1')
+
+class GeneratorTest(unittest.TestCase):
+
+    def check(self, method, exits=((0, 0), (3, 5)), **options):
+        """Generate mazes of a few sizes and check every one of them.
+
+        Positional Arguments:
+            method - The name of the Maze generation method.
+
+        Keyword Arguments:
+            exits - Exits other than the top right cell to try on a 7x7
+                    maze, for generators which allow them.
+            options - Passed on to the generation method.
+        """
+        mazes = []
+        for size in _SIZES:
+            for seed in range(4):
+                maze = Maze(size)
+                getattr(maze, method)(seed=seed, **options)
+                mazes.append(maze)
+        for north_east in exits:
+            maze = Maze(7)
+            maze.north_east = north_east
+            getattr(maze, method)(seed=1, **options)
+            mazes.append(maze)
+        for maze in mazes:
+            self.assertEqual(maze.validate(), [], method)
+            if maze.size > 1:
+                self.assertEqual(_walls(maze, maze.north_east), 3, method)
+
+    def test_prim(self):
+        self.check('prim')
+
+    def test_dfs(self):
+        self.check('dfs')
+        # Far deeper than the recursion limit.
+        maze = Maze(300)
+        maze.dfs(seed=1)
+        self.assertEqual(maze.validate(), [])
+
+    def test_kruskal(self):
+        self.check('kruskal')
+
+    def test_wilson(self):
+        self.check('wilson')
+
+    def check_rows(self, algorithm):
+        """Check that the row by row form of an engine makes the same maze.
+
+        Positional Arguments:
+            algorithm - The name of the engine, which has a _rows form.
+        """
+        rows = getattr(generators, algorithm + '_rows')
+        for size in _SIZES:
+            maze = Maze(size)
+            getattr(maze, algorithm)(seed=size)
+            leaf = size*size - 1
+            streamed = Maze.from_rows(rows(size, size, leaf,
+                                           random.Random(size)))
+            self.assertEqual(bytes(streamed.cells), bytes(maze.cells))
+            file = io.BytesIO()
+            Maze.save_stream(file, size, rows(size, size, leaf,
+                                              random.Random(size)))
+            file.seek(0)
+            self.assertEqual(bytes(Maze.load(file).cells), bytes(maze.cells))
+        maze = Maze(7)
+        maze.north_east = (0, 0)
+        with self.assertRaises(ValueError):
+            getattr(maze, algorithm)(seed=1)
+
+    def test_eller(self):
+        self.check('eller', exits=())
+        self.check_rows('eller')
+
+    def test_binary_tree(self):
+        self.check('binary_tree', exits=())
+        self.check_rows('binary_tree')
+
+    def test_sidewinder(self):
+        self.check('sidewinder', exits=())
+        self.check_rows('sidewinder')
+
+    def test_tiled(self):
+        for algorithm in ('dfs', 'eller'):
+            self.check('tiled', exits=(), algorithm=algorithm, tile_size=5,
+                       workers=1)
+        # Tiles get their own seeds, so a pool makes the same maze.
+        pooled = Maze(23)
+        pooled.tiled(seed=2, tile_size=8, workers=2)
+        maze = Maze(23)
+        maze.tiled(seed=2, tile_size=8, workers=1)
+        self.assertEqual(bytes(pooled.cells), bytes(maze.cells))
+        with self.assertRaises(KeyError):
+            maze.tiled(algorithm='maze')
+
+    def test_seeds(self):
+        for algorithm in generators.ALGORITHMS:
+            state = random.getstate()
+            first = Maze(16)
+            getattr(first, algorithm)(seed='imhotep')
+            second = Maze(16)
+            getattr(second, algorithm)(seed=random.Random('imhotep'))
+            self.assertEqual(bytes(first.cells), bytes(second.cells),
+                             algorithm)
+            self.assertEqual(random.getstate(), state, algorithm)
+
+if __name__ == '__main__':
+    unittest.main()
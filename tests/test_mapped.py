@@ -0,0 +1,68 @@
+"""MappedMaze works on the maze file in place."""
+import os
+import tempfile
+import unittest
+
+from maze import Maze, Walker
+from maze.mapped import MappedMaze
+
+class MappedTest(unittest.TestCase):
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._directory.name, 'maze')
+        self.maze = Maze(23)
+        self.maze.dfs(seed=4)
+        self.maze.north_east = (20, 3)
+        self.maze.save(self.path)
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def assertSame(self, mapped):
+        self.assertEqual(mapped.size, self.maze.size)
+        self.assertEqual(mapped.north_east, self.maze.north_east)
+        self.assertEqual(bytes(mapped.cells), bytes(self.maze.cells))
+
+    def test_open(self):
+        with MappedMaze(self.path) as mapped:
+            self.assertSame(mapped)
+            self.assertEqual(mapped.distance((0, 0)),
+                             self.maze.distance((0, 0)))
+            walker = Walker(mapped)
+            walker.power_on()
+            walker.move('north')
+        with MappedMaze.load(self.path) as mapped:
+            self.assertSame(mapped)
+
+    def test_write_back(self):
+        with MappedMaze(self.path) as mapped:
+            mapped.braid(seed=1)
+            braided = bytes(mapped.cells)
+        self.assertEqual(bytes(Maze.load(self.path).cells), braided)
+        with MappedMaze(self.path, writable=False) as mapped:
+            with self.assertRaises(TypeError):
+                mapped.cells[0] = 15
+
+    def test_close_with_views(self):
+        mapped = MappedMaze(self.path)
+        view = mapped.cells
+        with self.assertRaises(BufferError):
+            mapped.close()
+        self.assertSame(mapped)
+        view.release()
+        mapped.close()
+
+    def test_create(self):
+        created = MappedMaze.create(self.path, 9, chunk=10)
+        self.assertEqual(bytes(created.cells), b'\x0f'*81)
+        created.dfs(seed=1)
+        created.close()
+        self.assertEqual(Maze.load(self.path).validate(), [])
+        compressed = os.path.join(self._directory.name, 'compressed')
+        self.maze.save(compressed, 'zlib')
+        with self.assertRaises(ValueError):
+            MappedMaze(compressed)
+
+if __name__ == '__main__':
+    unittest.main()
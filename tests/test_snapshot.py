@@ -0,0 +1,83 @@
+"""Snapshots of Maze and Walker put everything back as it was."""
+import random
+import unittest
+
+from maze import Maze, Walker
+from maze.errors import Win
+
+def _toggles(size, rng):
+    """Mark all four walls of some inner cells as toggleable."""
+    return bytes(15 if 0 < cell % size < size-1
+                 and 0 < cell // size < size-1 and rng.random() < 0.3
+                 else 0 for cell in range(size*size))
+
+class SnapshotTest(unittest.TestCase):
+
+    def test_restore(self):
+        rng = random.Random(6)
+        for seed in range(50):
+            maze = Maze(10)
+            maze.dfs(seed=seed)
+            maze.set_toggles(_toggles(10, rng))
+            maze.corridors()
+            walker = Walker(maze)
+            walker.power_on()
+            trace = walker.record()
+            walker.move('north', 2)
+            snapshot = walker.snapshot()
+            cells = bytes(maze.cells)
+            coordinates = walker._coordinates
+            events = len(trace)
+            for _ in range(3):
+                try:
+                    for step in range(40):
+                        walker.move(rng.choice(['north', 'east', 'south',
+                                                'west']), rng.randint(1, 3))
+                        if rng.random() < 0.3:
+                            walker.open_sesame()
+                        if rng.random() < 0.02:
+                            maze.braid(0.3, seed=step)
+                except Win:
+                    pass
+                walker.restore(snapshot)
+                self.assertEqual(bytes(maze.cells), cells)
+                self.assertEqual(walker._coordinates, coordinates)
+                self.assertEqual(len(trace), events)
+                fresh = Maze(10)
+                fresh.cells[:] = maze.cells
+                self.assertEqual(maze.corridors(), fresh.corridors())
+
+    def test_bulk_edits(self):
+        maze = Maze(9)
+        maze.dfs(seed=2)
+        cells = bytes(maze.cells)
+        distance = maze.distance((0, 0))
+        snapshot = maze.snapshot()
+        maze.punch_many([((0, 0), (0, 1)), ((4, 4), (5, 4))])
+        maze.set_toggles(bytes([15])*81)
+        maze.braid(seed=2)
+        maze.restore(snapshot)
+        self.assertEqual(bytes(maze.cells), cells)
+        self.assertEqual(maze.distance((0, 0)), distance)
+        maze.prim(seed=3)
+        maze.restore(snapshot)
+        self.assertEqual(bytes(maze.cells), cells)
+
+    def test_stale(self):
+        maze = Maze(3)
+        maze.punch_many([((0, 0), (1, 0)), ((1, 0), (2, 0)),
+                         ((2, 0), (2, 1)), ((2, 1), (2, 2))])
+        maze.set_toggles(bytes([1, 0, 0, 0, 0, 0, 0, 0, 0]))
+        first = maze.snapshot()
+        maze.toggle((0, 0), 'north')
+        second = maze.snapshot()
+        maze.restore(first)
+        with self.assertRaises(ValueError):
+            maze.restore(second)
+        maze.restore(first)
+        maze.discard_snapshots()
+        with self.assertRaises(ValueError):
+            maze.restore(first)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+"""The solvers find a shortest way out, and Walker.run can follow it."""
+import random
+import unittest
+
+from maze import Maze, Walker
+from maze.errors import Win
+from maze.solvers import astar, bfs, dead_end_filling
+
+_SOLVERS = (bfs, astar, dead_end_filling)
+
+def _moves(instructions):
+    """Count the cells a solver's instructions move through."""
+    moves = 0
+    repeat = 1
+    for instruction in instructions:
+        if isinstance(instruction, int):
+            repeat = instruction
+        else:
+            moves += repeat
+            repeat = 1
+    return moves
+
+def _escapes(maze, start, instructions):
+    """Whether a Walker at start running the instructions reaches the exit."""
+    walker = Walker(maze)
+    walker.power_on()
+    walker._coordinates = start
+    try:
+        walker.run(instructions)
+    except Win:
+        return True
+    return start == maze.north_east
+
+class SolverTest(unittest.TestCase):
+
+    def test_generated(self):
+        rng = random.Random(7)
+        for seed in range(30):
+            maze = Maze(12)
+            maze.dfs(seed=seed)
+            if seed % 2:
+                maze.braid(0.5, seed=seed)
+            start = (rng.randrange(12), rng.randrange(12))
+            solutions = [solver(maze, start) for solver in _SOLVERS]
+            self.assertEqual(len(set(map(_moves, solutions))), 1)
+            for solution in solutions:
+                self.assertTrue(_escapes(maze, start, solution))
+
+    def test_no_way_out(self):
+        maze = Maze(4)
+        maze.dfs(seed=1)
+        maze.cells[-1] = 15
+        maze.cells[-2] |= 2
+        maze.cells[-5] |= 1
+        for solver in _SOLVERS:
+            self.assertIsNone(solver(maze))
+
+    def test_mismatched_walls(self):
+        maze = Maze(2)
+        maze.cells[:] = bytes([15, 7, 15, 15])
+        for solver in _SOLVERS:
+            self.assertIsNone(solver(maze))
+        rng = random.Random(8)
+        for _ in range(3000):
+            size = rng.randint(1, 5)
+            maze = Maze(size)
+            maze.cells[:] = bytes(rng.randrange(16)
+                                  for _ in range(size*size))
+            start = (rng.randrange(size), rng.randrange(size))
+            solutions = [solver(maze, start) for solver in _SOLVERS]
+            if solutions[0] is None:
+                self.assertEqual(solutions, [None]*3, list(maze.cells))
+                continue
+            self.assertEqual(len(set(map(_moves, solutions))), 1,
+                             list(maze.cells))
+            for solution in solutions:
+                self.assertTrue(_escapes(maze, start, solution))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+"""WalkerSwarm moves each walker the way a Walker would move."""
+import random
+import unittest
+
+from maze import Maze, Walker, WalkerSwarm
+from maze.errors import BadCommand, Win
+
+from .test_walker import _program
+
+_DIRECTIONS = ['north', 'east', 'south', 'west', 'forward', 'left', 'right',
+               'backward']
+
+class SwarmTest(unittest.TestCase):
+
+    def test_run(self):
+        rng = random.Random(2)
+        maze = Maze(8)
+        maze.dfs(seed=2)
+        maze.braid(0.5, seed=2)
+        for _ in range(1000):
+            instructions = [instruction for instruction in _program(rng)
+                            if not isinstance(instruction, dict)]
+            walker = Walker(maze)
+            walker.power_on()
+            swarm = WalkerSwarm(maze, 2)
+            try:
+                walker.run(instructions)
+            except Win:
+                pass
+            except BadCommand:
+                continue
+            swarm.run(instructions)
+            self.assertEqual((swarm.x[0], swarm.y[0]), walker._coordinates,
+                             instructions)
+
+    def test_open_border(self):
+        rng = random.Random(10)
+        for _ in range(300):
+            size = rng.randint(1, 4)
+            maze = Maze(size)
+            maze.cells[:] = bytes(rng.randrange(16)
+                                  for _ in range(size*size))
+            start = (rng.randrange(size), rng.randrange(size))
+            if start == maze.north_east:
+                continue
+            walker = Walker(maze)
+            walker.power_on()
+            walker._coordinates = start
+            swarm = WalkerSwarm(maze, 3, start)
+            for _ in range(20):
+                direction = rng.choice(_DIRECTIONS)
+                try:
+                    walker.move(direction)
+                except Win:
+                    break
+                swarm.move(direction)
+                self.assertEqual((swarm.x[0], swarm.y[0]),
+                                 walker._coordinates, list(maze.cells))
+            for _ in range(20):
+                swarm.random_step(rng)
+                swarm.follow_wall()
+                self.assertTrue(all(0 <= cell < size*size
+                                    for cell in swarm.cells))
+
+if __name__ == '__main__':
+    unittest.main()
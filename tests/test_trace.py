@@ -0,0 +1,115 @@
+"""A Trace replays a run exactly, and saves and loads unchanged."""
+import io
+import random
+import unittest
+
+from maze import Maze, Walker
+from maze.errors import Win
+from maze.trace import Trace
+
+from .test_walker import _Recorder
+
+_STEPS = {
+    'north': (0, 1),
+    'east': (1, 0),
+    'south': (0, -1),
+    'west': (-1, 0)}
+
+def _record(maze, rng, start=(0, 0)):
+    """Run a Walker at random, recording it and watching it cell by cell."""
+    display = _Recorder(maze)
+    walker = Walker(maze)
+    walker.power_on(display)
+    walker._coordinates = start
+    trace = walker.record()
+    try:
+        for _ in range(60):
+            walker.move(rng.choice(['north', 'east', 'south', 'west',
+                                    'forward', 'left']), rng.randint(0, 4))
+            if rng.random() < 0.2:
+                walker.open_sesame()
+    except Win:
+        pass
+    return trace, display.log
+
+class TraceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = random.Random(19)
+
+    def maze(self):
+        maze = Maze(12)
+        maze.dfs(seed=self.rng.random())
+        maze.braid(0.5, seed=self.rng.random())
+        maze.set_toggles(bytes(15 if 0 < cell % 12 < 11
+                               and 0 < cell // 12 < 11
+                               and self.rng.random() < 0.2 else 0
+                               for cell in range(144)))
+        return maze
+
+    def test_replay(self):
+        for _ in range(30):
+            maze = self.maze()
+            walked = Maze(12)
+            walked.cells[:] = maze.cells
+            trace, log = _record(walked, self.rng)
+            for delay in (None, 0):
+                display = _Recorder(maze)
+                trace.replay(display, delay)
+                self.assertEqual(display.log, log)
+
+    def test_heatmap(self):
+        for _ in range(30):
+            maze = self.maze()
+            start = (self.rng.randrange(12), self.rng.randrange(12))
+            trace, log = _record(maze, self.rng, start)
+            visits = [0]*144
+            x, y = start
+            visits[y*12 + x] += 1
+            for event in log:
+                if event in _STEPS:
+                    step_x, step_y = _STEPS[event]
+                    x, y = x + step_x, y + step_y
+                    visits[y*12 + x] += 1
+            self.assertEqual(list(trace.heatmap()), visits)
+
+class TraceFileTest(unittest.TestCase):
+    """Trace.save and Trace.load."""
+
+    def setUp(self):
+        self.maze = Maze(12)
+        self.maze.dfs(seed=5)
+        self.maze.braid(0.5, seed=5)
+        walker = Walker(self.maze)
+        walker.power_on()
+        self.trace = walker.record()
+        try:
+            for direction in ['north', 'east', 'south', 'west']*30:
+                walker.move(direction, 3)
+                walker.open_sesame()
+        except Win:
+            pass
+
+    def test_round_trip(self):
+        file = io.BytesIO()
+        self.trace.save(file)
+        file.seek(0)
+        loaded = Trace.load(file)
+        for name in ('size', 'start', 'heading', 'ops', 'cells', 'values'):
+            self.assertEqual(getattr(loaded, name), getattr(self.trace, name))
+        self.assertEqual(loaded.heatmap(), self.trace.heatmap())
+
+    def test_bad_files(self):
+        file = io.BytesIO()
+        self.trace.save(file)
+        saved = file.getvalue()
+        header = Trace._HEADER
+        for data in (saved[:10], saved[:-1], b'NOPE' + saved[4:],
+                     header.pack(Trace._MAGIC, 1, 5, 0, 0, 2**62),
+                     header.pack(Trace._MAGIC, 1, 5, 25, 0, 0),
+                     header.pack(Trace._MAGIC, 1, 5, 0, 4, 0)):
+            with self.assertRaises(ValueError):
+                Trace.load(io.BytesIO(data))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+"""Maze.validate and Maze.stats against checks made a cell at a time."""
+from collections import Counter
+import random
+import unittest
+
+from maze import Maze
+
+# Each wall bit, the step to the cell on the other side, and the wall bit
+# that cell has facing back.
+_SIDES = ((1, (0, 1), 4), (2, (1, 0), 8), (4, (0, -1), 1), (8, (-1, 0), 2))
+
+def _cell(cells, size, x, y):
+    return cells[y*size + x]
+
+def _inside(size, x, y):
+    return 0 <= x < size and 0 <= y < size
+
+def _problems(maze, perfect=True):
+    """Find what Maze.validate should report, a cell at a time."""
+    size = maze.size
+    cells = list(maze.cells)
+    problems = []
+    for label, wall, (step_x, step_y), facing in (
+            ('east walls do not match the west wall next to them',
+             2, (1, 0), 8),
+            ('north walls do not match the south wall above them',
+             1, (0, 1), 4)):
+        count = sum(
+            (not _cell(cells, size, x, y) & wall)
+            != (not _cell(cells, size, x+step_x, y+step_y) & facing)
+            for x in range(size) for y in range(size)
+            if _inside(size, x+step_x, y+step_y))
+        if count:
+            problems.append('{} {}'.format(count, label))
+    count = sum(not _cell(cells, size, x, y) & wall
+                for x in range(size) for y in range(size)
+                for wall, (step_x, step_y), _ in _SIDES
+                if not _inside(size, x+step_x, y+step_y))
+    if count:
+        problems.append('{} openings in the outer wall'.format(count))
+    count = sum(bool(cell >> 4 & ~cell & 15) for cell in cells)
+    if count:
+        problems.append(
+            '{} cells have toggles on walls that are not there'.format(count))
+    # Open the toggleable walls, from both sides.
+    toggled = [cell >> 4 & cell for cell in cells]
+    for x in range(size):
+        for y in range(size):
+            for wall, (step_x, step_y), facing in _SIDES:
+                if (toggled[y*size + x] & wall
+                        and _inside(size, x+step_x, y+step_y)):
+                    cells[y*size + x] &= ~wall
+                    cells[(y+step_y)*size + x+step_x] &= ~facing
+    # Cells reach the exit if a chain of cells can move into each other.
+    reached = {maze.north_east}
+    frontier = [maze.north_east]
+    while frontier:
+        x, y = frontier.pop()
+        for wall, (step_x, step_y), facing in _SIDES:
+            neighbor = (x+step_x, y+step_y)
+            if (_inside(size, *neighbor) and neighbor not in reached
+                    and not _cell(cells, size, *neighbor) & facing):
+                reached.add(neighbor)
+                frontier.append(neighbor)
+    if size*size - len(reached):
+        problems.append('{} cells can not reach the exit'.format(
+            size*size - len(reached)))
+    # Loops are passages beyond a spanning forest of the passages.
+    parents = list(range(size*size))
+    def root(cell):
+        while parents[cell] != cell:
+            cell = parents[cell]
+        return cell
+    extra = 0
+    for x in range(size):
+        for y in range(size):
+            for wall, (step_x, step_y), _ in _SIDES[:2]:
+                if (_inside(size, x+step_x, y+step_y)
+                        and not _cell(cells, size, x, y) & wall):
+                    first = root(y*size + x)
+                    second = root((y+step_y)*size + x+step_x)
+                    if first == second:
+                        extra += 1
+                    parents[first] = second
+    if perfect and extra:
+        problems.append('{} passages too many, making loops'.format(extra))
+    return problems
+
+def _stats(maze):
+    """Work out what Maze.stats should return, a cell at a time."""
+    size = maze.size
+    def is_open(x, y, wall, step_x, step_y):
+        return (_inside(size, x+step_x, y+step_y)
+                and not maze.cells[y*size + x] & wall)
+    exits = Counter(
+        sum(is_open(x, y, wall, *step) for wall, step, _ in _SIDES)
+        for x in range(size) for y in range(size))
+    corridors = Counter()
+    for wall, (step_x, step_y), _ in _SIDES[:2]:
+        for line in range(size):
+            length = 1
+            for along in range(size):
+                x, y = (along, line) if step_x else (line, along)
+                if is_open(x, y, wall, step_x, step_y):
+                    length += 1
+                    continue
+                if length > 1:
+                    corridors[length] += 1
+                length = 1
+    return {
+        'passages': sum(is_open(x, y, wall, *step)
+                        for x in range(size) for y in range(size)
+                        for wall, step, _ in _SIDES[:2]),
+        'dead_ends': exits[1],
+        'junctions': exits[3] + exits[4],
+        'corridors': dict(corridors)}
+
+class ValidateTest(unittest.TestCase):
+
+    def test_generated(self):
+        for seed in range(20):
+            maze = Maze(9)
+            maze.kruskal(seed=seed)
+            self.assertEqual(maze.validate(), [])
+            maze.braid(0.4, seed=seed)
+            self.assertEqual(maze.validate(), _problems(maze))
+            self.assertEqual(maze.validate(perfect=False), [])
+            self.assertEqual(maze.stats(), _stats(maze))
+
+    def test_hand_made(self):
+        rng = random.Random(11)
+        for _ in range(1500):
+            size = rng.randint(1, 5)
+            maze = Maze(size)
+            maze.cells[:] = bytes(rng.randrange(16) | rng.randrange(16) << 4
+                                  if rng.random() < 0.2 else rng.randrange(16)
+                                  for _ in range(size*size))
+            maze.north_east = (rng.randrange(size), rng.randrange(size))
+            for perfect in (True, False):
+                self.assertEqual(maze.validate(perfect),
+                                 _problems(maze, perfect), list(maze.cells))
+            self.assertEqual(maze.stats(), _stats(maze), list(maze.cells))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,209 @@
+"""Checks that Walker.run keeps the behaviour of the original interpreter.
+
+The original Walker.run walked a cell at a time with Maze.can_move and ran
+nested lists by recursion. _Reference below is that interpreter, so the
+bytecode, lazy and single step ways of running a program can be compared
+with it on many random programs.
+"""
+import random
+import unittest
+
+from maze import Maze, Walker
+from maze.displays.base import Display
+from maze.errors import BadCommand, TooManyInstructions, Win
+
+_RELATIVE = {
+    'north': {'forward': 'north', 'right': 'east', 'backward': 'south',
+              'left': 'west'},
+    'east': {'forward': 'east', 'right': 'south', 'backward': 'west',
+             'left': 'north'},
+    'south': {'forward': 'south', 'right': 'west', 'backward': 'north',
+              'left': 'east'},
+    'west': {'forward': 'west', 'right': 'north', 'backward': 'east',
+             'left': 'south'}}
+
+_STEPS = {
+    'north': (0, 1),
+    'east': (1, 0),
+    'south': (0, -1),
+    'west': (-1, 0)}
+
+class _Recorder(Display):
+    """A display which lists every cell moved, one direction per cell."""
+
+    def __init__(self, maze):
+        super().__init__(maze)
+        self.log = []
+
+    def draw(self):
+        pass
+
+    def north(self, distance=1):
+        self.log.extend(['north']*distance)
+
+    def east(self, distance=1):
+        self.log.extend(['east']*distance)
+
+    def south(self, distance=1):
+        self.log.extend(['south']*distance)
+
+    def west(self, distance=1):
+        self.log.extend(['west']*distance)
+
+    def toggle(self, coordinates, direction):
+        self.log.append((coordinates, direction))
+
+class _Reference:
+    """The original Walker.run, moving a cell at a time."""
+
+    def __init__(self, maze, display):
+        self._maze = maze
+        self._display = display
+        self._coordinates = (0, 0)
+        self._relative = _RELATIVE['north']
+
+    def move(self, direction, distance=1):
+        if direction in self._relative:
+            direction = self._relative[direction]
+        step_x, step_y = _STEPS[direction]
+        success = True
+        for _ in range(distance):
+            if not self._maze.can_move(self._coordinates, direction):
+                success = False
+                break
+            getattr(self._display, direction)()
+            x, y = self._coordinates
+            self._coordinates = (x + step_x, y + step_y)
+            self._relative = _RELATIVE[direction]
+            if self._coordinates == self._maze.north_east:
+                raise Win
+        return success
+
+    def run(self, instructions, limit=0):
+        count = 0
+        repeat = 1
+        for position, instruction in enumerate(instructions):
+            if limit > 0 and count >= limit:
+                raise TooManyInstructions
+            if isinstance(instruction, int):
+                count += 1
+                repeat = instruction
+            elif isinstance(instruction, list):
+                for _ in range(repeat):
+                    self.run(instruction, limit)
+                count += len(instruction)
+                repeat = 1
+            else:
+                try:
+                    self.move(instruction, repeat)
+                except (KeyError, TypeError):
+                    raise BadCommand(
+                        'Bad command at position {}.'.format(position))
+                count += 1
+                repeat = 1
+        return count
+
+_TOKENS = ['north', 'east', 'south', 'west', 'forward', 'left', 'right',
+           'backward']
+_ODD = ['up', 3, 2, 0, -1, 5, {}]
+
+def _program(rng, odd=True, depth=0):
+    """Make a random nested program, with some bad commands in it if odd."""
+    tokens = _TOKENS*6 + _ODD if odd else _TOKENS
+    instructions = []
+    for _ in range(rng.randrange(6)):
+        if rng.random() < 0.2 and depth < 3:
+            instructions.append(_program(rng, odd, depth+1))
+        else:
+            instructions.append(rng.choice(tokens))
+    return instructions
+
+def _generators(instructions):
+    """Turn a program's lists into generators, all the way down."""
+    return (_generators(instruction) if isinstance(instruction, list)
+            else instruction for instruction in instructions)
+
+def _outcome(walker, display, run):
+    """Run a program, and describe how it went."""
+    try:
+        result = run()
+    except (BadCommand, TooManyInstructions, Win) as err:
+        result = (type(err).__name__, str(err))
+    return result, display.log, walker._coordinates
+
+def _stepped(walker, instructions, limit):
+    """Run a program with Walker.start and Walker.step."""
+    walker.start(instructions, limit)
+    while walker.step():
+        pass
+
+class RunTest(unittest.TestCase):
+    """Walker.run against the original interpreter."""
+
+    def setUp(self):
+        self.maze = Maze(6)
+        self.maze.dfs(seed=1)
+        self.rng = random.Random(0)
+
+    def _reference(self, instructions, limit):
+        display = _Recorder(self.maze)
+        walker = _Reference(self.maze, display)
+        return _outcome(walker, display,
+                        lambda: walker.run(instructions, limit))
+
+    def _walker(self, run):
+        display = _Recorder(self.maze)
+        walker = Walker(self.maze)
+        walker.power_on(display)
+        return _outcome(walker, display, lambda: run(walker))
+
+    def test_run(self):
+        for _ in range(3000):
+            instructions = _program(self.rng)
+            limit = self.rng.choice([0, 0, 1, 2, 3, 5])
+            self.assertEqual(
+                self._walker(lambda walker: walker.run(instructions, limit)),
+                self._reference(instructions, limit), instructions)
+
+    def test_lazy_run(self):
+        for _ in range(3000):
+            instructions = _program(self.rng)
+            limit = self.rng.choice([0, 0, 1, 2, 3, 5])
+            self.assertEqual(
+                self._walker(lambda walker: walker.run(
+                    _generators(instructions), limit)),
+                self._reference(instructions, limit), instructions)
+
+    def test_step(self):
+        for _ in range(3000):
+            instructions = _program(self.rng)
+            limit = self.rng.choice([0, 0, 1, 2, 3, 5])
+            result, log, coordinates = self._reference(instructions, limit)
+            if not isinstance(result, tuple):
+                result = None
+            self.assertEqual(
+                self._walker(lambda walker: _stepped(
+                    walker, iter(instructions), limit)),
+                (result, log, coordinates), instructions)
+
+    def test_move(self):
+        for _ in range(3000):
+            moves = [(self.rng.choice(_TOKENS), self.rng.randrange(4))
+                     for _ in range(self.rng.randrange(1, 8))]
+            def run(walker):
+                return [walker.move(*move) for move in moves]
+            display = _Recorder(self.maze)
+            reference = _Reference(self.maze, display)
+            self.assertEqual(
+                self._walker(run), _outcome(reference, display,
+                                            lambda: run(reference)))
+
+    def test_move_distance_type(self):
+        walker = Walker(self.maze)
+        walker.power_on()
+        with self.assertRaises(TypeError):
+            walker.move('north', 6/2)
+        self.assertEqual(walker._coordinates, (0, 0))
+
+if __name__ == '__main__':
+    unittest.main()